@@ -1,36 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+import asyncio
+import time
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Optional
 from datetime import datetime
-from bson import ObjectId
 
-from models.chat import ChatRequest, ChatResponse, Message, ChatSession
+from models.chat import ChatRequest, ChatResponse, Message, message_row
 from utils.auth import get_current_user
+from utils.responses import fast_json_response, compress_response
+from utils.versions import conditional_get, bump as bump_version
 from utils.sentiment import get_text_insights
-from config.ai_config import get_conversation_chain, MENTAL_HEALTH_SYSTEM_PROMPT
-from config.database import chats_collection
+from utils.suggestions import get_suggestions, record_exposure
+from config.ai_config import get_conversation_chain
+from utils.chat_archive import read_before, take_before, position_before, make_cursor, parse_cursor
+from config.storage import storage
 
 router = APIRouter()
 
+DEFAULT_HISTORY_LIMIT = 50
+
+def _generate_reply(user_id: str, message: str) -> str:
+    # Build the chain and call the LLM; runs in a worker thread
+    conversation = get_conversation_chain(user_id=user_id)
+    response = conversation({"question": message})
+    return response["answer"]
+
+def _save_turn(user_id: str, user_message: dict, ai_message: dict):
+    # Append both turns, creating the session on first use
+    storage.chats.append(user_id, [user_message, ai_message])
+    bump_version(user_id, "chat")
+
 @router.post("/message", response_model=ChatResponse)
 async def send_message(
     chat_request: ChatRequest,
+    background_tasks: BackgroundTasks,
     current_user: dict = Depends(get_current_user)
 ):
     user_id = str(current_user["_id"])
     
-    # Get or create chat session
-    chat_session = chats_collection.find_one({"user_id": user_id})
-    
-    if not chat_session:
-        # Create new chat session
-        chat_session = {
-            "user_id": user_id,
-            "messages": [],
-            "created_at": datetime.now(),
-            "updated_at": datetime.now()
-        }
-        chats_collection.insert_one(chat_session)
-    
     # Add user message to session
     user_message = {
         "role": "user",
@@ -38,12 +45,16 @@ async def send_message(
         "timestamp": datetime.now()
     }
     
-    # Get conversation chain
-    conversation = get_conversation_chain(user_id=user_id)
+    # Get AI response and analyze sentiment of user message concurrently;
+    # the emotion does not depend on the reply, so latency is the slower of the two
+    ai_response, insights = await asyncio.gather(
+        run_in_threadpool(_generate_reply, user_id, chat_request.message),
+        run_in_threadpool(get_text_insights, chat_request.message)
+    )
     
-    # Get AI response
-    response = conversation({"question": chat_request.message})
-    ai_response = response["answer"]
+    # Keep the user message's analysis so it never has to be recomputed
+    user_message["sentiment"] = insights["sentiment"]["label"]
+    user_message["emotion"] = insights["emotion"]["emotion"]
     
     # Add AI message to session
     ai_message = {
@@ -52,40 +63,16 @@ async def send_message(
         "timestamp": datetime.now()
     }
     
-    # Update chat session in database
-    chats_collection.update_one(
-        {"user_id": user_id},
-        {
-            "$push": {"messages": {"$each": [user_message, ai_message]}},
-            "$set": {"updated_at": datetime.now()}
-        }
-    )
-    
-    # Analyze sentiment of user message
-    insights = get_text_insights(chat_request.message)
+    # Persist the turn after the response has been sent
+    background_tasks.add_task(_save_turn, user_id, user_message, ai_message)
     
-    # Generate suggestions based on emotion
-    suggestions = []
+    # Serve suggestions from the user's precomputed ranking for this emotion
     emotion = insights["emotion"]["emotion"]
+    ranked = get_suggestions(user_id, emotion)
+    suggestions = [text for _, text in ranked]
     
-    if emotion == "sadness":
-        suggestions = [
-            "Try a quick 5-minute meditation",
-            "Write down three things you're grateful for",
-            "Take a short walk outside"
-        ]
-    elif emotion == "anger":
-        suggestions = [
-            "Practice deep breathing for 2 minutes",
-            "Try progressive muscle relaxation",
-            "Write down what's bothering you"
-        ]
-    elif emotion == "fear":
-        suggestions = [
-            "Try the 5-4-3-2-1 grounding technique",
-            "Practice box breathing",
-            "Challenge negative thoughts"
-        ]
+    # Remember what was shown so the next mood check-in can credit it
+    background_tasks.add_task(record_exposure, user_id, emotion, [sid for sid, _ in ranked])
     
     return ChatResponse(
         response=ai_response,
@@ -94,25 +81,57 @@ async def send_message(
     )
 
 @router.get("/history", response_model=List[Message])
-async def get_chat_history(current_user: dict = Depends(get_current_user)):
+async def get_chat_history(
+    request: Request,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_HISTORY_LIMIT, ge=1, le=500),
+    current_user: dict = Depends(get_current_user)
+):
     user_id = str(current_user["_id"])
     
-    # Get chat session
-    chat_session = chats_collection.find_one({"user_id": user_id})
-    
-    if not chat_session:
-        return []
+    # Pages are addressed by an opaque cursor from the previous page's X-Next-Cursor
+    try:
+        position = parse_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
     
-    return chat_session["messages"]
+    # Answer from the version stamp alone when the client's copy is current
+    extra = (cursor or "", limit) if cursor or limit != DEFAULT_HISTORY_LIMIT else ()
+    not_modified, cache_headers = conditional_get(request, current_user, "chat", *extra)
+    if not_modified:
+        return not_modified
+    
+    # Newest messages come from the live (hot) window, fetching only the message fields
+    messages = take_before(storage.chats.get_messages(user_id), position, limit)
+    headers = dict(cache_headers)
+    
+    # Page transparently into the compressed archive when the live window runs out
+    if len(messages) < limit:
+        started = time.perf_counter()
+        messages = read_before(user_id, position_before(messages, position), limit - len(messages)) + messages
+        headers["X-Archive-Read-Ms"] = f"{(time.perf_counter() - started) * 1000:.1f}"
+    
+    # A full page may have older messages behind it
+    if len(messages) == limit:
+        headers["X-Next-Cursor"] = make_cursor(position_before(messages, position))
+    
+    return compress_response(
+        request,
+        fast_json_response([message_row(message) for message in messages], headers=headers)
+    )
 
 @router.delete("/history")
 async def clear_chat_history(current_user: dict = Depends(get_current_user)):
     user_id = str(current_user["_id"])
     
-    # Delete chat session
-    result = chats_collection.delete_one({"user_id": user_id})
+    # Delete chat session and its archived messages
+    deleted = storage.chats.delete(user_id)
+    bump_version(user_id, "chat")
     
-    if result.deleted_count == 0:
+    if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No chat history found"
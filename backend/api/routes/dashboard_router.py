@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends, Query
+from datetime import datetime, timedelta
+
+from models.dashboard import DashboardResponse
+from models.mood import mood_row
+from models.journal import journal_row
+from utils.auth import get_current_user
+from utils.responses import fast_json_response
+from config.storage import storage
+
+router = APIRouter()
+
+TREND_DAYS = 7
+
+@router.get("/", response_model=DashboardResponse)
+async def get_dashboard(
+    recent: int = Query(5, ge=0, le=50),
+    current_user: dict = Depends(get_current_user)
+):
+    # The authenticated user document already carries streak and badges
+    user_id = str(current_user["_id"])
+    today = datetime.now()
+    first_day = today - timedelta(days=TREND_DAYS - 1)
+    trend_start = datetime(first_day.year, first_day.month, first_day.day)
+    
+    # Mood totals, trend and latest entries, then the journal count and latest entries
+    moods = storage.moods.summary(user_id, trend_start, recent)
+    journals = storage.journals.summary(user_id, recent)
+    
+    mood_trend = []
+    for i in range(TREND_DAYS):
+        day = (trend_start + timedelta(days=i)).strftime("%Y-%m-%d")
+        mood_trend.append({"date": day, "value": moods["trend"].get(day)})
+    
+    streak = current_user.get("streak", 0)
+    
+    return fast_json_response({
+        "stats": {
+            "streak": streak,
+            "badges": current_user.get("badges", []),
+            "journal_entries": journals["count"],
+            "mood_checkins": moods["count"]
+        },
+        "mood_stats": {
+            "average_mood": round(moods["mood"], 1),
+            "average_energy": round(moods["energy"], 1),
+            "average_focus": round(moods["focus"], 1),
+            "mood_trend": mood_trend if moods["count"] else [],
+            "streak_days": streak if moods["count"] else 0
+        },
+        "recent_moods": [mood_row(entry) for entry in moods["recent"]],
+        "recent_journals": [journal_row(entry) for entry in journals["recent"]]
+    })
@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+from datetime import datetime
+
+from utils.auth import get_current_user
+from utils.export import EXPORT_SOURCES, iter_records, encode_ndjson, encode_csv, chunked
+
+router = APIRouter()
+
+EXPORT_FORMATS = {
+    "ndjson": (encode_ndjson, "application/x-ndjson"),
+    "csv": (encode_csv, "text/csv"),
+}
+
+@router.get("/")
+async def export_user_data(
+    format: str = Query("ndjson"),
+    resources: Optional[List[str]] = Query(None),
+    gzip: bool = Query(False),
+    current_user: dict = Depends(get_current_user)
+):
+    user_id = str(current_user["_id"])
+    
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported export format: {format}"
+        )
+    
+    resources = resources or list(EXPORT_SOURCES)
+    unknown = [resource for resource in resources if resource not in EXPORT_SOURCES]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown export resources: {', '.join(unknown)}"
+        )
+    
+    encoder, media_type = EXPORT_FORMATS[format]
+    filename = f"mental-fitness-export-{datetime.now():%Y%m%d}.{format}"
+    if gzip:
+        media_type = "application/gzip"
+        filename += ".gz"
+    
+    # Records are pulled from Mongo cursors and encoded lazily as the client reads
+    body = chunked(encoder(iter_records(user_id, resources)), compress=gzip)
+    
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
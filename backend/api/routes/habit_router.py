@@ -0,0 +1,149 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Optional
+from datetime import datetime, date
+
+from models.habit import HabitCreate, HabitCheck, HabitResponse, HabitHeatmap
+from utils.auth import get_current_user
+from utils.habits import (
+    empty_year, is_done, count_between, current_streak,
+    longest_streak, week_start, heatmap
+)
+from config.storage import storage
+
+router = APIRouter()
+
+def _habit_response(habit: dict, today: date) -> HabitResponse:
+    created = habit["created_at"].date()
+    tracked_days = (today - created).days + 1
+    completed = count_between(habit, created, today)
+    
+    return HabitResponse(
+        id=str(habit["_id"]),
+        name=habit["name"],
+        description=habit.get("description"),
+        target_per_week=habit["target_per_week"],
+        created_at=habit["created_at"],
+        done_today=is_done(habit, today),
+        current_streak=current_streak(habit, today),
+        longest_streak=longest_streak(habit),
+        completed_this_week=count_between(habit, max(week_start(today), created), today),
+        completion_rate=round(completed / tracked_days, 3) if tracked_days > 0 else 0
+    )
+
+def _get_habit(habit_id: str, user_id: str) -> dict:
+    habit = storage.habits.get(user_id, habit_id)
+    
+    if not habit:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Habit not found"
+        )
+    
+    return habit
+
+def _set_day(habit_id: str, user_id: str, day: date, done: bool) -> dict:
+    if day > date.today():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot check off a habit in the future"
+        )
+    
+    # Flip the day's bit in place and read back the updated habit
+    habit = storage.habits.set_day(user_id, habit_id, day, done)
+    
+    if not habit:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Habit not found"
+        )
+    
+    return habit
+
+@router.post("/", response_model=HabitResponse, status_code=status.HTTP_201_CREATED)
+async def create_habit(
+    habit: HabitCreate,
+    current_user: dict = Depends(get_current_user)
+):
+    user_id = str(current_user["_id"])
+    now = datetime.now()
+    
+    # Create habit with an empty bitset for the current year
+    habit_data = {
+        "user_id": user_id,
+        "name": habit.name,
+        "description": habit.description,
+        "target_per_week": habit.target_per_week,
+        "days": {str(now.year): empty_year()},
+        "created_at": now,
+        "updated_at": now
+    }
+    
+    # Insert into database
+    storage.habits.create(habit_data)
+    
+    return _habit_response(habit_data, now.date())
+
+@router.get("/", response_model=List[HabitResponse])
+async def get_habits(current_user: dict = Depends(get_current_user)):
+    user_id = str(current_user["_id"])
+    today = date.today()
+    
+    # Each habit's full history is a few dozen bytes per year
+    habits = storage.habits.list(user_id)
+    
+    return [_habit_response(habit, today) for habit in habits]
+
+@router.post("/{habit_id}/check", response_model=HabitResponse)
+async def check_habit(
+    habit_id: str,
+    check: Optional[HabitCheck] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    user_id = str(current_user["_id"])
+    day = (check and check.day) or date.today()
+    
+    habit = _set_day(habit_id, user_id, day, done=True)
+    
+    return _habit_response(habit, date.today())
+
+@router.delete("/{habit_id}/check", response_model=HabitResponse)
+async def uncheck_habit(
+    habit_id: str,
+    day: Optional[date] = Query(None),
+    current_user: dict = Depends(get_current_user)
+):
+    user_id = str(current_user["_id"])
+    
+    habit = _set_day(habit_id, user_id, day or date.today(), done=False)
+    
+    return _habit_response(habit, date.today())
+
+@router.get("/{habit_id}/heatmap", response_model=HabitHeatmap)
+async def get_habit_heatmap(
+    habit_id: str,
+    year: Optional[int] = Query(None),
+    current_user: dict = Depends(get_current_user)
+):
+    user_id = str(current_user["_id"])
+    year = year or date.today().year
+    
+    habit = _get_habit(habit_id, user_id)
+    days = heatmap(habit, year)
+    
+    return HabitHeatmap(year=year, days=days, total=days.count("1"))
+
+@router.delete("/{habit_id}")
+async def delete_habit(
+    habit_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    user_id = str(current_user["_id"])
+    
+    # Delete habit
+    if not storage.habits.delete(user_id, habit_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Habit not found"
+        )
+    
+    return {"message": "Habit deleted successfully"}
@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends, Query
+from typing import Optional
+from datetime import datetime
+
+from models.insights import EmotionDistribution, EmotionEntries
+from models.journal import journal_row
+from models.chat import message_row
+from utils.auth import get_current_user
+from config.storage import storage
+
+router = APIRouter()
+
+@router.get("/emotions", response_model=EmotionDistribution)
+async def get_emotion_distribution(
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    current_user: dict = Depends(get_current_user)
+):
+    user_id = str(current_user["_id"])
+    
+    # Count journal entries per stored emotion (served by the emotion index)
+    journal = storage.journals.emotion_counts(user_id, start, end)
+    
+    # Count user chat messages per stored emotion
+    chat = storage.chats.emotion_counts(user_id, start, end)
+    
+    total = dict(journal)
+    for emotion, count in chat.items():
+        total[emotion] = total.get(emotion, 0) + count
+    
+    return EmotionDistribution(journal=journal, chat=chat, total=total)
+
+@router.get("/emotions/{emotion}", response_model=EmotionEntries)
+async def get_entries_by_emotion(
+    emotion: str,
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: dict = Depends(get_current_user)
+):
+    user_id = str(current_user["_id"])
+    
+    # Most recent journal entries with this emotion
+    journal = storage.journals.by_emotion(user_id, emotion, start, end, limit)
+    
+    # Most recent user chat messages with this emotion
+    chat = storage.chats.by_emotion(user_id, emotion, start, end, limit)
+    
+    return EmotionEntries(
+        emotion=emotion,
+        journal=[journal_row(entry) for entry in journal],
+        chat=[message_row(message) for message in chat]
+    )
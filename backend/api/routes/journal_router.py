@@ -1,36 +1,51 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Optional
 from datetime import datetime
-from bson import ObjectId
 
-from models.journal import JournalCreate, JournalResponse, JournalEntry
+from models.journal import JournalCreate, JournalResponse, JournalBatchCreate, JournalBatchResponse, JournalSearchResponse, journal_row
 from utils.auth import get_current_user
-from utils.sentiment import get_text_insights
+from utils.sentiment import get_text_insights, get_text_insights_batch
+from utils.responses import fast_json_response, compress_response
+from utils.versions import conditional_get, bump as bump_version
+from utils.batch import client_timestamp
+from utils import journal_search
 from config.ai_config import get_llm
-from config.database import journals_collection
+from config.storage import storage
 
 router = APIRouter()
 
 @router.post("/", response_model=JournalResponse, status_code=status.HTTP_201_CREATED)
 async def create_journal_entry(
     journal: JournalCreate,
+    background_tasks: BackgroundTasks,
     current_user: dict = Depends(get_current_user)
 ):
     user_id = str(current_user["_id"])
     now = datetime.now()
     
+    # Analyze the entry once so reads never need the models; the models run
+    # in a worker thread so they do not block the event loop
+    text_insights = await run_in_threadpool(get_text_insights, journal.content)
+    
     # Create journal entry
     journal_data = {
         "user_id": user_id,
         "content": journal.content,
         "mood": journal.mood,
         "tags": journal.tags,
+        "sentiment": text_insights["sentiment"]["label"],
+        "emotion": text_insights["emotion"]["emotion"],
         "created_at": now,
         "updated_at": now
     }
     
     # Insert into database
-    result = journals_collection.insert_one(journal_data)
+    storage.journals.insert(journal_data)
+    bump_version(user_id, "journal")
+    
+    # Embed the entry for semantic search after responding
+    background_tasks.add_task(journal_search.index_entries, user_id, [journal_data])
     
     # Get insights from AI
     llm = get_llm()
@@ -43,30 +58,115 @@ async def create_journal_entry(
     
     insights = llm(prompt)
     
-    # Get created journal entry
-    created_journal = journals_collection.find_one({"_id": result.inserted_id})
-    
     return JournalResponse(
-        id=str(created_journal["_id"]),
-        content=created_journal["content"],
-        mood=created_journal["mood"],
-        tags=created_journal["tags"],
-        created_at=created_journal["created_at"],
-        insights=insights
+        id=str(journal_data["_id"]),
+        content=journal_data["content"],
+        mood=journal_data["mood"],
+        tags=journal_data["tags"],
+        created_at=journal_data["created_at"],
+        insights=insights,
+        sentiment=journal_data["sentiment"],
+        emotion=journal_data["emotion"]
+    )
+
+@router.post("/batch", response_model=JournalBatchResponse)
+async def create_journal_entries_batch(
+    batch: JournalBatchCreate,
+    background_tasks: BackgroundTasks,
+    current_user: dict = Depends(get_current_user)
+):
+    user_id = str(current_user["_id"])
+    now = datetime.now()
+    
+    # Analyze all entries in one batched pass, off the event loop
+    insights = await run_in_threadpool(get_text_insights_batch, [entry.content for entry in batch.entries])
+    
+    # Build all journal documents up front
+    journal_docs = []
+    for entry, entry_insights in zip(batch.entries, insights):
+        created_at = client_timestamp(entry.created_at, now)
+        journal_docs.append({
+            "user_id": user_id,
+            "client_id": entry.client_id,
+            "content": entry.content,
+            "mood": entry.mood,
+            "tags": entry.tags,
+            "sentiment": entry_insights["sentiment"]["label"],
+            "emotion": entry_insights["emotion"]["emotion"],
+            "created_at": created_at,
+            "updated_at": now
+        })
+    
+    # Write everything in one batch, skipping already-synced keys.
+    # AI insights are not generated here; they are fetched per entry on view.
+    inserted, duplicates = storage.journals.insert_batch(user_id, journal_docs)
+    if inserted:
+        bump_version(user_id, "journal")
+    background_tasks.add_task(journal_search.index_entries, user_id, inserted)
+    
+    return JournalBatchResponse(
+        created=[
+            JournalResponse(
+                id=str(doc["_id"]),
+                content=doc["content"],
+                mood=doc["mood"],
+                tags=doc["tags"],
+                created_at=doc["created_at"],
+                sentiment=doc["sentiment"],
+                emotion=doc["emotion"]
+            )
+            for doc in inserted
+        ],
+        duplicates=duplicates
     )
 
 @router.get("/", response_model=List[JournalResponse])
-async def get_journal_entries(current_user: dict = Depends(get_current_user)):
+async def get_journal_entries(request: Request, current_user: dict = Depends(get_current_user)):
     user_id = str(current_user["_id"])
     
-    # Get all journal entries for user
-    entries = list(journals_collection.find({"user_id": user_id}).sort("created_at", -1))
+    # Answer from the version stamp alone when the client's copy is current
+    not_modified, cache_headers = conditional_get(request, current_user, "journal")
+    if not_modified:
+        return not_modified
     
-    # Convert ObjectId to string
-    for entry in entries:
-        entry["id"] = str(entry["_id"])
+    # Get all journal entries for user, fetching only the response fields
+    entries = storage.journals.list(user_id)
     
-    return entries
+    return compress_response(
+        request,
+        fast_json_response([journal_row(entry) for entry in entries], headers=cache_headers)
+    )
+
+@router.get("/search", response_model=JournalSearchResponse)
+async def search_journal_entries(
+    q: str = Query(..., min_length=1, max_length=200),
+    tags: Optional[List[str]] = Query(None),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    current_user: dict = Depends(get_current_user)
+):
+    user_id = str(current_user["_id"])
+    
+    # Keyword and semantic candidates are merged and ranked on the server
+    results, truncated = journal_search.search(user_id, q, tags)
+    offset = (page - 1) * page_size
+    
+    return fast_json_response({
+        "query": q,
+        "candidates": len(results),
+        "truncated": truncated,
+        "page": page,
+        "page_size": page_size,
+        "results": [
+            {
+                "entry": journal_row(entry),
+                "score": round(score, 4),
+                "keyword_score": round(keyword_score, 4),
+                "semantic_score": round(semantic_score, 4)
+            }
+            for entry, score, keyword_score, semantic_score in results[offset:offset + page_size]
+        ]
+    })
 
 @router.get("/{journal_id}", response_model=JournalResponse)
 async def get_journal_entry(
@@ -76,7 +176,7 @@ async def get_journal_entry(
     user_id = str(current_user["_id"])
     
     # Get journal entry
-    entry = journals_collection.find_one({"_id": ObjectId(journal_id), "user_id": user_id})
+    entry = storage.journals.get(user_id, journal_id)
     
     if not entry:
         raise HTTPException(
@@ -108,13 +208,14 @@ async def delete_journal_entry(
 ):
     user_id = str(current_user["_id"])
     
-    # Delete journal entry
-    result = journals_collection.delete_one({"_id": ObjectId(journal_id), "user_id": user_id})
-    
-    if result.deleted_count == 0:
+    # Delete journal entry and its search embedding
+    if not storage.journals.delete(user_id, journal_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Journal entry not found"
         )
     
+    bump_version(user_id, "journal")
+    journal_search.invalidate(user_id)
+    
     return {"message": "Journal entry deleted successfully"}
\ No newline at end of file
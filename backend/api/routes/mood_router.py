@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
-from datetime import datetime, timedelta
-from bson import ObjectId
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from typing import List, Optional
+from datetime import datetime, date, timedelta
 
-from models.mood import MoodCreate, MoodResponse, MoodStats
+from models.mood import MoodCreate, MoodResponse, MoodStats, MoodAnalytics, MoodBatchCreate, MoodBatchResponse, mood_row
 from utils.auth import get_current_user
-from config.database import moods_collection, users_collection
+from utils.responses import fast_json_response, compress_response
+from utils.versions import conditional_get, bump as bump_version
+from utils.suggestions import record_mood_checkins
+from utils import mood_analytics
+from utils.batch import client_timestamp, compute_streak, update_streak_and_badges
+from config.storage import storage
 
 router = APIRouter()
 
@@ -28,125 +32,162 @@ async def create_mood_entry(
     }
     
     # Insert into database
-    result = moods_collection.insert_one(mood_data)
+    storage.moods.insert(mood_data)
+    bump_version(user_id, "mood")
     
-    # Update user streak
-    # Check if user has logged mood today or yesterday
-    yesterday = now - timedelta(days=1)
-    yesterday_start = datetime(yesterday.year, yesterday.month, yesterday.day)
+    # Recount the streak from distinct check-in days, as the batch sync does,
+    # so repeated check-ins on one day never inflate it
+    update_streak_and_badges(user_id, compute_streak(user_id, now))
     
-    recent_mood = moods_collection.find_one({
-        "user_id": user_id,
-        "created_at": {"$gte": yesterday_start, "$lt": now}
-    })
-    
-    if recent_mood:
-        # User has logged mood recently, increment streak
-        users_collection.update_one(
-            {"_id": ObjectId(user_id)},
-            {"$inc": {"streak": 1}}
-        )
-    else:
-        # Reset streak
-        users_collection.update_one(
-            {"_id": ObjectId(user_id)},
-            {"$set": {"streak": 1}}
-        )
+    # Credit recently shown suggestions and refresh this user's rankings
+    record_mood_checkins(user_id, [(now, mood.mood_score)])
     
-    # Check if user has earned any badges
-    user = users_collection.find_one({"_id": ObjectId(user_id)})
-    streak = user.get("streak", 0)
-    badges = user.get("badges", [])
-    
-    # Add streak badges
-    if streak >= 7 and "7-day-streak" not in badges:
-        users_collection.update_one(
-            {"_id": ObjectId(user_id)},
-            {"$push": {"badges": "7-day-streak"}}
-        )
+    return MoodResponse(
+        id=str(mood_data["_id"]),
+        mood_score=mood_data["mood_score"],
+        energy_level=mood_data["energy_level"],
+        focus_level=mood_data["focus_level"],
+        notes=mood_data["notes"],
+        created_at=mood_data["created_at"]
+    )
+
+@router.post("/batch", response_model=MoodBatchResponse)
+async def create_mood_entries_batch(
+    batch: MoodBatchCreate,
+    current_user: dict = Depends(get_current_user)
+):
+    user_id = str(current_user["_id"])
+    now = datetime.now()
     
-    if streak >= 30 and "30-day-streak" not in badges:
-        users_collection.update_one(
-            {"_id": ObjectId(user_id)},
-            {"$push": {"badges": "30-day-streak"}}
+    # Build all mood documents up front
+    mood_docs = [
+        {
+            "user_id": user_id,
+            "client_id": entry.client_id,
+            "mood_score": entry.mood_score,
+            "energy_level": entry.energy_level,
+            "focus_level": entry.focus_level,
+            "notes": entry.notes,
+            "created_at": client_timestamp(entry.created_at, now)
+        }
+        for entry in batch.entries
+    ]
+    
+    # Write everything in one batch, skipping already-synced keys
+    inserted, duplicates = storage.moods.insert_batch(user_id, mood_docs)
+    if inserted:
+        bump_version(user_id, "mood")
+    
+    # Recompute streak and badges once for the whole batch
+    streak = current_user.get("streak", 0)
+    if inserted:
+        streak = compute_streak(user_id, now)
+        update_streak_and_badges(user_id, streak)
+        record_mood_checkins(
+            user_id,
+            [(doc["created_at"], doc["mood_score"]) for doc in sorted(inserted, key=lambda doc: doc["created_at"])]
         )
-    
-    # Get created mood entry
-    created_mood = moods_collection.find_one({"_id": result.inserted_id})
-    
-    return MoodResponse(
-        id=str(created_mood["_id"]),
-        mood_score=created_mood["mood_score"],
-        energy_level=created_mood["energy_level"],
-        focus_level=created_mood["focus_level"],
-        notes=created_mood["notes"],
-        created_at=created_mood["created_at"]
+        
+    return MoodBatchResponse(
+        created=[
+            MoodResponse(
+                id=str(doc["_id"]),
+                mood_score=doc["mood_score"],
+                energy_level=doc["energy_level"],
+                focus_level=doc["focus_level"],
+                notes=doc["notes"],
+                created_at=doc["created_at"]
+            )
+            for doc in inserted
+        ],
+        duplicates=duplicates,
+        streak_days=streak
     )
 
 @router.get("/", response_model=List[MoodResponse])
-async def get_mood_entries(current_user: dict = Depends(get_current_user)):
+async def get_mood_entries(request: Request, current_user: dict = Depends(get_current_user)):
     user_id = str(current_user["_id"])
     
-    # Get all mood entries for user
-    entries = list(moods_collection.find({"user_id": user_id}).sort("created_at", -1))
+    # Answer from the version stamp alone when the client's copy is current
+    not_modified, cache_headers = conditional_get(request, current_user, "mood")
+    if not_modified:
+        return not_modified
     
-    # Convert ObjectId to string
-    for entry in entries:
-        entry["id"] = str(entry["_id"])
+    # Get all mood entries for user, fetching only the response fields
+    entries = storage.moods.list(user_id)
     
-    return entries
+    return compress_response(
+        request,
+        fast_json_response([mood_row(entry) for entry in entries], headers=cache_headers)
+    )
 
 @router.get("/stats", response_model=MoodStats)
-async def get_mood_stats(current_user: dict = Depends(get_current_user)):
+async def get_mood_stats(request: Request, current_user: dict = Depends(get_current_user)):
     user_id = str(current_user["_id"])
     
-    # Get all mood entries for user
-    entries = list(moods_collection.find({"user_id": user_id}))
+    # The 7-day trend shifts daily, so the date is part of the tag
+    not_modified, cache_headers = conditional_get(request, current_user, "mood", "stats", date.today().isoformat())
+    if not_modified:
+        return not_modified
     
-    if not entries:
-        return MoodStats(
+    # Totals and the last 7 days in one query
+    today = datetime.now()
+    first_day = today - timedelta(days=6)
+    trend_start = datetime(first_day.year, first_day.month, first_day.day)
+    summary = storage.moods.summary(user_id, trend_start, recent=0)
+    
+    if not summary["count"]:
+        stats = MoodStats(
             average_mood=0,
             average_energy=0,
             average_focus=0,
             mood_trend=[],
             streak_days=0
         )
+        return fast_json_response(stats.model_dump(), headers=cache_headers)
     
-    # Calculate averages
-    total_mood = sum(entry["mood_score"] for entry in entries)
-    total_energy = sum(entry["energy_level"] for entry in entries)
-    total_focus = sum(entry["focus_level"] for entry in entries)
-    count = len(entries)
-    
-    # Get user streak
-    user = users_collection.find_one({"_id": ObjectId(user_id)})
-    streak = user.get("streak", 0)
+    # The authenticated user document already carries the streak
+    streak = current_user.get("streak", 0)
     
     # Create mood trend data (last 7 days)
-    today = datetime.now()
     mood_trend = []
-    
-    for i in range(6, -1, -1):
-        day = today - timedelta(days=i)
-        day_start = datetime(day.year, day.month, day.day)
-        day_end = day_start + timedelta(days=1)
-        
-        # Find mood entry for this day
-        day_entry = moods_collection.find_one({
-            "user_id": user_id,
-            "created_at": {"$gte": day_start, "$lt": day_end}
-        })
-        
-        mood_value = day_entry["mood_score"] if day_entry else None
-        mood_trend.append({
-            "date": day_start.strftime("%Y-%m-%d"),
-            "value": mood_value
-        })
-    
-    return MoodStats(
-        average_mood=round(total_mood / count, 1),
-        average_energy=round(total_energy / count, 1),
-        average_focus=round(total_focus / count, 1),
+    for i in range(7):
+        day = (trend_start + timedelta(days=i)).strftime("%Y-%m-%d")
+        mood_trend.append({"date": day, "value": summary["trend"].get(day)})
+    
+    stats = MoodStats(
+        average_mood=round(summary["mood"], 1),
+        average_energy=round(summary["energy"], 1),
+        average_focus=round(summary["focus"], 1),
         mood_trend=mood_trend,
         streak_days=streak
-    )
\ No newline at end of file
+    )
+    
+    return fast_json_response(stats.model_dump(), headers=cache_headers)
+
+@router.get("/analytics", response_model=MoodAnalytics)
+async def get_mood_analytics(
+    start: Optional[date] = Query(None),
+    end: Optional[date] = Query(None),
+    window: int = Query(7, ge=1, le=365),
+    current_user: dict = Depends(get_current_user)
+):
+    end = end or date.today()
+    start = start or end - timedelta(days=89)
+    
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must not be after end"
+        )
+    
+    if (end - start).days > 3660:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Date range cannot exceed 10 years"
+        )
+    
+    # The full series is cached as NumPy arrays until the user's next check-in
+    series = mood_analytics.get_series(current_user)
+    
+    return fast_json_response(mood_analytics.analyze(series, start, end, window))
@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Optional
+
+from models.summary import WeeklySummary
+from utils.auth import get_current_user
+from utils.weekly_summary import previous_week
+from config.storage import storage
+
+router = APIRouter()
+
+@router.get("/weekly", response_model=WeeklySummary)
+async def get_weekly_summary(
+    week: Optional[str] = Query(None, pattern=r"^\d{4}-W\d{2}$"),
+    current_user: dict = Depends(get_current_user)
+):
+    user_id = str(current_user["_id"])
+    week = week or previous_week()
+    
+    # Summaries are generated offline by jobs/weekly_summaries.py
+    summary = storage.summaries.get(user_id, week)
+    
+    if not summary:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No summary available for this week"
+        )
+    
+    return WeeklySummary(
+        week=summary["week"],
+        start=summary["start"].date(),
+        end=summary["end"].date(),
+        summary=summary["summary"],
+        mood_checkins=summary["mood_checkins"],
+        average_mood=summary["average_mood"],
+        journal_entries=summary["journal_entries"],
+        generated_at=summary["generated_at"]
+    )
@@ -1,25 +1,24 @@
 from fastapi import APIRouter, HTTPException, Depends, status
 from fastapi.security import OAuth2PasswordRequestForm
 from datetime import datetime, timedelta
-from bson import ObjectId
 from typing import List
 
 from models.user import UserCreate, UserResponse, Token, UserInDB
 from utils.auth import get_password_hash, verify_password, create_access_token, get_current_user
-from config.database import users_collection
+from config.storage import storage
 
 router = APIRouter()
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register_user(user: UserCreate):
     # Check if user already exists
-    if users_collection.find_one({"email": user.email}):
+    if storage.users.get_by_email(user.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    if users_collection.find_one({"username": user.username}):
+    if storage.users.get_by_username(user.username):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already taken"
@@ -40,10 +39,7 @@ async def register_user(user: UserCreate):
         "settings": {}
     }
     
-    result = users_collection.insert_one(user_data)
-    
-    # Return the created user
-    created_user = users_collection.find_one({"_id": result.inserted_id})
+    created_user = storage.users.create(user_data)
     created_user["id"] = str(created_user["_id"])
     
     return UserResponse(
@@ -58,7 +54,7 @@ async def register_user(user: UserCreate):
 @router.post("/token", response_model=Token)
 async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
     # Find user by email
-    user = users_collection.find_one({"email": form_data.username})
+    user = storage.users.get_by_email(form_data.username)
     
     if not user or not verify_password(form_data.password, user["hashed_password"]):
         raise HTTPException(
@@ -88,20 +84,16 @@ async def read_users_me(current_user: dict = Depends(get_current_user)):
 
 @router.get("/stats")
 async def get_user_stats(current_user: dict = Depends(get_current_user)):
-    user_id = current_user["_id"]
-    
-    # Get user streak and badges
-    user = users_collection.find_one({"_id": user_id})
+    user_id = str(current_user["_id"])
     
     # Get counts of journal entries and mood check-ins
-    from config.database import journals_collection, moods_collection
-    
-    journal_count = journals_collection.count_documents({"user_id": str(user_id)})
-    mood_count = moods_collection.count_documents({"user_id": str(user_id)})
+    journal_count = storage.journals.count(user_id)
+    mood_count = storage.moods.count(user_id)
     
+    # The authenticated user document already carries streak and badges
     return {
-        "streak": user["streak"],
-        "badges": user["badges"],
+        "streak": current_user["streak"],
+        "badges": current_user["badges"],
         "journal_entries": journal_count,
         "mood_checkins": mood_count
     }
\ No newline at end of file
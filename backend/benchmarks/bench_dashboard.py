@@ -0,0 +1,169 @@
+"""Database round trips and latency: /api/dashboard vs the three-call pattern.
+
+The dashboard page used to call /api/users/stats, /api/mood/stats and
+/api/mood/ in parallel, each authenticating separately. Those handlers have
+since been slimmed down on their own (the mood stats became one summary query
+and the user stats stopped reloading the user), so the three-call side runs
+copies of the handlers as they were when /api/dashboard was introduced, kept
+here as the fixed baseline. This seeds a user through the storage layer in a
+scratch database on the configured MongoDB, calls the handlers directly and
+counts the commands sent to the server with pymongo monitoring.
+
+Run from the backend directory (needs a reachable MongoDB):
+    python -m benchmarks.bench_dashboard
+"""
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from pymongo import monitoring
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ["STORAGE_BACKEND"] = "mongo"
+os.environ["DATABASE_NAME"] = "mental_fitness_bench"
+
+MOOD_ENTRIES = 2000
+JOURNAL_ENTRIES = 300
+REPEAT = 20
+
+
+class CommandCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+counter = CommandCounter()
+monitoring.register(counter)
+
+from config.storage import storage
+from config.database import client, users_collection, moods_collection, journals_collection
+from models.mood import MoodStats, MOOD_ROW_PROJECTION, mood_row
+from utils.auth import create_access_token, get_current_user
+from utils.responses import fast_json_response
+from api.routes.dashboard_router import get_dashboard
+
+
+def seed() -> str:
+    email = "bench@example.com"
+    now = datetime.now()
+    user = storage.users.create({
+        "username": "bench", "email": email, "hashed_password": "x",
+        "created_at": now, "updated_at": now,
+        "streak": 12, "badges": ["7-day-streak"], "settings": {}
+    })
+    user_id = str(user["_id"])
+    storage.moods.insert_batch(user_id, [
+        {"user_id": user_id, "client_id": f"m{i}", "mood_score": random.randint(1, 10),
+         "energy_level": random.randint(1, 10), "focus_level": random.randint(1, 10),
+         "notes": None, "created_at": now - timedelta(hours=6 * i)}
+        for i in range(MOOD_ENTRIES)
+    ])
+    storage.journals.insert_batch(user_id, [
+        {"user_id": user_id, "client_id": f"j{i}", "content": "Reflecting on the day. " * 20, "mood": "calm",
+         "tags": ["daily"], "created_at": now - timedelta(days=i), "updated_at": now - timedelta(days=i)}
+        for i in range(JOURNAL_ENTRIES)
+    ])
+    return create_access_token({"sub": email})
+
+
+# The three handlers as the dashboard page called them before /api/dashboard
+
+async def legacy_user_stats(current_user: dict):
+    user_id = current_user["_id"]
+    user = users_collection.find_one({"_id": user_id})
+    journal_count = journals_collection.count_documents({"user_id": str(user_id)})
+    mood_count = moods_collection.count_documents({"user_id": str(user_id)})
+    return {
+        "streak": user["streak"],
+        "badges": user["badges"],
+        "journal_entries": journal_count,
+        "mood_checkins": mood_count
+    }
+
+
+async def legacy_mood_entries(current_user: dict):
+    user_id = str(current_user["_id"])
+    cursor = moods_collection.find({"user_id": user_id}, MOOD_ROW_PROJECTION).sort("created_at", -1)
+    return fast_json_response([mood_row(entry) for entry in cursor])
+
+
+async def legacy_mood_stats(current_user: dict):
+    user_id = str(current_user["_id"])
+    entries = list(moods_collection.find({"user_id": user_id}))
+    count = len(entries)
+    user = users_collection.find_one({"_id": current_user["_id"]})
+
+    # One query per day of the 7-day trend
+    today = datetime.now()
+    mood_trend = []
+    for i in range(6, -1, -1):
+        day = today - timedelta(days=i)
+        day_start = datetime(day.year, day.month, day.day)
+        day_entry = moods_collection.find_one({
+            "user_id": user_id,
+            "created_at": {"$gte": day_start, "$lt": day_start + timedelta(days=1)}
+        })
+        mood_trend.append({
+            "date": day_start.strftime("%Y-%m-%d"),
+            "value": day_entry["mood_score"] if day_entry else None
+        })
+
+    return MoodStats(
+        average_mood=round(sum(e["mood_score"] for e in entries) / count, 1),
+        average_energy=round(sum(e["energy_level"] for e in entries) / count, 1),
+        average_focus=round(sum(e["focus_level"] for e in entries) / count, 1),
+        mood_trend=mood_trend,
+        streak_days=user.get("streak", 0)
+    )
+
+
+async def three_calls(token: str):
+    async def stats():
+        return await legacy_user_stats(await get_current_user(token))
+
+    async def mood_stats():
+        return await legacy_mood_stats(await get_current_user(token))
+
+    async def mood_entries():
+        return await legacy_mood_entries(await get_current_user(token))
+
+    await asyncio.gather(stats(), mood_stats(), mood_entries())
+
+
+async def dashboard(token: str):
+    await get_dashboard(recent=5, current_user=await get_current_user(token))
+
+
+def measure(name: str, call, token: str):
+    counter.count = 0
+    asyncio.run(call(token))
+    round_trips = counter.count
+    timings = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        asyncio.run(call(token))
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    print(f"{name:<12} round trips {round_trips:4d}   "
+          f"median {timings[len(timings) // 2] * 1000:8.2f} ms   min {timings[0] * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    try:
+        token = seed()
+        measure("three-call", three_calls, token)
+        measure("dashboard", dashboard, token)
+    finally:
+        client.drop_database(os.environ["DATABASE_NAME"])
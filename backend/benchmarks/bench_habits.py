@@ -0,0 +1,97 @@
+"""Habit queries on per-year bitsets vs one document per check-off.
+
+Simulates a user with several years of history for a handful of habits and
+times current streak, weekly completion and a yearly heatmap for both
+layouts, plus the BSON size each layout stores.
+
+Run from the backend directory:
+    python -m benchmarks.bench_habits
+"""
+import random
+import sys
+import os
+import timeit
+from datetime import date, datetime, timedelta
+
+import bson
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from utils.habits import (
+    empty_year, day_update, current_streak, count_between, week_start, heatmap,
+    WORD_MASK, WORD_BITS
+)
+from bson.int64 import Int64
+
+YEARS = 5
+COMPLETION = 0.75
+REPEAT = 200
+
+
+def simulate(today: date):
+    random.seed(42)
+    start = today - timedelta(days=365 * YEARS)
+    return [start + timedelta(days=i) for i in range((today - start).days + 1)
+            if random.random() < COMPLETION]
+
+
+def build_bitset(days):
+    habit = {"_id": bson.ObjectId(), "user_id": "u1", "name": "Meditate", "days": {}}
+    for day in days:
+        words = habit["days"].setdefault(str(day.year), [Int64(w) for w in empty_year()])
+        field, mask = day_update(day)
+        word = int(field.rsplit(".", 1)[1])
+        value = (int(words[word]) | int(mask)) & WORD_MASK
+        if value >= 1 << (WORD_BITS - 1):
+            value -= 1 << WORD_BITS
+        words[word] = Int64(value)
+    return habit
+
+
+def build_events(days):
+    # The alternative layout: one document per check-off
+    return [
+        {"_id": bson.ObjectId(), "user_id": "u1", "habit_id": "h1",
+         "day": datetime(d.year, d.month, d.day)}
+        for d in days
+    ]
+
+
+def events_queries(events, today):
+    done = {e["day"].date() for e in events}
+    day = today if today in done else today - timedelta(days=1)
+    streak = 0
+    while day in done:
+        streak += 1
+        day -= timedelta(days=1)
+    monday = week_start(today)
+    week = sum(1 for d in done if monday <= d <= today)
+    first = date(today.year, 1, 1)
+    grid = "".join("1" if first + timedelta(days=i) in done else "0"
+                   for i in range((date(today.year, 12, 31) - first).days + 1))
+    return streak, week, grid
+
+
+def bitset_queries(habit, today):
+    return (current_streak(habit, today),
+            count_between(habit, week_start(today), today),
+            heatmap(habit, today.year))
+
+
+if __name__ == "__main__":
+    today = date.today()
+    days = simulate(today)
+    habit = build_bitset(days)
+    events = build_events(days)
+
+    assert bitset_queries(habit, today) == events_queries(events, today)
+
+    bitset_bytes = len(bson.encode(habit))
+    events_bytes = sum(len(bson.encode(e)) for e in events)
+    bitset_time = min(timeit.repeat(lambda: bitset_queries(habit, today), number=1, repeat=REPEAT))
+    events_time = min(timeit.repeat(lambda: events_queries(events, today), number=1, repeat=REPEAT))
+
+    print(f"{len(days)} check-offs over {YEARS} years")
+    print(f"bitset   {1:6d} doc   {bitset_bytes:8d} bytes   {bitset_time * 1000:8.3f} ms/query set")
+    print(f"events   {len(events):6d} docs  {events_bytes:8d} bytes   {events_time * 1000:8.3f} ms/query set")
+    print("events time excludes fetching the documents from Mongo, which dominates in practice")
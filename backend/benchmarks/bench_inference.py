@@ -0,0 +1,119 @@
+"""Resident memory and throughput of in-process vs shared inference.
+
+For each worker count, starts that many processes that each run sentiment and
+emotion inference over a fixed set of texts, either loading the models
+themselves (in-process) or calling the shared inference server. Calls go
+around the per-process insights cache, since the texts repeat every round.
+Reports the summed RSS of all involved processes and the aggregate texts per
+second.
+
+Run from the backend directory:
+    python -m benchmarks.bench_inference --workers 1 2 4
+"""
+import argparse
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+SOCKET = "/tmp/mfc-inference-bench.sock"
+TEXTS = [
+    "I felt anxious before the meeting but it went fine.",
+    "Today was a good day, I went for a run and felt calm.",
+    "I'm so tired of everything going wrong lately.",
+    "Grateful for my friends who checked in on me.",
+] * 8
+ROUNDS = 20
+
+
+def rss_kb(pid: int) -> int:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def worker(shared: bool, ready, start, done):
+    if shared:
+        os.environ["INFERENCE_SOCKET"] = SOCKET
+    else:
+        os.environ.pop("INFERENCE_SOCKET", None)
+    from utils.sentiment import _compute_insights_batch, load_pipelines
+    if not shared:
+        load_pipelines()
+    _compute_insights_batch(TEXTS[:1])
+    ready.set()
+    start.wait()
+    for _ in range(ROUNDS):
+        # One request per entry, as the chat path sends them
+        for text in TEXTS:
+            _compute_insights_batch([text])
+    done.set()
+    time.sleep(3600)
+
+
+def wait_for_socket(path: str, timeout: float = 300.0):
+    import socket
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(path)
+                return
+        except OSError:
+            time.sleep(0.5)
+    raise RuntimeError("inference server did not start")
+
+
+def run(workers: int, shared: bool):
+    server = None
+    if shared:
+        server = subprocess.Popen(
+            [sys.executable, "inference_server.py", "--socket", SOCKET],
+            cwd=os.path.join(os.path.dirname(__file__), ".."),
+            stdout=subprocess.DEVNULL,
+        )
+        wait_for_socket(SOCKET)
+
+    ctx = multiprocessing.get_context("spawn")
+    start = ctx.Event()
+    ready = [ctx.Event() for _ in range(workers)]
+    done = [ctx.Event() for _ in range(workers)]
+    processes = [ctx.Process(target=worker, args=(shared, ready[i], start, done[i]))
+                 for i in range(workers)]
+    for process in processes:
+        process.start()
+    for event in ready:
+        event.wait()
+
+    began = time.perf_counter()
+    start.set()
+    for event in done:
+        event.wait()
+    elapsed = time.perf_counter() - began
+
+    pids = [p.pid for p in processes] + ([server.pid] if server else [])
+    memory_mb = sum(rss_kb(pid) for pid in pids) / 1024
+
+    for process in processes:
+        process.terminate()
+    if server:
+        server.terminate()
+        server.wait()
+
+    throughput = workers * ROUNDS * len(TEXTS) / elapsed
+    mode = "shared" if shared else "in-process"
+    print(f"{mode:<11} workers={workers:<3} rss={memory_mb:9.1f} MB   {throughput:9.1f} texts/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+    for count in args.workers:
+        run(count, shared=False)
+        run(count, shared=True)
@@ -0,0 +1,93 @@
+"""Serialization cost per 1k rows for the list endpoints.
+
+Compares the previous path (raw documents validated against the response
+model, then encoded by FastAPI) with the projected-row + ORJSON path.
+
+Run from the backend directory:
+    python -m benchmarks.bench_serialization
+"""
+import json
+import sys
+import os
+import timeit
+from datetime import datetime, timedelta
+from typing import List
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from models.mood import MoodResponse, MOOD_ROW_PROJECTION, mood_row
+from models.journal import JournalResponse, JOURNAL_ROW_PROJECTION, journal_row
+from utils.responses import fast_json_response
+
+ROWS = 1000
+REPEAT = 20
+
+
+def make_mood_docs(n):
+    now = datetime.now()
+    return [
+        {
+            "_id": ObjectId(),
+            "user_id": "652f1c2e9b1e8a0012345678",
+            "mood_score": i % 10 + 1,
+            "energy_level": (i * 3) % 10 + 1,
+            "focus_level": (i * 7) % 10 + 1,
+            "notes": "Felt okay after a walk" if i % 3 else None,
+            "created_at": now - timedelta(hours=i),
+        }
+        for i in range(n)
+    ]
+
+
+def make_journal_docs(n):
+    now = datetime.now()
+    return [
+        {
+            "_id": ObjectId(),
+            "user_id": "652f1c2e9b1e8a0012345678",
+            "content": "Today I noticed that I was worrying about work again. " * 8,
+            "mood": "calm",
+            "tags": ["work", "reflection"],
+            "created_at": now - timedelta(hours=i),
+            "updated_at": now - timedelta(hours=i),
+        }
+        for i in range(n)
+    ]
+
+
+def project(docs, projection):
+    keep = set(projection) | {"_id"}
+    return [{k: v for k, v in doc.items() if k in keep} for doc in docs]
+
+
+def legacy_path(docs, adapter):
+    # What FastAPI did before: validate every raw document, then encode
+    for doc in docs:
+        doc["id"] = str(doc["_id"])
+    validated = adapter.validate_python(docs)
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+
+def fast_path(docs, row):
+    return fast_json_response([row(doc) for doc in docs]).body
+
+
+def bench(name, docs, projection, adapter, row):
+    legacy = timeit.repeat(lambda: legacy_path([dict(d) for d in docs], adapter), number=1, repeat=REPEAT)
+    projected = project(docs, projection)
+    fast = timeit.repeat(lambda: fast_path(projected, row), number=1, repeat=REPEAT)
+    per_1k = 1000 / len(docs) * 1000
+    print(f"{name:<8} legacy {min(legacy) * per_1k:8.2f} ms/1k rows   "
+          f"fast {min(fast) * per_1k:8.2f} ms/1k rows   "
+          f"speedup {min(legacy) / min(fast):5.1f}x")
+
+
+if __name__ == "__main__":
+    bench("mood", make_mood_docs(ROWS), MOOD_ROW_PROJECTION,
+          TypeAdapter(List[MoodResponse]), mood_row)
+    bench("journal", make_journal_docs(ROWS), JOURNAL_ROW_PROJECTION,
+          TypeAdapter(List[JournalResponse]), journal_row)
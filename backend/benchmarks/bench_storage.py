@@ -0,0 +1,198 @@
+"""Endpoint latency on the MongoDB and embedded SQLite storage backends.
+
+Each backend runs in its own process (the backend is chosen once at import
+time): it seeds one user with a realistic history through the storage layer,
+then calls the route handlers directly and reports median and p95 latency per
+endpoint. MongoDB data goes to a scratch database that is dropped afterwards;
+SQLite uses a temporary file.
+
+Run from the backend directory (the mongo column needs a reachable MongoDB):
+    python -m benchmarks.bench_storage --backends mongo sqlite
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+MOOD_ENTRIES = 2000
+JOURNAL_ENTRIES = 300
+CHAT_MESSAGES = 400
+REPEAT = 50
+
+
+def _request():
+    from starlette.requests import Request
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": [], "query_string": b""})
+
+
+def seed(storage) -> dict:
+    now = datetime.now()
+    user = storage.users.create({
+        "username": "bench", "email": "bench@example.com", "hashed_password": "x",
+        "created_at": now, "updated_at": now, "streak": 12, "badges": ["7-day-streak"], "settings": {}
+    })
+    user_id = str(user["_id"])
+    storage.moods.insert_batch(user_id, [
+        {"user_id": user_id, "client_id": f"m{i}", "mood_score": random.randint(1, 10),
+         "energy_level": random.randint(1, 10), "focus_level": random.randint(1, 10),
+         "notes": None, "created_at": now - timedelta(hours=6 * i)}
+        for i in range(MOOD_ENTRIES)
+    ])
+    storage.journals.insert_batch(user_id, [
+        {"user_id": user_id, "client_id": f"j{i}", "content": "Reflecting on the day. " * 20,
+         "mood": "calm", "tags": ["daily"], "sentiment": "POSITIVE", "emotion": "joy",
+         "created_at": now - timedelta(days=i), "updated_at": now - timedelta(days=i)}
+        for i in range(JOURNAL_ENTRIES)
+    ])
+    storage.chats.append(user_id, [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": "How are you feeling today? " * 4,
+         "timestamp": now - timedelta(minutes=CHAT_MESSAGES - i)}
+        for i in range(CHAT_MESSAGES)
+    ])
+    habit = storage.habits.create({
+        "user_id": user_id, "name": "Meditate", "description": None, "target_per_week": 5,
+        "days": {}, "created_at": now - timedelta(days=400), "updated_at": now
+    })
+    return {"email": user["email"], "habit_id": str(habit["_id"])}
+
+
+def run_backend() -> dict:
+    """Seed and time every endpoint on the backend selected by STORAGE_BACKEND."""
+    from config.storage import storage
+    from models.mood import MoodCreate, MoodBatchCreate
+    from models.habit import HabitCheck
+    from utils.auth import create_access_token, get_current_user
+    from api.routes.user_router import get_user_stats
+    from api.routes.mood_router import create_mood_entry, create_mood_entries_batch, get_mood_entries, get_mood_stats
+    from api.routes.journal_router import get_journal_entries
+    from api.routes.chat_router import get_chat_history
+    from api.routes.dashboard_router import get_dashboard
+    from api.routes.habit_router import check_habit, get_habits
+
+    seeded = seed(storage)
+    token = create_access_token({"sub": seeded["email"]})
+    batch_counter = iter(range(10 ** 9))
+
+    async def auth():
+        return await get_current_user(token)
+
+    async def user_stats():
+        return await get_user_stats(current_user=await auth())
+
+    async def mood_create():
+        return await create_mood_entry(MoodCreate(mood_score=7, energy_level=6, focus_level=5), current_user=await auth())
+
+    async def mood_batch():
+        n = next(batch_counter)
+        entries = [{"client_id": f"b{n}-{i}", "mood_score": 5, "energy_level": 5, "focus_level": 5} for i in range(20)]
+        return await create_mood_entries_batch(MoodBatchCreate(entries=entries), current_user=await auth())
+
+    async def mood_list():
+        return await get_mood_entries(_request(), current_user=await auth())
+
+    async def mood_stats():
+        return await get_mood_stats(_request(), current_user=await auth())
+
+    async def journal_list():
+        return await get_journal_entries(_request(), current_user=await auth())
+
+    async def chat_history():
+        return await get_chat_history(_request(), before=None, limit=50, current_user=await auth())
+
+    async def dashboard():
+        return await get_dashboard(recent=5, current_user=await auth())
+
+    async def habit_check():
+        day = date.today() - timedelta(days=random.randint(0, 300))
+        return await check_habit(seeded["habit_id"], HabitCheck(day=day), current_user=await auth())
+
+    async def habit_list():
+        return await get_habits(current_user=await auth())
+
+    calls = {
+        "auth lookup": auth,
+        "GET /users/stats": user_stats,
+        "POST /mood": mood_create,
+        "POST /mood/batch (20)": mood_batch,
+        "GET /mood": mood_list,
+        "GET /mood/stats": mood_stats,
+        "GET /journal": journal_list,
+        "GET /chat/history": chat_history,
+        "GET /dashboard": dashboard,
+        "POST /habits/check": habit_check,
+        "GET /habits": habit_list,
+    }
+
+    results = {}
+    for name, call in calls.items():
+        asyncio.run(call())
+        timings = []
+        for _ in range(REPEAT):
+            started = time.perf_counter()
+            asyncio.run(call())
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        results[name] = {"median": timings[len(timings) // 2], "p95": timings[int(len(timings) * 0.95) - 1]}
+    return results
+
+
+def child(backend: str):
+    os.environ["STORAGE_BACKEND"] = backend
+    os.environ["DATABASE_NAME"] = "mental_fitness_bench"
+    os.environ.setdefault("JWT_SECRET", "bench")
+    try:
+        results = run_backend()
+    finally:
+        if backend == "mongo":
+            from config.database import client
+            client.drop_database(os.environ["DATABASE_NAME"])
+    print(json.dumps(results))
+
+
+def spawn(backend: str):
+    env = dict(os.environ)
+    with tempfile.TemporaryDirectory() as scratch:
+        env["SQLITE_PATH"] = os.path.join(scratch, "bench.db")
+        result = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_storage", "--child", backend],
+            cwd=os.path.join(os.path.dirname(__file__), ".."),
+            env=env, capture_output=True, text=True
+        )
+    if result.returncode != 0:
+        print(f"{backend}: failed\n{result.stderr}", file=sys.stderr)
+        return None
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=["mongo", "sqlite"])
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        sys.exit(0)
+
+    results = {backend: spawn(backend) for backend in args.backends}
+    ran = [backend for backend in args.backends if results[backend]]
+    if not ran:
+        sys.exit(1)
+
+    header = f"{'endpoint':<24}" + "".join(f"{backend + ' median':>16}{'p95':>10}" for backend in ran)
+    print(header)
+    print("-" * len(header))
+    for name in results[ran[0]]:
+        row = f"{name:<24}"
+        for backend in ran:
+            timing = results[backend][name]
+            row += f"{timing['median']:>13.2f} ms{timing['p95']:>7.2f} ms"
+        print(row)
@@ -6,10 +6,12 @@ from dotenv import load_dotenv
 from langchain.llms.base import LLM
 try:
     from langchain.embeddings import HuggingFaceEmbeddings
+    from langchain.embeddings.base import Embeddings
     from langchain.vectorstores import FAISS
     HAS_RETRIEVAL = True
 except Exception:
     HuggingFaceEmbeddings = None  # type: ignore
+    Embeddings = object  # type: ignore
     FAISS = None  # type: ignore
     HAS_RETRIEVAL = False
 from langchain.memory import ConversationBufferMemory
@@ -19,6 +21,8 @@ from langchain.chains import ConversationalRetrievalChain
 import google.generativeai as genai
 from pydantic.v1 import PrivateAttr
 
+from utils.inference_client import get_client, InferenceUnavailable
+
 # Load environment variables
 load_dotenv()
 USE_RETRIEVAL_ENV = os.getenv("USE_RETRIEVAL", "auto").lower()
@@ -48,6 +52,9 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
 EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 
+# Returned in place of a reply when the Gemini call fails
+FALLBACK_RESPONSE = "I'm sorry, I had trouble generating a response. Could you please try again?"
+
 
 class GeminiLLM(LLM):
     """LangChain-compatible wrapper over the Gemini API."""
@@ -75,7 +82,7 @@ class GeminiLLM(LLM):
             response = self._model.generate_content(combined_prompt)
             text = response.text or ""
         except Exception:
-            text = "I'm sorry, I had trouble generating a response. Could you please try again?"
+            text = FALLBACK_RESPONSE
         # Respect stop tokens if provided
         if stop:
             for s in stop:
@@ -89,14 +96,54 @@ def get_llm():
     return GeminiLLM()
 
 
+class RemoteEmbeddings(Embeddings):
+    """Embeddings served by the shared model server, loading MiniLM locally only if it is down."""
+
+    def __init__(self, client):
+        self.client = client
+        self._fallback = None
+
+    def _local(self):
+        if self._fallback is None:
+            self._fallback = get_local_embeddings()
+        if self._fallback is None:
+            raise RuntimeError("Embedding model is unavailable")
+        return self._fallback
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        try:
+            return self.client.request("embed", list(texts))
+        except InferenceUnavailable:
+            return self._local().embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+_local_embeddings = None
+
+
+# Load the embedding model in this process (cached for its lifetime)
+def get_local_embeddings():
+    global _local_embeddings
+    if not HAS_RETRIEVAL or HuggingFaceEmbeddings is None:
+        return None
+    if _local_embeddings is None:
+        try:
+            _local_embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
+        except Exception:
+            return None
+    return _local_embeddings
+
+
 # Initialize embeddings
 def get_embeddings():
     if not HAS_RETRIEVAL or HuggingFaceEmbeddings is None:
         return None
-    try:
-        return HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
-    except Exception:
-        return None
+    client = get_client()
+    if client is not None:
+        return RemoteEmbeddings(client)
+    return get_local_embeddings()
 
 
 # Create or load vector store
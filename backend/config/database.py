@@ -19,7 +19,37 @@ chats_collection = db["chats"]
 journals_collection = db["journals"]
 moods_collection = db["moods"]
 habits_collection = db["habits"]
+suggestion_rankings_collection = db["suggestion_rankings"]
+chat_archives_collection = db["chat_archives"]
+chat_emotions_collection = db["chat_emotions"]
+journal_embeddings_collection = db["journal_embeddings"]
+weekly_summaries_collection = db["weekly_summaries"]
+summary_runs_collection = db["summary_runs"]
 
-# Create indexes
-users_collection.create_index("email", unique=True)
-users_collection.create_index("username", unique=True)
\ No newline at end of file
+
+def create_indexes():
+    users_collection.create_index("email", unique=True)
+    users_collection.create_index("username", unique=True)
+    moods_collection.create_index([("user_id", 1), ("created_at", -1)])
+    journals_collection.create_index([("user_id", 1), ("created_at", -1)])
+    chats_collection.create_index("user_id")
+    habits_collection.create_index([("user_id", 1), ("created_at", 1)])
+    chat_archives_collection.create_index([("user_id", 1), ("start", 1)], unique=True)
+    chat_emotions_collection.create_index([("user_id", 1), ("timestamp", 1)], unique=True)
+    chat_emotions_collection.create_index([("user_id", 1), ("emotion", 1), ("timestamp", -1)])
+    journals_collection.create_index([("user_id", 1), ("emotion", 1), ("created_at", -1)])
+    journals_collection.create_index([("user_id", 1), ("content", "text"), ("tags", "text")])
+    journal_embeddings_collection.create_index("user_id")
+    weekly_summaries_collection.create_index([("week", 1), ("status", 1)])
+    
+    # Idempotency keys for offline batch sync (only enforced when a client_id is set)
+    moods_collection.create_index(
+        [("user_id", 1), ("client_id", 1)],
+        unique=True,
+        partialFilterExpression={"client_id": {"$exists": True}}
+    )
+    journals_collection.create_index(
+        [("user_id", 1), ("client_id", 1)],
+        unique=True,
+        partialFilterExpression={"client_id": {"$exists": True}}
+    )
\ No newline at end of file
@@ -0,0 +1,23 @@
+import os
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# "mongo" (default) or "sqlite" for an embedded single-file database
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "mongo").lower()
+SQLITE_PATH = os.getenv("SQLITE_PATH", "mental_fitness.db")
+
+
+def create_storage():
+    if STORAGE_BACKEND == "sqlite":
+        from storage.sqlite import SQLiteStorage
+        return SQLiteStorage(SQLITE_PATH)
+    if STORAGE_BACKEND == "mongo":
+        from storage.mongo import MongoStorage
+        return MongoStorage()
+    raise ValueError(f"Unknown STORAGE_BACKEND: {STORAGE_BACKEND}")
+
+
+# Shared by the routers, utilities and jobs
+storage = create_storage()
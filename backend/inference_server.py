@@ -0,0 +1,158 @@
+"""Shared model server for sentiment, emotion and embedding inference.
+
+Loads each model once and serves every uvicorn worker on the host over a Unix
+domain socket. Requests that arrive within a few milliseconds of each other
+are merged into one batch per operation before running the models.
+
+Usage:
+    python inference_server.py --socket /tmp/mfc-inference.sock
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.inference_client import HEADER
+from utils.sentiment import load_pipelines, local_text_insights_batch
+from config.ai_config import get_local_embeddings
+
+DEFAULT_SOCKET = os.getenv("INFERENCE_SOCKET", "/tmp/mfc-inference.sock")
+MAX_BATCH = int(os.getenv("INFERENCE_MAX_BATCH", "64"))
+MAX_WAIT = float(os.getenv("INFERENCE_MAX_WAIT_MS", "5")) / 1000
+
+
+def _embed(texts):
+    embeddings = get_local_embeddings()
+    if embeddings is None:
+        raise RuntimeError("Embedding model is unavailable")
+    return embeddings.embed_documents(texts)
+
+
+RUNNERS = {
+    "insights": local_text_insights_batch,
+    "embed": _embed,
+}
+
+
+class BatchingModelServer:
+    def __init__(self, max_batch: int = MAX_BATCH, max_wait: float = MAX_WAIT):
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.queue = asyncio.Queue()
+        # Models are not thread-safe; one thread runs every batch
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.stats = {"requests": 0, "batches": 0, "texts": 0}
+
+    async def submit(self, op: str, texts: list):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((op, texts, future))
+        return await future
+
+    async def _collect(self):
+        # Wait for one request, then keep taking more until the batch is full or MAX_WAIT passes
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        size = len(batch[0][1])
+        deadline = loop.time() + self.max_wait
+        while size < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            batch.append(item)
+            size += len(item[1])
+        return batch
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            by_op = {}
+            for op, texts, future in batch:
+                by_op.setdefault(op, []).append((texts, future))
+
+            for op, requests in by_op.items():
+                texts = [text for request_texts, _ in requests for text in request_texts]
+                try:
+                    results = await loop.run_in_executor(self.executor, RUNNERS[op], texts)
+                except Exception as exc:
+                    for _, future in requests:
+                        if not future.done():
+                            future.set_exception(exc)
+                    continue
+
+                # Hand each caller back its own slice of the merged batch
+                offset = 0
+                for request_texts, future in requests:
+                    if not future.done():
+                        future.set_result(results[offset:offset + len(request_texts)])
+                    offset += len(request_texts)
+
+                self.stats["batches"] += 1
+                self.stats["texts"] += len(texts)
+                self.stats["requests"] += len(requests)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(HEADER.size)
+                except asyncio.IncompleteReadError:
+                    break
+                (length,) = HEADER.unpack(header)
+                request = json.loads(await reader.readexactly(length))
+
+                op = request.get("op")
+                if op == "ping":
+                    response = {"results": "pong", "stats": self.stats}
+                elif op not in RUNNERS:
+                    response = {"error": f"Unknown operation: {op}"}
+                else:
+                    try:
+                        response = {"results": await self.submit(op, request.get("texts", []))}
+                    except Exception as exc:
+                        response = {"error": str(exc)}
+
+                data = json.dumps(response).encode("utf-8")
+                writer.write(HEADER.pack(len(data)) + data)
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+async def serve(path: str):
+    # Load models before accepting connections so the first request is not slow
+    load_pipelines()
+    get_local_embeddings()
+
+    if os.path.exists(path):
+        os.unlink(path)
+
+    server = BatchingModelServer()
+    unix_server = await asyncio.start_unix_server(server.handle, path=path)
+    os.chmod(path, 0o600)
+    batcher = asyncio.create_task(server.run())
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    print(f"Inference server listening on {path}", flush=True)
+    async with unix_server:
+        await stop.wait()
+    batcher.cancel()
+    if os.path.exists(path):
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    args = parser.parse_args()
+    asyncio.run(serve(args.socket))
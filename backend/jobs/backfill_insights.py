@@ -0,0 +1,65 @@
+"""Store sentiment, emotion and search embeddings for entries written before they were persisted.
+
+Run from the backend directory:
+    python -m jobs.backfill_insights
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from utils.sentiment import get_text_insights_batch
+from utils.journal_search import backfill_embeddings
+from utils.versions import bump as bump_version
+from config.storage import storage
+
+BATCH_SIZE = 256
+
+
+def backfill_journals() -> int:
+    updated = 0
+    batch = []
+    for entry in storage.journals.missing_insights(BATCH_SIZE):
+        batch.append(entry)
+        if len(batch) == BATCH_SIZE:
+            updated += _write_journals(batch)
+            batch = []
+    if batch:
+        updated += _write_journals(batch)
+    return updated
+
+
+def _write_journals(entries) -> int:
+    insights = get_text_insights_batch([entry["content"] for entry in entries])
+    storage.journals.set_insights([
+        (str(entry["_id"]), result["sentiment"]["label"], result["emotion"]["emotion"])
+        for entry, result in zip(entries, insights)
+    ])
+    # Cached list responses now lack the new fields
+    for user_id in {entry["user_id"] for entry in entries}:
+        bump_version(user_id, "journal")
+    return len(entries)
+
+
+def backfill_chats() -> int:
+    updated = 0
+    for user_id in storage.chats.users_missing_insights():
+        pending = [
+            message for message in storage.chats.get_messages(user_id)
+            if message["role"] == "user" and not message.get("emotion")
+        ]
+        insights = get_text_insights_batch([message["content"] for message in pending])
+        count = storage.chats.set_message_insights(user_id, [
+            (message["timestamp"], result["sentiment"]["label"], result["emotion"]["emotion"])
+            for message, result in zip(pending, insights)
+        ])
+        if count:
+            bump_version(user_id, "chat")
+            updated += count
+    return updated
+
+
+if __name__ == "__main__":
+    print(f"journal entries updated: {backfill_journals()}")
+    print(f"chat messages updated:   {backfill_chats()}")
+    print(f"journal entries embedded: {backfill_embeddings()}")
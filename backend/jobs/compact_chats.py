@@ -0,0 +1,33 @@
+"""Move chat messages older than the hot window into compressed archive blocks.
+
+Run from the backend directory, e.g. nightly from cron:
+    python -m jobs.compact_chats --hot-days 30
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from utils.chat_archive import compact_all, CHAT_HOT_DAYS, ARCHIVE_BLOCK_SIZE
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hot-days", type=int, default=CHAT_HOT_DAYS)
+    parser.add_argument("--block-size", type=int, default=ARCHIVE_BLOCK_SIZE)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    totals = compact_all(args.hot_days, args.block_size)
+    elapsed = time.perf_counter() - started
+
+    ratio = totals["raw_bytes"] / totals["stored_bytes"] if totals["stored_bytes"] else 0
+    print(f"users compacted:   {totals['users']}")
+    print(f"messages archived: {totals['messages']} in {totals['blocks']} blocks")
+    print(f"raw bytes:         {totals['raw_bytes']}")
+    print(f"stored bytes:      {totals['stored_bytes']} ({ratio:.1f}x)")
+    print(f"bytes reclaimed:   {totals['bytes_reclaimed']}")
+    print(f"archive read:      {totals['read_ms_avg']:.1f} ms avg, {totals['read_ms_max']:.1f} ms max")
+    print(f"elapsed:           {elapsed:.2f}s")
@@ -0,0 +1,108 @@
+"""Generate weekly reflections for every user who was active in a week.
+
+Each user's result is written to weekly_summaries as soon as it is ready, so
+an interrupted run resumes where it stopped: users with a stored summary are
+skipped and failed users are retried up to --max-attempts times.
+
+Run from the backend directory, e.g. every Monday from cron:
+    python -m jobs.weekly_summaries --week 2026-W41 --concurrency 4
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from config.ai_config import get_llm, FALLBACK_RESPONSE
+from config.storage import storage
+from utils.weekly_summary import (
+    SUMMARY_PROMPT, previous_week, week_bounds, active_users, build_context
+)
+
+
+def summarize_user(user_id: str, week: str, monday, sunday) -> dict:
+    context = build_context(user_id, monday, sunday)
+    summary = get_llm()(SUMMARY_PROMPT.format(context=context["text"]))
+    if not summary or summary == FALLBACK_RESPONSE:
+        raise RuntimeError("LLM returned no summary")
+
+    document = {
+        "user_id": user_id,
+        "week": week,
+        "start": datetime(monday.year, monday.month, monday.day),
+        "end": datetime(sunday.year, sunday.month, sunday.day),
+        "status": "done",
+        "summary": summary,
+        "mood_checkins": context["mood_checkins"],
+        "average_mood": context["average_mood"],
+        "journal_entries": context["journal_entries"],
+        "generated_at": datetime.now()
+    }
+    storage.summaries.save(document)
+    return document
+
+
+def record_failure(user_id: str, week: str, error: Exception):
+    storage.summaries.record_failure(user_id, week, str(error)[:500])
+
+
+def pending_users(week: str, users: list, max_attempts: int) -> list:
+    """Drop users already summarized, or failed too often, in an earlier run."""
+    settled = storage.summaries.settled_users(week, max_attempts)
+    return [user_id for user_id in users if user_id not in settled]
+
+
+def run(week: str, concurrency: int, max_attempts: int) -> dict:
+    monday, sunday = week_bounds(week)
+    users = active_users(monday, sunday)
+    todo = pending_users(week, users, max_attempts)
+
+    started = time.perf_counter()
+    stats = {
+        "week": week,
+        "started_at": datetime.now(),
+        "active_users": len(users),
+        "skipped": len(users) - len(todo),
+        "succeeded": 0,
+        "failed": 0
+    }
+
+    # Bounded parallelism keeps us inside the LLM provider's rate limits
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {
+            executor.submit(summarize_user, user_id, week, monday, sunday): user_id
+            for user_id in todo
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+                stats["succeeded"] += 1
+            except Exception as exc:
+                record_failure(futures[future], week, exc)
+                stats["failed"] += 1
+
+    elapsed = time.perf_counter() - started
+    stats["finished_at"] = datetime.now()
+    stats["elapsed_seconds"] = round(elapsed, 2)
+    stats["users_per_minute"] = round(stats["succeeded"] / elapsed * 60, 1) if elapsed else 0
+    storage.summaries.record_run(stats)
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--week", default=previous_week(), help="ISO week, e.g. 2026-W41")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--max-attempts", type=int, default=3)
+    args = parser.parse_args()
+
+    stats = run(args.week, args.concurrency, args.max_attempts)
+    print(f"week:             {stats['week']}")
+    print(f"active users:     {stats['active_users']}")
+    print(f"already settled:  {stats['skipped']}")
+    print(f"succeeded:        {stats['succeeded']}")
+    print(f"failed:           {stats['failed']}")
+    print(f"elapsed:          {stats['elapsed_seconds']}s ({stats['users_per_minute']} users/min)")
@@ -1,6 +1,6 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from api.routes import user_router, chat_router, journal_router, mood_router
+from api.routes import user_router, chat_router, journal_router, mood_router, habit_router, insights_router, dashboard_router, summary_router, export_router
 
 app = FastAPI(
     title="Mental Fitness Companion API",
@@ -15,6 +15,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Chat history paging
 )
 
 # Include routers
@@ -22,6 +23,11 @@ app.include_router(user_router.router, prefix="/api/users", tags=["users"])
 app.include_router(chat_router.router, prefix="/api/chat", tags=["chat"])
 app.include_router(journal_router.router, prefix="/api/journal", tags=["journal"])
 app.include_router(mood_router.router, prefix="/api/mood", tags=["mood"])
+app.include_router(habit_router.router, prefix="/api/habits", tags=["habits"])
+app.include_router(insights_router.router, prefix="/api/insights", tags=["insights"])
+app.include_router(dashboard_router.router, prefix="/api/dashboard", tags=["dashboard"])
+app.include_router(summary_router.router, prefix="/api/summaries", tags=["summaries"])
+app.include_router(export_router.router, prefix="/api/export", tags=["export"])
 
 @app.get("/")
 async def root():
@@ -1,10 +1,10 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-# Import mock database instead of real one
-import sys
+# Use the embedded SQLite database instead of MongoDB
 import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'config'))
+os.environ.setdefault("STORAGE_BACKEND", "sqlite")
+os.environ.setdefault("SQLITE_PATH", "mental_fitness_test.db")
 
 app = FastAPI(
     title="Mental Fitness Companion API",
@@ -19,13 +19,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Chat history paging
 )
 
-# Import routers after setting up mock database
-from api.routes import user_router
+# Import routers after selecting the storage backend
+from api.routes import user_router, chat_router, journal_router, mood_router, habit_router, insights_router, dashboard_router, summary_router, export_router
 
-# Include routers (only user router for now)
+# Include routers
 app.include_router(user_router.router, prefix="/api/users", tags=["users"])
+app.include_router(chat_router.router, prefix="/api/chat", tags=["chat"])
+app.include_router(journal_router.router, prefix="/api/journal", tags=["journal"])
+app.include_router(mood_router.router, prefix="/api/mood", tags=["mood"])
+app.include_router(habit_router.router, prefix="/api/habits", tags=["habits"])
+app.include_router(insights_router.router, prefix="/api/insights", tags=["insights"])
+app.include_router(dashboard_router.router, prefix="/api/dashboard", tags=["dashboard"])
+app.include_router(summary_router.router, prefix="/api/summaries", tags=["summaries"])
+app.include_router(export_router.router, prefix="/api/export", tags=["export"])
 
 @app.get("/")
 async def root():
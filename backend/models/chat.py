@@ -1,11 +1,39 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Optional, TypedDict
 from datetime import datetime
 
 class Message(BaseModel):
     role: str  # "user" or "assistant"
     content: str
     timestamp: datetime = Field(default_factory=datetime.now)
+    sentiment: Optional[str] = None  # Set on user messages at write time
+    emotion: Optional[str] = None
+    
+class MessageRow(TypedDict):
+    # Lightweight Message built straight from a projected session document
+    role: str
+    content: str
+    timestamp: datetime
+    sentiment: Optional[str]
+    emotion: Optional[str]
+    
+MESSAGE_ROW_PROJECTION = {
+    "_id": 0,
+    "messages.role": 1,
+    "messages.content": 1,
+    "messages.timestamp": 1,
+    "messages.sentiment": 1,
+    "messages.emotion": 1
+}
+    
+def message_row(message: dict) -> MessageRow:
+    return {
+        "role": message["role"],
+        "content": message["content"],
+        "timestamp": message["timestamp"],
+        "sentiment": message.get("sentiment"),
+        "emotion": message.get("emotion")
+    }
     
 class ChatSession(BaseModel):
     user_id: str
@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from typing import List
+
+from models.mood import MoodStats, MoodResponse
+from models.journal import JournalResponse
+
+class UserStats(BaseModel):
+    # Same shape as GET /api/users/stats
+    streak: int
+    badges: List[str]
+    journal_entries: int
+    mood_checkins: int
+    
+class DashboardResponse(BaseModel):
+    stats: UserStats
+    mood_stats: MoodStats
+    recent_moods: List[MoodResponse]
+    recent_journals: List[JournalResponse]
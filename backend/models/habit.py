@@ -0,0 +1,28 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime, date
+
+class HabitCreate(BaseModel):
+    name: str
+    description: Optional[str] = None
+    target_per_week: int = Field(7, ge=1, le=7)
+    
+class HabitCheck(BaseModel):
+    day: Optional[date] = None  # Defaults to today
+    
+class HabitResponse(BaseModel):
+    id: str
+    name: str
+    description: Optional[str] = None
+    target_per_week: int
+    created_at: datetime
+    done_today: bool
+    current_streak: int
+    longest_streak: int
+    completed_this_week: int
+    completion_rate: float  # Share of days completed since the habit was created
+    
+class HabitHeatmap(BaseModel):
+    year: int
+    days: str  # One "0"/"1" character per day of the year, January 1st first
+    total: int
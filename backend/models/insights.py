@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import Dict, List
+
+from models.journal import JournalResponse
+from models.chat import Message
+
+class EmotionDistribution(BaseModel):
+    journal: Dict[str, int]
+    chat: Dict[str, int]  # User messages only
+    total: Dict[str, int]
+    
+class EmotionEntries(BaseModel):
+    emotion: str
+    journal: List[JournalResponse]
+    chat: List[Message]
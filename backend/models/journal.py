@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Optional, TypedDict
 from datetime import datetime
 
 class JournalEntry(BaseModel):
@@ -7,6 +7,8 @@ class JournalEntry(BaseModel):
     content: str
     mood: Optional[str] = None
     tags: List[str] = []
+    sentiment: Optional[str] = None  # Computed once at write time
+    emotion: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
     
@@ -21,4 +23,56 @@ class JournalResponse(BaseModel):
     mood: Optional[str] = None
     tags: List[str]
     created_at: datetime
-    insights: Optional[str] = None
\ No newline at end of file
+    insights: Optional[str] = None
+    sentiment: Optional[str] = None
+    emotion: Optional[str] = None
+    
+class JournalRow(TypedDict):
+    # Lightweight JournalResponse built straight from a projected document
+    id: str
+    content: str
+    mood: Optional[str]
+    tags: List[str]
+    created_at: datetime
+    insights: Optional[str]
+    sentiment: Optional[str]
+    emotion: Optional[str]
+    
+JOURNAL_ROW_PROJECTION = {"content": 1, "mood": 1, "tags": 1, "created_at": 1, "sentiment": 1, "emotion": 1}
+    
+def journal_row(doc: dict) -> JournalRow:
+    return {
+        "id": str(doc["_id"]),
+        "content": doc["content"],
+        "mood": doc.get("mood"),
+        "tags": doc.get("tags", []),
+        "created_at": doc["created_at"],
+        "insights": None,
+        "sentiment": doc.get("sentiment"),
+        "emotion": doc.get("emotion")
+    }
+    
+class JournalSearchResult(BaseModel):
+    entry: JournalResponse
+    score: float  # Weighted blend of the two scores below
+    keyword_score: float
+    semantic_score: float
+    
+class JournalSearchResponse(BaseModel):
+    query: str
+    candidates: int  # Ranked matches available to page through
+    truncated: bool  # A candidate pool was full, so more matches may exist
+    page: int
+    page_size: int
+    results: List[JournalSearchResult]
+    
+class JournalBatchItem(JournalCreate):
+    client_id: str  # Idempotency key generated on the device
+    created_at: Optional[datetime] = None  # When the entry was written offline
+    
+class JournalBatchCreate(BaseModel):
+    entries: List[JournalBatchItem] = Field(..., min_length=1, max_length=500)
+    
+class JournalBatchResponse(BaseModel):
+    created: List[JournalResponse]
+    duplicates: List[str]  # client_ids that were already synced
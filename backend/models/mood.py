@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
-from datetime import datetime
+from typing import Optional, List, Dict, TypedDict
+from datetime import datetime, date
 
 class MoodEntry(BaseModel):
     user_id: str
@@ -24,9 +24,52 @@ class MoodResponse(BaseModel):
     notes: Optional[str] = None
     created_at: datetime
     
+class MoodRow(TypedDict):
+    # Lightweight MoodResponse built straight from a projected document
+    id: str
+    mood_score: int
+    energy_level: int
+    focus_level: int
+    notes: Optional[str]
+    created_at: datetime
+    
+MOOD_ROW_PROJECTION = {"mood_score": 1, "energy_level": 1, "focus_level": 1, "notes": 1, "created_at": 1}
+    
+def mood_row(doc: dict) -> MoodRow:
+    return {
+        "id": str(doc["_id"]),
+        "mood_score": doc["mood_score"],
+        "energy_level": doc["energy_level"],
+        "focus_level": doc["focus_level"],
+        "notes": doc.get("notes"),
+        "created_at": doc["created_at"]
+    }
+    
 class MoodStats(BaseModel):
     average_mood: float
     average_energy: float
     average_focus: float
     mood_trend: List[dict]  # List of {date, value} pairs
-    streak_days: int
\ No newline at end of file
+    streak_days: int
+class MoodAnalytics(BaseModel):
+    start: date
+    end: date
+    count: int
+    summary: Dict[str, dict]  # {mood|energy|focus: {mean, min, max, std}}
+    daily: Dict[str, list]  # dates, counts and per-metric daily means
+    rolling: dict  # window plus per-metric trailing means over daily values
+    weekday_profile: Dict[str, list]  # Monday first
+    hour_profile: Dict[str, list]
+    correlations: Dict[str, Optional[float]]  # mood_energy, mood_focus, energy_focus
+    
+class MoodBatchItem(MoodCreate):
+    client_id: str  # Idempotency key generated on the device
+    created_at: Optional[datetime] = None  # When the check-in happened offline
+    
+class MoodBatchCreate(BaseModel):
+    entries: List[MoodBatchItem] = Field(..., min_length=1, max_length=500)
+    
+class MoodBatchResponse(BaseModel):
+    created: List[MoodResponse]
+    duplicates: List[str]  # client_ids that were already synced
+    streak_days: int
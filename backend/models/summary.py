@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime, date
+
+class WeeklySummary(BaseModel):
+    week: str  # ISO week, e.g. "2026-W41"
+    start: date
+    end: date
+    summary: str
+    mood_checkins: int
+    average_mood: Optional[float] = None
+    journal_entries: int
+    generated_at: datetime
@@ -0,0 +1,86 @@
+"""Run the API workers together with the shared inference server.
+
+Starts inference_server.py, waits for its socket, then starts uvicorn with the
+requested number of workers pointed at it. The inference server is restarted
+if it exits; workers fall back to in-process models until it is back.
+
+Usage:
+    python serve.py --workers 4
+"""
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SOCKET = os.getenv("INFERENCE_SOCKET", "/tmp/mfc-inference.sock")
+
+
+def start_inference_server(path: str):
+    return subprocess.Popen([sys.executable, "inference_server.py", "--socket", path], cwd=HERE)
+
+
+def wait_for_socket(path: str, process, timeout: float = 300.0) -> bool:
+    # Model loading can take a while on first start (downloads, warm-up)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and process.poll() is None:
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(path)
+                return True
+        except OSError:
+            time.sleep(0.5)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    args = parser.parse_args()
+
+    inference = start_inference_server(args.socket)
+    if not wait_for_socket(args.socket, inference):
+        print("Inference server did not start; workers will use in-process models", flush=True)
+
+    env = dict(os.environ, INFERENCE_SOCKET=args.socket)
+    api = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", args.host,
+         "--port", str(args.port), "--workers", str(args.workers)],
+        cwd=HERE,
+        env=env,
+    )
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    # Supervise: restart the inference server, stop everything if the API exits
+    while not stopping and api.poll() is None:
+        if inference.poll() is not None:
+            print(f"Inference server exited with {inference.returncode}; restarting", flush=True)
+            inference = start_inference_server(args.socket)
+        time.sleep(1)
+
+    for process in (api, inference):
+        if process.poll() is None:
+            process.terminate()
+    for process in (api, inference):
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+if __name__ == "__main__":
+    main()
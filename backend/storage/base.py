@@ -0,0 +1,284 @@
+# Storage interface used by the routers, jobs and utilities. Documents are
+# plain dicts shaped like the MongoDB documents the app has always used: every
+# record carries an "_id" (an ObjectId on Mongo, a string on SQLite; callers
+# always pass ids back as strings) and datetimes are naive local time.
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class UserStore(ABC):
+    @abstractmethod
+    def get(self, user_id: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def get_by_email(self, email: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def get_by_username(self, username: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def create(self, user: dict) -> dict:
+        """Insert a user and return it with its _id set."""
+
+    @abstractmethod
+    def set_streak(self, user_id: str, streak: int, badges: List[str] = ()):
+        """Store a recomputed streak and add any badges the user does not have yet."""
+
+    @abstractmethod
+    def bump_versions(self, user_id: str, resources: Iterable[str], at: datetime):
+        """Increment versions.<resource>.v and set versions.<resource>.at."""
+
+
+class MoodStore(ABC):
+    @abstractmethod
+    def insert(self, mood: dict) -> dict:
+        ...
+
+    @abstractmethod
+    def insert_batch(self, user_id: str, moods: List[dict]) -> Tuple[List[dict], List[str]]:
+        """Insert moods keyed by client_id; return (inserted, duplicate client_ids)."""
+
+    @abstractmethod
+    def checkin_days(self, user_id: str, until: datetime) -> Iterable[str]:
+        """Distinct YYYY-MM-DD days with a check-in up to until, newest first."""
+
+    @abstractmethod
+    def list(self, user_id: str) -> Iterable[dict]:
+        """Response fields of every mood, newest first."""
+
+    @abstractmethod
+    def count(self, user_id: str) -> int:
+        ...
+
+    @abstractmethod
+    def summary(self, user_id: str, trend_start: datetime, recent: int) -> dict:
+        """Totals, first score per day since trend_start and the latest entries.
+
+        Returns {"count", "mood", "energy", "focus", "trend": {day: score},
+        "recent": [mood]} with averages of 0 when there are no entries.
+        """
+
+    @abstractmethod
+    def iter_all(self, user_id: str) -> Iterable[dict]:
+        """Every mood, oldest first, fetched in batches."""
+
+    @abstractmethod
+    def daily_averages(self, user_id: str, start: datetime, end: datetime) -> List[dict]:
+        """[{"_id": day, "count", "mood", "energy", "focus"}] for start <= created_at < end."""
+
+    @abstractmethod
+    def active_users(self, start: datetime, end: datetime) -> set:
+        ...
+
+
+class JournalStore(ABC):
+    @abstractmethod
+    def insert(self, journal: dict) -> dict:
+        ...
+
+    @abstractmethod
+    def insert_batch(self, user_id: str, journals: List[dict]) -> Tuple[List[dict], List[str]]:
+        """Insert journals keyed by client_id; return (inserted, duplicate client_ids)."""
+
+    @abstractmethod
+    def get(self, user_id: str, journal_id: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def get_many(self, user_id: str, journal_ids: List[str], tags: Optional[List[str]] = None) -> List[dict]:
+        """Response fields of the given entries that carry all of tags."""
+
+    @abstractmethod
+    def delete(self, user_id: str, journal_id: str) -> bool:
+        """Delete an entry and its embedding; False if it did not exist."""
+
+    @abstractmethod
+    def list(self, user_id: str) -> Iterable[dict]:
+        """Response fields of every entry, newest first."""
+
+    @abstractmethod
+    def summary(self, user_id: str, recent: int) -> dict:
+        """{"count", "recent": [journal]} in one round trip."""
+
+    @abstractmethod
+    def count(self, user_id: str) -> int:
+        ...
+
+    @abstractmethod
+    def iter_all(self, user_id: str) -> Iterable[dict]:
+        """Every entry, oldest first, fetched in batches."""
+
+    @abstractmethod
+    def in_range(self, user_id: str, start: datetime, end: datetime) -> List[dict]:
+        ...
+
+    @abstractmethod
+    def active_users(self, start: datetime, end: datetime) -> set:
+        ...
+
+    @abstractmethod
+    def keyword_search(self, user_id: str, query: str, limit: int,
+                       tags: Optional[List[str]] = None) -> Dict[str, float]:
+        """Full-text matches carrying all of tags as {journal_id: score}, higher is better."""
+
+    @abstractmethod
+    def tagged_ids(self, user_id: str, tags: List[str]) -> set:
+        """Ids of the user's entries that carry all of tags."""
+
+    @abstractmethod
+    def emotion_counts(self, user_id: str, start: Optional[datetime], end: Optional[datetime]) -> Dict[str, int]:
+        ...
+
+    @abstractmethod
+    def by_emotion(self, user_id: str, emotion: str, start: Optional[datetime],
+                   end: Optional[datetime], limit: int) -> List[dict]:
+        ...
+
+    @abstractmethod
+    def missing_insights(self, batch_size: int) -> Iterable[dict]:
+        """Entries (_id, user_id, content) without a stored emotion."""
+
+    @abstractmethod
+    def set_insights(self, updates: List[Tuple[str, str, str]]):
+        """Store (journal_id, sentiment, emotion) triples."""
+
+    @abstractmethod
+    def save_embeddings(self, user_id: str, vectors: List[Tuple[str, bytes]]):
+        ...
+
+    @abstractmethod
+    def load_embeddings(self, user_id: str) -> List[Tuple[str, bytes]]:
+        ...
+
+    @abstractmethod
+    def missing_embeddings(self, batch_size: int) -> Iterable[dict]:
+        """Entries (_id, user_id, content) without a stored embedding."""
+
+
+class ChatStore(ABC):
+    @abstractmethod
+    def get_messages(self, user_id: str) -> List[dict]:
+        """Live (not archived) messages, oldest first."""
+
+    @abstractmethod
+    def append(self, user_id: str, messages: List[dict]):
+        """Append messages, creating the session on first use."""
+
+    @abstractmethod
+    def delete(self, user_id: str) -> bool:
+        """Delete live and archived history; False if there was none."""
+
+    @abstractmethod
+    def users_with_messages_before(self, cutoff: datetime) -> List[str]:
+        ...
+
+    @abstractmethod
+    def archive(self, user_id: str, blocks: List[dict], cutoff: datetime):
+        """Upsert archive blocks by (user_id, start), then drop live messages older than cutoff."""
+
+    @abstractmethod
+    def archive_blocks(self, user_id: str, until: Optional[datetime] = None,
+                       newest_first: bool = False) -> Iterable[dict]:
+        """Archive blocks (codec, data) starting at or before until, one at a time."""
+
+    @abstractmethod
+    def users_missing_insights(self) -> List[str]:
+        ...
+
+    @abstractmethod
+    def set_message_insights(self, user_id: str, updates: List[Tuple[datetime, str, str]]) -> int:
+        """Store (timestamp, sentiment, emotion) on the matching user messages."""
+
+    @abstractmethod
+    def emotion_counts(self, user_id: str, start: Optional[datetime], end: Optional[datetime]) -> Dict[str, int]:
+        """User messages per stored emotion, live and archived."""
+
+    @abstractmethod
+    def by_emotion(self, user_id: str, emotion: str, start: Optional[datetime],
+                   end: Optional[datetime], limit: int) -> List[dict]:
+        """Most recent user messages with the emotion, live and archived."""
+
+
+class HabitStore(ABC):
+    @abstractmethod
+    def create(self, habit: dict) -> dict:
+        ...
+
+    @abstractmethod
+    def list(self, user_id: str) -> List[dict]:
+        """Habits with their "days" bitsets, oldest first."""
+
+    @abstractmethod
+    def get(self, user_id: str, habit_id: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def set_day(self, user_id: str, habit_id: str, day: date, done: bool) -> Optional[dict]:
+        """Atomically set or clear one day's bit and return the updated habit."""
+
+    @abstractmethod
+    def delete(self, user_id: str, habit_id: str) -> bool:
+        ...
+
+
+class SuggestionStore(ABC):
+    @abstractmethod
+    def get_ranking(self, user_id: str, emotion: str) -> Optional[List[str]]:
+        ...
+
+    @abstractmethod
+    def push_exposure(self, user_id: str, exposure: dict, max_pending: int):
+        ...
+
+    @abstractmethod
+    def claim_pending(self, user_id: str, until: datetime, last_mood: int) -> Tuple[Optional[int], List[dict]]:
+        """Atomically drop exposures shown before until and store last_mood.
+
+        Returns the previous last_mood and the dropped exposures, so each
+        exposure is credited by exactly one check-in.
+        """
+
+    @abstractmethod
+    def add_outcomes(self, user_id: str, outcomes: Dict[str, Dict[str, Tuple[int, int]]],
+                     rank: Callable[[str, dict], List[str]]):
+        """Add (shown, improved) counts per emotion and suggestion, then store
+        rank(emotion, emotion_stats) for each emotion touched."""
+
+
+class SummaryStore(ABC):
+    @abstractmethod
+    def get(self, user_id: str, week: str) -> Optional[dict]:
+        """A completed summary for the week."""
+
+    @abstractmethod
+    def save(self, summary: dict):
+        ...
+
+    @abstractmethod
+    def record_failure(self, user_id: str, week: str, error: str):
+        ...
+
+    @abstractmethod
+    def settled_users(self, week: str, max_attempts: int) -> set:
+        """Users already summarized, or failed max_attempts times, for the week."""
+
+    @abstractmethod
+    def record_run(self, stats: dict):
+        ...
+
+
+class Storage(ABC):
+    """A storage backend: one store per kind of record."""
+
+    name: str
+    users: UserStore
+    moods: MoodStore
+    journals: JournalStore
+    chats: ChatStore
+    habits: HabitStore
+    suggestions: SuggestionStore
+    summaries: SummaryStore
@@ -0,0 +1,618 @@
+from datetime import datetime
+from typing import Optional
+
+from bson import ObjectId
+from bson.binary import Binary
+from bson.errors import InvalidId
+from bson.int64 import Int64
+from pymongo import ReplaceOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from config import database
+from models.mood import MOOD_ROW_PROJECTION
+from models.journal import JOURNAL_ROW_PROJECTION
+from models.chat import MESSAGE_ROW_PROJECTION
+from storage.base import (
+    Storage, UserStore, MoodStore, JournalStore, ChatStore, HabitStore, SuggestionStore, SummaryStore
+)
+from utils.habits import empty_year, day_update
+
+DUPLICATE_KEY_ERROR = 11000
+
+# Documents fetched per cursor round trip when walking a user's full history
+BATCH_SIZE = 500
+
+
+def _object_id(value) -> Optional[ObjectId]:
+    try:
+        return ObjectId(value)
+    except (InvalidId, TypeError):
+        return None
+
+
+def _date_range(start: Optional[datetime], end: Optional[datetime]) -> dict:
+    date_range = {}
+    if start:
+        date_range["$gte"] = start
+    if end:
+        date_range["$lt"] = end
+    return date_range
+
+
+def _insert_idempotent(collection, user_id: str, documents: list):
+    """Insert documents keyed by client_id, skipping keys already stored.
+
+    Documents are written with a single unordered insert_many; keys that race
+    with a concurrent sync are reported as duplicates via the unique
+    (user_id, client_id) index.
+    """
+    # Drop repeated keys within the batch itself, keeping the first occurrence
+    unique_docs = {}
+    duplicates = []
+    for doc in documents:
+        if doc["client_id"] in unique_docs:
+            duplicates.append(doc["client_id"])
+        else:
+            unique_docs[doc["client_id"]] = doc
+
+    # Skip keys that were stored by an earlier sync
+    existing = collection.find(
+        {"user_id": user_id, "client_id": {"$in": list(unique_docs)}},
+        {"client_id": 1, "_id": 0}
+    )
+    for doc in existing:
+        duplicates.append(doc["client_id"])
+        unique_docs.pop(doc["client_id"], None)
+
+    to_insert = list(unique_docs.values())
+    if not to_insert:
+        return [], duplicates
+
+    try:
+        collection.insert_many(to_insert, ordered=False)
+        return to_insert, duplicates
+    except BulkWriteError as exc:
+        failed = set()
+        for error in exc.details.get("writeErrors", []):
+            if error.get("code") != DUPLICATE_KEY_ERROR:
+                raise
+            failed.add(error["index"])
+            duplicates.append(to_insert[error["index"]]["client_id"])
+        inserted = [doc for i, doc in enumerate(to_insert) if i not in failed]
+        return inserted, duplicates
+
+
+class MongoUserStore(UserStore):
+    def __init__(self):
+        self.collection = database.users_collection
+
+    def get(self, user_id):
+        oid = _object_id(user_id)
+        return self.collection.find_one({"_id": oid}) if oid else None
+
+    def get_by_email(self, email):
+        return self.collection.find_one({"email": email})
+
+    def get_by_username(self, username):
+        return self.collection.find_one({"username": username})
+
+    def create(self, user):
+        self.collection.insert_one(user)
+        return user
+
+    def set_streak(self, user_id, streak, badges=()):
+        update = {"$set": {"streak": streak}}
+        if badges:
+            update["$addToSet"] = {"badges": {"$each": list(badges)}}
+        self.collection.update_one({"_id": ObjectId(user_id)}, update)
+
+    def bump_versions(self, user_id, resources, at):
+        update = {"$inc": {}, "$set": {}}
+        for resource in resources:
+            update["$inc"][f"versions.{resource}.v"] = 1
+            update["$set"][f"versions.{resource}.at"] = at
+        self.collection.update_one({"_id": ObjectId(user_id)}, update)
+
+
+class MongoMoodStore(MoodStore):
+    def __init__(self):
+        self.collection = database.moods_collection
+
+    def insert(self, mood):
+        self.collection.insert_one(mood)
+        return mood
+
+    def insert_batch(self, user_id, moods):
+        return _insert_idempotent(self.collection, user_id, moods)
+
+    def checkin_days(self, user_id, until):
+        pipeline = [
+            {"$match": {"user_id": user_id, "created_at": {"$lte": until}}},
+            {"$group": {"_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}}}},
+            {"$sort": {"_id": -1}},
+        ]
+        for day in self.collection.aggregate(pipeline):
+            yield day["_id"]
+
+    def list(self, user_id):
+        return self.collection.find({"user_id": user_id}, MOOD_ROW_PROJECTION).sort("created_at", -1)
+
+    def count(self, user_id):
+        return self.collection.count_documents({"user_id": user_id})
+
+    def summary(self, user_id, trend_start, recent):
+        # One aggregation for totals, the trend and the latest entries
+        facets = {
+            "totals": [
+                {"$group": {
+                    "_id": None,
+                    "count": {"$sum": 1},
+                    "mood": {"$avg": "$mood_score"},
+                    "energy": {"$avg": "$energy_level"},
+                    "focus": {"$avg": "$focus_level"}
+                }}
+            ],
+            "trend": [
+                {"$match": {"created_at": {"$gte": trend_start}}},
+                {"$sort": {"created_at": 1}},
+                {"$group": {
+                    "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}},
+                    "value": {"$first": "$mood_score"}
+                }}
+            ]
+        }
+        if recent:
+            facets["recent"] = [
+                {"$sort": {"created_at": -1}},
+                {"$limit": recent},
+                {"$project": MOOD_ROW_PROJECTION}
+            ]
+        result = next(self.collection.aggregate([
+            {"$match": {"user_id": user_id}},
+            {"$facet": facets}
+        ]))
+
+        totals = result["totals"][0] if result["totals"] else {"count": 0, "mood": 0, "energy": 0, "focus": 0}
+        return {
+            "count": totals["count"],
+            "mood": totals["mood"],
+            "energy": totals["energy"],
+            "focus": totals["focus"],
+            "trend": {row["_id"]: row["value"] for row in result["trend"]},
+            "recent": result.get("recent", [])
+        }
+
+    def iter_all(self, user_id):
+        return self.collection.find({"user_id": user_id}, MOOD_ROW_PROJECTION) \
+            .sort("created_at", 1).batch_size(BATCH_SIZE)
+
+    def daily_averages(self, user_id, start, end):
+        return list(self.collection.aggregate([
+            {"$match": {"user_id": user_id, "created_at": {"$gte": start, "$lt": end}}},
+            {"$group": {
+                "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}},
+                "count": {"$sum": 1},
+                "mood": {"$avg": "$mood_score"},
+                "energy": {"$avg": "$energy_level"},
+                "focus": {"$avg": "$focus_level"}
+            }},
+            {"$sort": {"_id": 1}}
+        ]))
+
+    def active_users(self, start, end):
+        return set(self.collection.distinct("user_id", {"created_at": {"$gte": start, "$lt": end}}))
+
+
+class MongoJournalStore(JournalStore):
+    def __init__(self):
+        self.collection = database.journals_collection
+        self.embeddings = database.journal_embeddings_collection
+
+    def insert(self, journal):
+        self.collection.insert_one(journal)
+        return journal
+
+    def insert_batch(self, user_id, journals):
+        return _insert_idempotent(self.collection, user_id, journals)
+
+    def get(self, user_id, journal_id):
+        oid = _object_id(journal_id)
+        return self.collection.find_one({"_id": oid, "user_id": user_id}) if oid else None
+
+    def get_many(self, user_id, journal_ids, tags=None):
+        entry_filter = {"user_id": user_id, "_id": {"$in": [ObjectId(i) for i in journal_ids]}}
+        if tags:
+            entry_filter["tags"] = {"$all": tags}
+        return list(self.collection.find(entry_filter, JOURNAL_ROW_PROJECTION))
+
+    def delete(self, user_id, journal_id):
+        oid = _object_id(journal_id)
+        if not oid:
+            return False
+        result = self.collection.delete_one({"_id": oid, "user_id": user_id})
+        if result.deleted_count:
+            self.embeddings.delete_one({"_id": oid})
+        return result.deleted_count > 0
+
+    def list(self, user_id):
+        return self.collection.find({"user_id": user_id}, JOURNAL_ROW_PROJECTION).sort("created_at", -1)
+
+    def summary(self, user_id, recent):
+        facets = {"count": [{"$count": "value"}]}
+        if recent:
+            facets["recent"] = [
+                {"$sort": {"created_at": -1}},
+                {"$limit": recent},
+                {"$project": JOURNAL_ROW_PROJECTION}
+            ]
+        result = next(self.collection.aggregate([
+            {"$match": {"user_id": user_id}},
+            {"$facet": facets}
+        ]))
+        return {
+            "count": result["count"][0]["value"] if result["count"] else 0,
+            "recent": result.get("recent", [])
+        }
+
+    def count(self, user_id):
+        return self.collection.count_documents({"user_id": user_id})
+
+    def iter_all(self, user_id):
+        return self.collection.find({"user_id": user_id}, JOURNAL_ROW_PROJECTION) \
+            .sort("created_at", 1).batch_size(BATCH_SIZE)
+
+    def in_range(self, user_id, start, end):
+        return list(self.collection.find(
+            {"user_id": user_id, "created_at": {"$gte": start, "$lt": end}},
+            JOURNAL_ROW_PROJECTION
+        ).sort("created_at", 1))
+
+    def active_users(self, start, end):
+        return set(self.collection.distinct("user_id", {"created_at": {"$gte": start, "$lt": end}}))
+
+    def keyword_search(self, user_id, query, limit, tags=None):
+        entry_filter = {"user_id": user_id, "$text": {"$search": query}}
+        if tags:
+            entry_filter["tags"] = {"$all": tags}
+        cursor = self.collection.find(
+            entry_filter,
+            {"score": {"$meta": "textScore"}}
+        ).sort([("score", {"$meta": "textScore"})]).limit(limit)
+        return {str(doc["_id"]): doc["score"] for doc in cursor}
+
+    def tagged_ids(self, user_id, tags):
+        return {
+            str(doc["_id"])
+            for doc in self.collection.find({"user_id": user_id, "tags": {"$all": tags}}, {"_id": 1})
+        }
+
+    def emotion_counts(self, user_id, start, end):
+        match = {"user_id": user_id, "emotion": {"$ne": None}}
+        date_range = _date_range(start, end)
+        if date_range:
+            match["created_at"] = date_range
+        return {
+            row["_id"]: row["count"]
+            for row in self.collection.aggregate([
+                {"$match": match},
+                {"$group": {"_id": "$emotion", "count": {"$sum": 1}}}
+            ])
+        }
+
+    def by_emotion(self, user_id, emotion, start, end, limit):
+        entry_filter = {"user_id": user_id, "emotion": emotion}
+        date_range = _date_range(start, end)
+        if date_range:
+            entry_filter["created_at"] = date_range
+        return list(self.collection.find(entry_filter, JOURNAL_ROW_PROJECTION).sort("created_at", -1).limit(limit))
+
+    def missing_insights(self, batch_size):
+        return self.collection.find(
+            {"emotion": {"$exists": False}},
+            {"user_id": 1, "content": 1}
+        ).batch_size(batch_size)
+
+    def set_insights(self, updates):
+        if updates:
+            self.collection.bulk_write([
+                UpdateOne({"_id": ObjectId(journal_id)}, {"$set": {"sentiment": sentiment, "emotion": emotion}})
+                for journal_id, sentiment, emotion in updates
+            ], ordered=False)
+
+    def save_embeddings(self, user_id, vectors):
+        if vectors:
+            self.embeddings.bulk_write([
+                ReplaceOne(
+                    {"_id": ObjectId(journal_id)},
+                    {"_id": ObjectId(journal_id), "user_id": user_id, "vector": Binary(vector)},
+                    upsert=True
+                )
+                for journal_id, vector in vectors
+            ], ordered=False)
+
+    def load_embeddings(self, user_id):
+        return [
+            (str(doc["_id"]), doc["vector"])
+            for doc in self.embeddings.find({"user_id": user_id}).batch_size(1000)
+        ]
+
+    def missing_embeddings(self, batch_size):
+        indexed = set(self.embeddings.distinct("_id"))
+        for entry in self.collection.find({}, {"user_id": 1, "content": 1}).batch_size(batch_size):
+            if entry["_id"] not in indexed:
+                yield entry
+
+
+class MongoChatStore(ChatStore):
+    def __init__(self):
+        self.collection = database.chats_collection
+        self.archives = database.chat_archives_collection
+        # One row per labelled user message; compaction leaves these in place
+        # so emotion queries cover archived history too
+        self.emotions = database.chat_emotions_collection
+
+    def _save_emotions(self, user_id, messages):
+        rows = [
+            UpdateOne(
+                {"user_id": user_id, "timestamp": message["timestamp"]},
+                {"$set": {
+                    "role": "user",
+                    "content": message["content"],
+                    "sentiment": message.get("sentiment"),
+                    "emotion": message["emotion"]
+                }},
+                upsert=True
+            )
+            for message in messages
+            if message["role"] == "user" and message.get("emotion")
+        ]
+        if rows:
+            self.emotions.bulk_write(rows, ordered=False)
+
+    def get_messages(self, user_id):
+        session = self.collection.find_one({"user_id": user_id}, MESSAGE_ROW_PROJECTION)
+        return session.get("messages", []) if session else []
+
+    def append(self, user_id, messages):
+        self.collection.update_one(
+            {"user_id": user_id},
+            {
+                "$push": {"messages": {"$each": messages}},
+                "$set": {"updated_at": datetime.now()},
+                "$setOnInsert": {"created_at": messages[0]["timestamp"]}
+            },
+            upsert=True
+        )
+        self._save_emotions(user_id, messages)
+
+    def delete(self, user_id):
+        result = self.collection.delete_one({"user_id": user_id})
+        archived = self.archives.delete_many({"user_id": user_id})
+        self.emotions.delete_many({"user_id": user_id})
+        return result.deleted_count > 0 or archived.deleted_count > 0
+
+    def users_with_messages_before(self, cutoff):
+        return [
+            session["user_id"]
+            for session in self.collection.find({"messages.timestamp": {"$lt": cutoff}}, {"user_id": 1, "_id": 0})
+        ]
+
+    def archive(self, user_id, blocks, cutoff):
+        # Blocks are keyed by their first timestamp, so re-running after a crash
+        # between these two writes replaces blocks instead of duplicating them
+        self.archives.bulk_write([
+            ReplaceOne(
+                {"user_id": user_id, "start": block["start"]},
+                block,
+                upsert=True
+            )
+            for block in blocks
+        ], ordered=False)
+        self.collection.update_one(
+            {"user_id": user_id},
+            {"$pull": {"messages": {"timestamp": {"$lt": cutoff}}}}
+        )
+
+    def archive_blocks(self, user_id, until=None, newest_first=False):
+        block_filter = {"user_id": user_id}
+        if until:
+            block_filter["start"] = {"$lte": until}
+        return self.archives.find(block_filter, {"codec": 1, "data": 1}) \
+            .sort("start", -1 if newest_first else 1)
+
+    def users_missing_insights(self):
+        return [
+            session["user_id"]
+            for session in self.collection.find(
+                {"messages": {"$elemMatch": {"role": "user", "emotion": {"$exists": False}}}},
+                {"user_id": 1, "_id": 0}
+            )
+        ]
+
+    def set_message_insights(self, user_id, updates):
+        if not updates:
+            return 0
+        # Match messages by timestamp rather than position so concurrent
+        # appends and compaction cannot shift the target
+        update, array_filters = {}, []
+        for i, (timestamp, sentiment, emotion) in enumerate(updates):
+            update[f"messages.$[m{i}].sentiment"] = sentiment
+            update[f"messages.$[m{i}].emotion"] = emotion
+            array_filters.append({f"m{i}.timestamp": timestamp, f"m{i}.role": "user"})
+        result = self.collection.update_one(
+            {"user_id": user_id},
+            {"$set": update},
+            array_filters=array_filters
+        )
+        if not result.modified_count:
+            return 0
+        labels = {timestamp: (sentiment, emotion) for timestamp, sentiment, emotion in updates}
+        self._save_emotions(user_id, [
+            {**message, "sentiment": labels[message["timestamp"]][0], "emotion": labels[message["timestamp"]][1]}
+            for message in self.get_messages(user_id)
+            if message["role"] == "user" and message["timestamp"] in labels
+        ])
+        return len(updates)
+
+    def emotion_counts(self, user_id, start, end):
+        match = {"user_id": user_id}
+        date_range = _date_range(start, end)
+        if date_range:
+            match["timestamp"] = date_range
+        return {
+            row["_id"]: row["count"]
+            for row in self.emotions.aggregate([
+                {"$match": match},
+                {"$group": {"_id": "$emotion", "count": {"$sum": 1}}}
+            ])
+        }
+
+    def by_emotion(self, user_id, emotion, start, end, limit):
+        match = {"user_id": user_id, "emotion": emotion}
+        date_range = _date_range(start, end)
+        if date_range:
+            match["timestamp"] = date_range
+        return list(
+            self.emotions.find(match, {"_id": 0, "user_id": 0}).sort("timestamp", -1).limit(limit)
+        )
+
+
+class MongoHabitStore(HabitStore):
+    def __init__(self):
+        self.collection = database.habits_collection
+
+    def create(self, habit):
+        # Store every word as a 64-bit long so $bit never mixes int widths
+        habit["days"] = {year: [Int64(word) for word in words] for year, words in habit.get("days", {}).items()}
+        self.collection.insert_one(habit)
+        return habit
+
+    def list(self, user_id):
+        return list(self.collection.find({"user_id": user_id}).sort("created_at", 1))
+
+    def get(self, user_id, habit_id):
+        oid = _object_id(habit_id)
+        return self.collection.find_one({"_id": oid, "user_id": user_id}) if oid else None
+
+    def set_day(self, user_id, habit_id, day, done):
+        oid = _object_id(habit_id)
+        if not oid:
+            return None
+        habit_filter = {"_id": oid, "user_id": user_id}
+
+        # Make sure the year's bitset exists before flipping a bit in it
+        year_field = f"days.{day.year}"
+        self.collection.update_one(
+            {**habit_filter, year_field: {"$exists": False}},
+            {"$set": {year_field: [Int64(word) for word in empty_year()]}}
+        )
+
+        field, mask = day_update(day)
+        bit_op = {"or": Int64(mask)} if done else {"and": Int64(~mask)}
+        return self.collection.find_one_and_update(
+            habit_filter,
+            {"$bit": {field: bit_op}, "$set": {"updated_at": datetime.now()}},
+            return_document=ReturnDocument.AFTER
+        )
+
+    def delete(self, user_id, habit_id):
+        oid = _object_id(habit_id)
+        if not oid:
+            return False
+        return self.collection.delete_one({"_id": oid, "user_id": user_id}).deleted_count > 0
+
+
+class MongoSuggestionStore(SuggestionStore):
+    def __init__(self):
+        self.collection = database.suggestion_rankings_collection
+
+    def get_ranking(self, user_id, emotion):
+        doc = self.collection.find_one({"_id": user_id}, {f"rankings.{emotion}": 1})
+        return (doc or {}).get("rankings", {}).get(emotion)
+
+    def push_exposure(self, user_id, exposure, max_pending):
+        self.collection.update_one(
+            {"_id": user_id},
+            {"$push": {"pending": {"$each": [exposure], "$slice": -max_pending}}},
+            upsert=True
+        )
+
+    def claim_pending(self, user_id, until, last_mood):
+        # The pre-image tells exactly which exposures this update removed
+        before = self.collection.find_one_and_update(
+            {"_id": user_id},
+            {"$set": {"last_mood": last_mood}, "$pull": {"pending": {"at": {"$lt": until}}}},
+            projection={"last_mood": 1, "pending": 1},
+            upsert=True,
+            return_document=ReturnDocument.BEFORE
+        ) or {}
+        return before.get("last_mood"), [p for p in before.get("pending", []) if p["at"] < until]
+
+    def add_outcomes(self, user_id, outcomes, rank):
+        increments = {}
+        for emotion, entries in outcomes.items():
+            for sid, (shown, improved) in entries.items():
+                increments[f"stats.{emotion}.{sid}.shown"] = shown
+                increments[f"stats.{emotion}.{sid}.improved"] = improved
+        doc = self.collection.find_one_and_update(
+            {"_id": user_id},
+            {"$inc": increments},
+            projection={f"stats.{emotion}": 1 for emotion in outcomes},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        # Rankings are derived from the counters; a racing check-in can at worst
+        # leave one a check-in behind until the next one rewrites it
+        self.collection.update_one(
+            {"_id": user_id},
+            {"$set": {f"rankings.{emotion}": rank(emotion, doc["stats"][emotion]) for emotion in outcomes}}
+        )
+
+
+class MongoSummaryStore(SummaryStore):
+    def __init__(self):
+        self.collection = database.weekly_summaries_collection
+        self.runs = database.summary_runs_collection
+
+    def get(self, user_id, week):
+        return self.collection.find_one({"_id": f"{user_id}:{week}", "status": "done"})
+
+    def save(self, summary):
+        document = {"_id": f"{summary['user_id']}:{summary['week']}", **summary}
+        self.collection.replace_one({"_id": document["_id"]}, document, upsert=True)
+
+    def record_failure(self, user_id, week, error):
+        self.collection.update_one(
+            {"_id": f"{user_id}:{week}"},
+            {
+                "$set": {"user_id": user_id, "week": week, "status": "failed", "error": error},
+                "$inc": {"attempts": 1}
+            },
+            upsert=True
+        )
+
+    def settled_users(self, week, max_attempts):
+        return {
+            doc["user_id"]
+            for doc in self.collection.find(
+                {"week": week, "$or": [{"status": "done"}, {"attempts": {"$gte": max_attempts}}]},
+                {"user_id": 1}
+            )
+        }
+
+    def record_run(self, stats):
+        self.runs.insert_one(dict(stats))
+
+
+class MongoStorage(Storage):
+    name = "mongo"
+
+    def __init__(self):
+        database.create_indexes()
+        self.users = MongoUserStore()
+        self.moods = MongoMoodStore()
+        self.journals = MongoJournalStore()
+        self.chats = MongoChatStore()
+        self.habits = MongoHabitStore()
+        self.suggestions = MongoSuggestionStore()
+        self.summaries = MongoSummaryStore()
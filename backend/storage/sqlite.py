@@ -0,0 +1,1007 @@
+# Embedded storage in a single SQLite file, for self-hosted single-node
+# deployments and local development without a MongoDB server. The database
+# runs in WAL mode so readers never block the writer; every multi-statement
+# write goes through one BEGIN IMMEDIATE transaction.
+import json
+import re
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+from storage.base import (
+    Storage, UserStore, MoodStore, JournalStore, ChatStore, HabitStore, SuggestionStore, SummaryStore
+)
+from utils.habits import WORDS_PER_YEAR, day_update
+
+# Rows fetched per query when walking a user's full history
+BATCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    username TEXT NOT NULL UNIQUE,
+    email TEXT NOT NULL UNIQUE,
+    hashed_password TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    streak INTEGER NOT NULL DEFAULT 0,
+    badges TEXT NOT NULL DEFAULT '[]',
+    settings TEXT NOT NULL DEFAULT '{}',
+    versions TEXT NOT NULL DEFAULT '{}'
+);
+
+CREATE TABLE IF NOT EXISTS moods (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    client_id TEXT,
+    mood_score INTEGER NOT NULL,
+    energy_level INTEGER NOT NULL,
+    focus_level INTEGER NOT NULL,
+    notes TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS moods_user_created ON moods (user_id, created_at);
+CREATE INDEX IF NOT EXISTS moods_created ON moods (created_at);
+CREATE UNIQUE INDEX IF NOT EXISTS moods_user_client ON moods (user_id, client_id) WHERE client_id IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS journals (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    user_id TEXT NOT NULL,
+    client_id TEXT,
+    content TEXT NOT NULL,
+    mood TEXT,
+    tags TEXT NOT NULL DEFAULT '[]',
+    sentiment TEXT,
+    emotion TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS journals_user_created ON journals (user_id, created_at);
+CREATE INDEX IF NOT EXISTS journals_user_emotion ON journals (user_id, emotion, created_at);
+CREATE INDEX IF NOT EXISTS journals_created ON journals (created_at);
+CREATE UNIQUE INDEX IF NOT EXISTS journals_user_client ON journals (user_id, client_id) WHERE client_id IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS journal_embeddings (
+    journal_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    vector BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS journal_embeddings_user ON journal_embeddings (user_id);
+
+CREATE TABLE IF NOT EXISTS chat_messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    sentiment TEXT,
+    emotion TEXT
+);
+CREATE INDEX IF NOT EXISTS chat_messages_user_timestamp ON chat_messages (user_id, timestamp);
+CREATE INDEX IF NOT EXISTS chat_messages_user_emotion ON chat_messages (user_id, emotion, timestamp);
+
+-- Labelled user messages, kept when the messages themselves are archived
+CREATE TABLE IF NOT EXISTS chat_emotions (
+    user_id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    content TEXT NOT NULL,
+    sentiment TEXT,
+    emotion TEXT NOT NULL,
+    PRIMARY KEY (user_id, timestamp)
+);
+CREATE INDEX IF NOT EXISTS chat_emotions_user_emotion ON chat_emotions (user_id, emotion, timestamp);
+
+CREATE TABLE IF NOT EXISTS chat_archives (
+    user_id TEXT NOT NULL,
+    start TEXT NOT NULL,
+    "end" TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    codec TEXT NOT NULL,
+    data BLOB NOT NULL,
+    raw_bytes INTEGER NOT NULL,
+    stored_bytes INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (user_id, start)
+);
+
+CREATE TABLE IF NOT EXISTS habits (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT,
+    target_per_week INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS habits_user_created ON habits (user_id, created_at);
+
+CREATE TABLE IF NOT EXISTS habit_days (
+    habit_id TEXT NOT NULL REFERENCES habits (id) ON DELETE CASCADE,
+    year INTEGER NOT NULL,
+    w0 INTEGER NOT NULL DEFAULT 0,
+    w1 INTEGER NOT NULL DEFAULT 0,
+    w2 INTEGER NOT NULL DEFAULT 0,
+    w3 INTEGER NOT NULL DEFAULT 0,
+    w4 INTEGER NOT NULL DEFAULT 0,
+    w5 INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (habit_id, year)
+);
+
+CREATE TABLE IF NOT EXISTS suggestion_rankings (
+    user_id TEXT PRIMARY KEY,
+    last_mood INTEGER,
+    pending TEXT NOT NULL DEFAULT '[]',
+    stats TEXT NOT NULL DEFAULT '{}',
+    rankings TEXT NOT NULL DEFAULT '{}'
+);
+
+CREATE TABLE IF NOT EXISTS weekly_summaries (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    week TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    document TEXT
+);
+CREATE INDEX IF NOT EXISTS weekly_summaries_week_status ON weekly_summaries (week, status);
+
+CREATE TABLE IF NOT EXISTS summary_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    document TEXT NOT NULL
+);
+"""
+
+# Keyword search index over journal content and tags, kept in sync by triggers
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS journals_fts USING fts5(
+    content, tags, content='journals', content_rowid='seq', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS journals_fts_insert AFTER INSERT ON journals BEGIN
+    INSERT INTO journals_fts (rowid, content, tags) VALUES (new.seq, new.content, new.tags);
+END;
+CREATE TRIGGER IF NOT EXISTS journals_fts_delete AFTER DELETE ON journals BEGIN
+    INSERT INTO journals_fts (journals_fts, rowid, content, tags) VALUES ('delete', old.seq, old.content, old.tags);
+END;
+CREATE TRIGGER IF NOT EXISTS journals_fts_update AFTER UPDATE OF content, tags ON journals BEGIN
+    INSERT INTO journals_fts (journals_fts, rowid, content, tags) VALUES ('delete', old.seq, old.content, old.tags);
+    INSERT INTO journals_fts (rowid, content, tags) VALUES (new.seq, new.content, new.tags);
+END;
+"""
+
+MOOD_COLUMNS = "id, mood_score, energy_level, focus_level, notes, created_at"
+JOURNAL_COLUMNS = "id, content, mood, tags, sentiment, emotion, created_at"
+MESSAGE_COLUMNS = "role, content, timestamp, sentiment, emotion"
+
+
+def _new_id() -> str:
+    return uuid.uuid4().hex
+
+
+def _ts(value):
+    """Encode a datetime as sortable ISO text in naive local time."""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return value.isoformat(sep=" ", timespec="microseconds")
+
+
+def _dt(value):
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return {"$date": _ts(value)}
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+def _json_hook(value):
+    if len(value) == 1 and "$date" in value:
+        return _dt(value["$date"])
+    return value
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, default=_json_default)
+
+
+def _loads(value):
+    return json.loads(value, object_hook=_json_hook) if value is not None else None
+
+
+def _range_clause(column: str, start, end, params: list) -> str:
+    clause = ""
+    if start:
+        clause += f" AND {column} >= ?"
+        params.append(_ts(start))
+    if end:
+        clause += f" AND {column} < ?"
+        params.append(_ts(end))
+    return clause
+
+
+def _tags_clause(tags, params: list) -> str:
+    """Require every tag in tags to appear in the journal's JSON tag list."""
+    if not tags:
+        return ""
+    params.append(json.dumps(tags))
+    return (
+        " AND NOT EXISTS (SELECT 1 FROM json_each(?) AS wanted"
+        " WHERE wanted.value NOT IN (SELECT value FROM json_each(journals.tags)))"
+    )
+
+
+def _mood(row) -> dict:
+    mood = dict(row)
+    mood["_id"] = mood.pop("id")
+    mood["created_at"] = _dt(mood["created_at"])
+    return mood
+
+
+def _journal(row) -> dict:
+    journal = dict(row)
+    journal["_id"] = journal.pop("id")
+    journal.pop("seq", None)
+    if "tags" in journal:
+        journal["tags"] = json.loads(journal["tags"])
+    for field in ("created_at", "updated_at"):
+        if field in journal:
+            journal[field] = _dt(journal[field])
+    return journal
+
+
+def _message(row) -> dict:
+    message = dict(row)
+    message["timestamp"] = _dt(message["timestamp"])
+    return message
+
+
+class Database:
+    """One connection per thread to a WAL-mode SQLite file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self.has_fts = True
+        connection = self.connection()
+        connection.executescript(SCHEMA)
+        try:
+            connection.executescript(FTS_SCHEMA)
+        except sqlite3.OperationalError:
+            # Builds without FTS5 fall back to LIKE matching
+            self.has_fts = False
+
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Autocommit mode; transactions are opened explicitly below
+            connection = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA busy_timeout=5000")
+            connection.execute("PRAGMA foreign_keys=ON")
+            self._local.connection = connection
+        return connection
+
+    def execute(self, sql: str, params=()) -> sqlite3.Cursor:
+        return self.connection().execute(sql, params)
+
+    def one(self, sql: str, params=()):
+        return self.execute(sql, params).fetchone()
+
+    def all(self, sql: str, params=()) -> list:
+        return self.execute(sql, params).fetchall()
+
+    @contextmanager
+    def transaction(self):
+        # Take the write lock up front so read-modify-write cycles cannot interleave
+        connection = self.connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def pages(self, sql: str, params: list, key_columns: tuple, batch_size: int = BATCH_SIZE):
+        """Yield rows of an ascending keyset query page by page.
+
+        sql must end with a WHERE clause to which the keyset condition is
+        appended; each page is fetched in full on the calling thread, so the
+        iterator can be consumed from a thread pool.
+        """
+        order = ", ".join(key_columns)
+        last = None
+        while True:
+            page_sql, page_params = sql, list(params)
+            if last is not None:
+                page_sql += f" AND ({order}) > ({', '.join('?' * len(key_columns))})"
+                page_params.extend(last)
+            rows = self.all(f"{page_sql} ORDER BY {order} LIMIT ?", page_params + [batch_size])
+            yield from rows
+            if len(rows) < batch_size:
+                return
+            last = [rows[-1][column] for column in key_columns]
+
+
+def _insert_idempotent(db: Database, sql: str, documents: list, values):
+    """Insert documents keyed by client_id in one transaction, skipping stored keys."""
+    inserted, duplicates, seen = [], [], set()
+    with db.transaction() as connection:
+        for doc in documents:
+            if doc["client_id"] in seen:
+                duplicates.append(doc["client_id"])
+                continue
+            seen.add(doc["client_id"])
+            doc["_id"] = _new_id()
+            if connection.execute(sql, values(doc)).rowcount:
+                inserted.append(doc)
+            else:
+                del doc["_id"]
+                duplicates.append(doc["client_id"])
+    return inserted, duplicates
+
+
+class SQLiteUserStore(UserStore):
+    def __init__(self, db: Database):
+        self.db = db
+
+    @staticmethod
+    def _user(row):
+        if row is None:
+            return None
+        user = dict(row)
+        user["_id"] = user.pop("id")
+        user["created_at"] = _dt(user["created_at"])
+        user["updated_at"] = _dt(user["updated_at"])
+        user["badges"] = json.loads(user["badges"])
+        user["settings"] = json.loads(user["settings"])
+        user["versions"] = _loads(user["versions"])
+        return user
+
+    def get(self, user_id):
+        return self._user(self.db.one("SELECT * FROM users WHERE id = ?", (user_id,)))
+
+    def get_by_email(self, email):
+        return self._user(self.db.one("SELECT * FROM users WHERE email = ?", (email,)))
+
+    def get_by_username(self, username):
+        return self._user(self.db.one("SELECT * FROM users WHERE username = ?", (username,)))
+
+    def create(self, user):
+        user["_id"] = _new_id()
+        self.db.execute(
+            "INSERT INTO users (id, username, email, hashed_password, created_at, updated_at, streak, badges, settings)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                user["_id"], user["username"], user["email"], user["hashed_password"],
+                _ts(user["created_at"]), _ts(user["updated_at"]), user.get("streak", 0),
+                json.dumps(user.get("badges", [])), json.dumps(user.get("settings", {}))
+            )
+        )
+        return user
+
+    def set_streak(self, user_id, streak, badges=()):
+        with self.db.transaction() as connection:
+            connection.execute("UPDATE users SET streak = ? WHERE id = ?", (streak, user_id))
+            if badges:
+                self._add_badges(connection, user_id, badges)
+
+    @staticmethod
+    def _add_badges(connection, user_id, badges):
+        row = connection.execute("SELECT badges FROM users WHERE id = ?", (user_id,)).fetchone()
+        current = json.loads(row["badges"])
+        missing = [badge for badge in badges if badge not in current]
+        if missing:
+            connection.execute(
+                "UPDATE users SET badges = ? WHERE id = ?",
+                (json.dumps(current + missing), user_id)
+            )
+
+    def bump_versions(self, user_id, resources, at):
+        with self.db.transaction() as connection:
+            row = connection.execute("SELECT versions FROM users WHERE id = ?", (user_id,)).fetchone()
+            if row is None:
+                return
+            versions = _loads(row["versions"])
+            for resource in resources:
+                stamp = versions.setdefault(resource, {})
+                stamp["v"] = stamp.get("v", 0) + 1
+                stamp["at"] = at
+            connection.execute("UPDATE users SET versions = ? WHERE id = ?", (_dumps(versions), user_id))
+
+
+class SQLiteMoodStore(MoodStore):
+    INSERT = (
+        "INSERT INTO moods (id, user_id, client_id, mood_score, energy_level, focus_level, notes, created_at)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    @staticmethod
+    def _values(mood):
+        return (
+            mood["_id"], mood["user_id"], mood.get("client_id"), mood["mood_score"],
+            mood["energy_level"], mood["focus_level"], mood.get("notes"), _ts(mood["created_at"])
+        )
+
+    def insert(self, mood):
+        mood["_id"] = _new_id()
+        self.db.execute(self.INSERT, self._values(mood))
+        return mood
+
+    def insert_batch(self, user_id, moods):
+        return _insert_idempotent(
+            self.db, self.INSERT + " ON CONFLICT (user_id, client_id) WHERE client_id IS NOT NULL DO NOTHING",
+            moods, self._values
+        )
+
+    def checkin_days(self, user_id, until):
+        rows = self.db.all(
+            "SELECT DISTINCT substr(created_at, 1, 10) AS day FROM moods"
+            " WHERE user_id = ? AND created_at <= ? ORDER BY day DESC",
+            (user_id, _ts(until))
+        )
+        return [row["day"] for row in rows]
+
+    def list(self, user_id):
+        return [
+            _mood(row) for row in self.db.all(
+                f"SELECT {MOOD_COLUMNS} FROM moods WHERE user_id = ? ORDER BY created_at DESC",
+                (user_id,)
+            )
+        ]
+
+    def count(self, user_id):
+        return self.db.one("SELECT COUNT(*) FROM moods WHERE user_id = ?", (user_id,))[0]
+
+    def summary(self, user_id, trend_start, recent):
+        totals = self.db.one(
+            "SELECT COUNT(*) AS count, AVG(mood_score) AS mood, AVG(energy_level) AS energy,"
+            " AVG(focus_level) AS focus FROM moods WHERE user_id = ?",
+            (user_id,)
+        )
+        trend = {}
+        for row in self.db.all(
+            "SELECT substr(created_at, 1, 10) AS day, mood_score FROM moods"
+            " WHERE user_id = ? AND created_at >= ? ORDER BY created_at",
+            (user_id, _ts(trend_start))
+        ):
+            trend.setdefault(row["day"], row["mood_score"])
+        recent_rows = self.db.all(
+            f"SELECT {MOOD_COLUMNS} FROM moods WHERE user_id = ? ORDER BY created_at DESC LIMIT ?",
+            (user_id, recent)
+        ) if recent else []
+        return {
+            "count": totals["count"],
+            "mood": totals["mood"] or 0,
+            "energy": totals["energy"] or 0,
+            "focus": totals["focus"] or 0,
+            "trend": trend,
+            "recent": [_mood(row) for row in recent_rows]
+        }
+
+    def iter_all(self, user_id):
+        for row in self.db.pages(
+            f"SELECT {MOOD_COLUMNS} FROM moods WHERE user_id = ?", [user_id], ("created_at", "id")
+        ):
+            yield _mood(row)
+
+    def daily_averages(self, user_id, start, end):
+        return [
+            dict(row) for row in self.db.all(
+                "SELECT substr(created_at, 1, 10) AS _id, COUNT(*) AS count, AVG(mood_score) AS mood,"
+                " AVG(energy_level) AS energy, AVG(focus_level) AS focus FROM moods"
+                " WHERE user_id = ? AND created_at >= ? AND created_at < ? GROUP BY _id ORDER BY _id",
+                (user_id, _ts(start), _ts(end))
+            )
+        ]
+
+    def active_users(self, start, end):
+        return {
+            row["user_id"] for row in self.db.all(
+                "SELECT DISTINCT user_id FROM moods WHERE created_at >= ? AND created_at < ?",
+                (_ts(start), _ts(end))
+            )
+        }
+
+
+class SQLiteJournalStore(JournalStore):
+    INSERT = (
+        "INSERT INTO journals (id, user_id, client_id, content, mood, tags, sentiment, emotion, created_at, updated_at)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    @staticmethod
+    def _values(journal):
+        return (
+            journal["_id"], journal["user_id"], journal.get("client_id"), journal["content"],
+            journal.get("mood"), json.dumps(journal.get("tags", [])), journal.get("sentiment"),
+            journal.get("emotion"), _ts(journal["created_at"]), _ts(journal["updated_at"])
+        )
+
+    def insert(self, journal):
+        journal["_id"] = _new_id()
+        self.db.execute(self.INSERT, self._values(journal))
+        return journal
+
+    def insert_batch(self, user_id, journals):
+        return _insert_idempotent(
+            self.db, self.INSERT + " ON CONFLICT (user_id, client_id) WHERE client_id IS NOT NULL DO NOTHING",
+            journals, self._values
+        )
+
+    def get(self, user_id, journal_id):
+        row = self.db.one("SELECT * FROM journals WHERE id = ? AND user_id = ?", (journal_id, user_id))
+        return _journal(row) if row else None
+
+    def get_many(self, user_id, journal_ids, tags=None):
+        if not journal_ids:
+            return []
+        params = [user_id, *journal_ids]
+        clause = _tags_clause(tags, params)
+        rows = self.db.all(
+            f"SELECT {JOURNAL_COLUMNS} FROM journals WHERE user_id = ?"
+            f" AND id IN ({', '.join('?' * len(journal_ids))}){clause}",
+            params
+        )
+        return [_journal(row) for row in rows]
+
+    def delete(self, user_id, journal_id):
+        with self.db.transaction() as connection:
+            deleted = connection.execute(
+                "DELETE FROM journals WHERE id = ? AND user_id = ?", (journal_id, user_id)
+            ).rowcount
+            if deleted:
+                connection.execute("DELETE FROM journal_embeddings WHERE journal_id = ?", (journal_id,))
+        return deleted > 0
+
+    def list(self, user_id):
+        return [
+            _journal(row) for row in self.db.all(
+                f"SELECT {JOURNAL_COLUMNS} FROM journals WHERE user_id = ? ORDER BY created_at DESC",
+                (user_id,)
+            )
+        ]
+
+    def summary(self, user_id, recent):
+        rows = self.db.all(
+            f"SELECT {JOURNAL_COLUMNS} FROM journals WHERE user_id = ? ORDER BY created_at DESC LIMIT ?",
+            (user_id, recent)
+        ) if recent else []
+        return {"count": self.count(user_id), "recent": [_journal(row) for row in rows]}
+
+    def count(self, user_id):
+        return self.db.one("SELECT COUNT(*) FROM journals WHERE user_id = ?", (user_id,))[0]
+
+    def iter_all(self, user_id):
+        for row in self.db.pages(
+            f"SELECT {JOURNAL_COLUMNS} FROM journals WHERE user_id = ?", [user_id], ("created_at", "id")
+        ):
+            yield _journal(row)
+
+    def in_range(self, user_id, start, end):
+        return [
+            _journal(row) for row in self.db.all(
+                f"SELECT {JOURNAL_COLUMNS} FROM journals"
+                " WHERE user_id = ? AND created_at >= ? AND created_at < ? ORDER BY created_at",
+                (user_id, _ts(start), _ts(end))
+            )
+        ]
+
+    def active_users(self, start, end):
+        return {
+            row["user_id"] for row in self.db.all(
+                "SELECT DISTINCT user_id FROM journals WHERE created_at >= ? AND created_at < ?",
+                (_ts(start), _ts(end))
+            )
+        }
+
+    def keyword_search(self, user_id, query, limit, tags=None):
+        terms = re.findall(r"\w+", query.lower())
+        if not terms:
+            return {}
+        if self.db.has_fts:
+            # Quote each term so user input is never parsed as FTS syntax;
+            # any term may match, like a Mongo $text search
+            params = [" OR ".join('"' + term + '"' for term in terms), user_id]
+            clause = _tags_clause(tags, params)
+            rows = self.db.all(
+                "SELECT journals.id AS id, -bm25(journals_fts) AS score FROM journals_fts"
+                " JOIN journals ON journals.seq = journals_fts.rowid"
+                f" WHERE journals_fts MATCH ? AND journals.user_id = ?{clause} ORDER BY score DESC LIMIT ?",
+                params + [limit]
+            )
+        else:
+            score = " + ".join("(lower(content || ' ' || tags) LIKE ?)" for _ in terms)
+            params = [f"%{term}%" for term in terms] + [user_id]
+            clause = _tags_clause(tags, params)
+            rows = self.db.all(
+                f"SELECT id, {score} AS score FROM journals WHERE user_id = ? AND score > 0{clause}"
+                " ORDER BY score DESC LIMIT ?",
+                params + [limit]
+            )
+        return {row["id"]: row["score"] for row in rows}
+
+    def tagged_ids(self, user_id, tags):
+        params = [user_id]
+        clause = _tags_clause(tags, params)
+        return {row["id"] for row in self.db.all(f"SELECT id FROM journals WHERE user_id = ?{clause}", params)}
+
+    def emotion_counts(self, user_id, start, end):
+        params = [user_id]
+        clause = _range_clause("created_at", start, end, params)
+        return {
+            row["emotion"]: row["count"] for row in self.db.all(
+                "SELECT emotion, COUNT(*) AS count FROM journals"
+                f" WHERE user_id = ? AND emotion IS NOT NULL{clause} GROUP BY emotion",
+                params
+            )
+        }
+
+    def by_emotion(self, user_id, emotion, start, end, limit):
+        params = [user_id, emotion]
+        clause = _range_clause("created_at", start, end, params)
+        return [
+            _journal(row) for row in self.db.all(
+                f"SELECT {JOURNAL_COLUMNS} FROM journals WHERE user_id = ? AND emotion = ?{clause}"
+                " ORDER BY created_at DESC LIMIT ?",
+                params + [limit]
+            )
+        ]
+
+    def missing_insights(self, batch_size):
+        for row in self.db.pages(
+            "SELECT seq, id, user_id, content FROM journals WHERE emotion IS NULL", [], ("seq",), batch_size
+        ):
+            yield _journal(row)
+
+    def set_insights(self, updates):
+        if updates:
+            with self.db.transaction() as connection:
+                connection.executemany(
+                    "UPDATE journals SET sentiment = ?, emotion = ? WHERE id = ?",
+                    [(sentiment, emotion, journal_id) for journal_id, sentiment, emotion in updates]
+                )
+
+    def save_embeddings(self, user_id, vectors):
+        if vectors:
+            with self.db.transaction() as connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO journal_embeddings (journal_id, user_id, vector) VALUES (?, ?, ?)",
+                    [(journal_id, user_id, vector) for journal_id, vector in vectors]
+                )
+
+    def load_embeddings(self, user_id):
+        return [
+            (row["journal_id"], row["vector"]) for row in self.db.all(
+                "SELECT journal_id, vector FROM journal_embeddings WHERE user_id = ?", (user_id,)
+            )
+        ]
+
+    def missing_embeddings(self, batch_size):
+        for row in self.db.pages(
+            "SELECT seq, id, user_id, content FROM journals"
+            " WHERE id NOT IN (SELECT journal_id FROM journal_embeddings)",
+            [], ("seq",), batch_size
+        ):
+            yield _journal(row)
+
+
+class SQLiteChatStore(ChatStore):
+    def __init__(self, db: Database):
+        self.db = db
+
+    def get_messages(self, user_id):
+        return [
+            _message(row) for row in self.db.all(
+                f"SELECT {MESSAGE_COLUMNS} FROM chat_messages WHERE user_id = ? ORDER BY timestamp, id",
+                (user_id,)
+            )
+        ]
+
+    def append(self, user_id, messages):
+        with self.db.transaction() as connection:
+            connection.executemany(
+                "INSERT INTO chat_messages (user_id, role, content, timestamp, sentiment, emotion)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (user_id, message["role"], message["content"], _ts(message["timestamp"]),
+                     message.get("sentiment"), message.get("emotion"))
+                    for message in messages
+                ]
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO chat_emotions (user_id, timestamp, content, sentiment, emotion)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [
+                    (user_id, _ts(message["timestamp"]), message["content"],
+                     message.get("sentiment"), message["emotion"])
+                    for message in messages
+                    if message["role"] == "user" and message.get("emotion")
+                ]
+            )
+
+    def delete(self, user_id):
+        with self.db.transaction() as connection:
+            deleted = connection.execute("DELETE FROM chat_messages WHERE user_id = ?", (user_id,)).rowcount
+            deleted += connection.execute("DELETE FROM chat_archives WHERE user_id = ?", (user_id,)).rowcount
+            connection.execute("DELETE FROM chat_emotions WHERE user_id = ?", (user_id,))
+        return deleted > 0
+
+    def users_with_messages_before(self, cutoff):
+        return [
+            row["user_id"] for row in self.db.all(
+                "SELECT DISTINCT user_id FROM chat_messages WHERE timestamp < ?", (_ts(cutoff),)
+            )
+        ]
+
+    def archive(self, user_id, blocks, cutoff):
+        # Blocks and the live-message delete commit together
+        with self.db.transaction() as connection:
+            connection.executemany(
+                'INSERT OR REPLACE INTO chat_archives (user_id, start, "end", count, codec, data,'
+                " raw_bytes, stored_bytes, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (user_id, _ts(block["start"]), _ts(block["end"]), block["count"], block["codec"],
+                     bytes(block["data"]), block["raw_bytes"], block["stored_bytes"], _ts(block["created_at"]))
+                    for block in blocks
+                ]
+            )
+            connection.execute(
+                "DELETE FROM chat_messages WHERE user_id = ? AND timestamp < ?", (user_id, _ts(cutoff))
+            )
+
+    def archive_blocks(self, user_id, until=None, newest_first=False):
+        params = [user_id]
+        clause = ""
+        if until:
+            clause = " AND start <= ?"
+            params.append(_ts(until))
+        order = "DESC" if newest_first else "ASC"
+        # Fetch block keys first so only one compressed block is held at a time
+        for row in self.db.all(f"SELECT start FROM chat_archives WHERE user_id = ?{clause} ORDER BY start {order}", params):
+            block = self.db.one(
+                "SELECT codec, data FROM chat_archives WHERE user_id = ? AND start = ?", (user_id, row["start"])
+            )
+            if block:
+                yield dict(block)
+
+    def users_missing_insights(self):
+        return [
+            row["user_id"] for row in self.db.all(
+                "SELECT DISTINCT user_id FROM chat_messages WHERE role = 'user' AND emotion IS NULL"
+            )
+        ]
+
+    def set_message_insights(self, user_id, updates):
+        if not updates:
+            return 0
+        with self.db.transaction() as connection:
+            updated = sum(
+                connection.execute(
+                    "UPDATE chat_messages SET sentiment = ?, emotion = ?"
+                    " WHERE user_id = ? AND timestamp = ? AND role = 'user'",
+                    (sentiment, emotion, user_id, _ts(timestamp))
+                ).rowcount
+                for timestamp, sentiment, emotion in updates
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO chat_emotions (user_id, timestamp, content, sentiment, emotion)"
+                " SELECT user_id, timestamp, content, sentiment, emotion FROM chat_messages"
+                " WHERE user_id = ? AND timestamp = ? AND role = 'user'",
+                [(user_id, _ts(timestamp)) for timestamp, _, _ in updates]
+            )
+        return updated
+
+    def emotion_counts(self, user_id, start, end):
+        params = [user_id]
+        clause = _range_clause("timestamp", start, end, params)
+        return {
+            row["emotion"]: row["count"] for row in self.db.all(
+                f"SELECT emotion, COUNT(*) AS count FROM chat_emotions WHERE user_id = ?{clause} GROUP BY emotion",
+                params
+            )
+        }
+
+    def by_emotion(self, user_id, emotion, start, end, limit):
+        params = [user_id, emotion]
+        clause = _range_clause("timestamp", start, end, params)
+        return [
+            _message(row) for row in self.db.all(
+                "SELECT 'user' AS role, content, timestamp, sentiment, emotion FROM chat_emotions"
+                f" WHERE user_id = ? AND emotion = ?{clause} ORDER BY timestamp DESC LIMIT ?",
+                params + [limit]
+            )
+        ]
+
+
+class SQLiteHabitStore(HabitStore):
+    def __init__(self, db: Database):
+        self.db = db
+
+    def _habits(self, rows) -> list:
+        habits = []
+        for row in rows:
+            habit = dict(row)
+            habit["_id"] = habit.pop("id")
+            habit["created_at"] = _dt(habit["created_at"])
+            habit["updated_at"] = _dt(habit["updated_at"])
+            habit["days"] = {}
+            habits.append(habit)
+        if not habits:
+            return habits
+
+        # Attach every year's words in one query
+        by_id = {habit["_id"]: habit for habit in habits}
+        for day in self.db.all(
+            f"SELECT * FROM habit_days WHERE habit_id IN ({', '.join('?' * len(by_id))})", list(by_id)
+        ):
+            by_id[day["habit_id"]]["days"][str(day["year"])] = [day[f"w{i}"] for i in range(WORDS_PER_YEAR)]
+        return habits
+
+    def create(self, habit):
+        habit["_id"] = _new_id()
+        with self.db.transaction() as connection:
+            connection.execute(
+                "INSERT INTO habits (id, user_id, name, description, target_per_week, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    habit["_id"], habit["user_id"], habit["name"], habit.get("description"),
+                    habit["target_per_week"], _ts(habit["created_at"]), _ts(habit["updated_at"])
+                )
+            )
+            for year, words in habit.get("days", {}).items():
+                connection.execute(
+                    "INSERT INTO habit_days (habit_id, year, w0, w1, w2, w3, w4, w5) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (habit["_id"], int(year), *map(int, words))
+                )
+        return habit
+
+    def list(self, user_id):
+        return self._habits(self.db.all("SELECT * FROM habits WHERE user_id = ? ORDER BY created_at", (user_id,)))
+
+    def get(self, user_id, habit_id):
+        habits = self._habits(self.db.all("SELECT * FROM habits WHERE id = ? AND user_id = ?", (habit_id, user_id)))
+        return habits[0] if habits else None
+
+    def set_day(self, user_id, habit_id, day, done):
+        field, mask = day_update(day)
+        word = f"w{int(field.rsplit('.', 1)[1])}"
+        with self.db.transaction() as connection:
+            updated = connection.execute(
+                "UPDATE habits SET updated_at = ? WHERE id = ? AND user_id = ?",
+                (_ts(datetime.now()), habit_id, user_id)
+            ).rowcount
+            if not updated:
+                return None
+            connection.execute(
+                "INSERT OR IGNORE INTO habit_days (habit_id, year) VALUES (?, ?)", (habit_id, day.year)
+            )
+            # SQLite integers are signed 64-bit, matching the stored words
+            connection.execute(
+                f"UPDATE habit_days SET {word} = {word} {'|' if done else '&'} ? WHERE habit_id = ? AND year = ?",
+                (mask if done else ~mask, habit_id, day.year)
+            )
+        return self.get(user_id, habit_id)
+
+    def delete(self, user_id, habit_id):
+        return self.db.execute(
+            "DELETE FROM habits WHERE id = ? AND user_id = ?", (habit_id, user_id)
+        ).rowcount > 0
+
+
+class SQLiteSuggestionStore(SuggestionStore):
+    def __init__(self, db: Database):
+        self.db = db
+
+    def get_ranking(self, user_id, emotion):
+        row = self.db.one("SELECT rankings FROM suggestion_rankings WHERE user_id = ?", (user_id,))
+        return _loads(row["rankings"]).get(emotion) if row else None
+
+    def push_exposure(self, user_id, exposure, max_pending):
+        with self.db.transaction() as connection:
+            row = connection.execute(
+                "SELECT pending FROM suggestion_rankings WHERE user_id = ?", (user_id,)
+            ).fetchone()
+            pending = (_loads(row["pending"]) if row else []) + [exposure]
+            connection.execute(
+                "INSERT INTO suggestion_rankings (user_id, pending) VALUES (?, ?)"
+                " ON CONFLICT (user_id) DO UPDATE SET pending = excluded.pending",
+                (user_id, _dumps(pending[-max_pending:]))
+            )
+
+    def claim_pending(self, user_id, until, last_mood):
+        with self.db.transaction() as connection:
+            row = connection.execute(
+                "SELECT last_mood, pending FROM suggestion_rankings WHERE user_id = ?", (user_id,)
+            ).fetchone()
+            previous, pending = (row["last_mood"], _loads(row["pending"])) if row else (None, [])
+            connection.execute(
+                "INSERT INTO suggestion_rankings (user_id, last_mood, pending) VALUES (?, ?, ?)"
+                " ON CONFLICT (user_id) DO UPDATE SET last_mood = excluded.last_mood, pending = excluded.pending",
+                (user_id, last_mood, _dumps([exposure for exposure in pending if exposure["at"] >= until]))
+            )
+        return previous, [exposure for exposure in pending if exposure["at"] < until]
+
+    def add_outcomes(self, user_id, outcomes, rank):
+        with self.db.transaction() as connection:
+            row = connection.execute(
+                "SELECT stats, rankings FROM suggestion_rankings WHERE user_id = ?", (user_id,)
+            ).fetchone()
+            stats, rankings = (_loads(row["stats"]), _loads(row["rankings"])) if row else ({}, {})
+            for emotion, entries in outcomes.items():
+                for sid, (shown, improved) in entries.items():
+                    entry = stats.setdefault(emotion, {}).setdefault(sid, {"shown": 0, "improved": 0})
+                    entry["shown"] += shown
+                    entry["improved"] += improved
+                rankings[emotion] = rank(emotion, stats[emotion])
+            connection.execute(
+                "INSERT INTO suggestion_rankings (user_id, stats, rankings) VALUES (?, ?, ?)"
+                " ON CONFLICT (user_id) DO UPDATE SET stats = excluded.stats, rankings = excluded.rankings",
+                (user_id, _dumps(stats), _dumps(rankings))
+            )
+
+
+class SQLiteSummaryStore(SummaryStore):
+    def __init__(self, db: Database):
+        self.db = db
+
+    def get(self, user_id, week):
+        row = self.db.one(
+            "SELECT document FROM weekly_summaries WHERE id = ? AND status = 'done'", (f"{user_id}:{week}",)
+        )
+        return _loads(row["document"]) if row else None
+
+    def save(self, summary):
+        self.db.execute(
+            "INSERT OR REPLACE INTO weekly_summaries (id, user_id, week, status, document) VALUES (?, ?, ?, ?, ?)",
+            (
+                f"{summary['user_id']}:{summary['week']}", summary["user_id"], summary["week"],
+                summary["status"], _dumps(summary)
+            )
+        )
+
+    def record_failure(self, user_id, week, error):
+        self.db.execute(
+            "INSERT INTO weekly_summaries (id, user_id, week, status, attempts, error) VALUES (?, ?, ?, 'failed', 1, ?)"
+            " ON CONFLICT (id) DO UPDATE SET status = 'failed', attempts = attempts + 1, error = excluded.error",
+            (f"{user_id}:{week}", user_id, week, error)
+        )
+
+    def settled_users(self, week, max_attempts):
+        return {
+            row["user_id"] for row in self.db.all(
+                "SELECT user_id FROM weekly_summaries WHERE week = ? AND (status = 'done' OR attempts >= ?)",
+                (week, max_attempts)
+            )
+        }
+
+    def record_run(self, stats):
+        self.db.execute("INSERT INTO summary_runs (document) VALUES (?)", (_dumps(stats),))
+
+
+class SQLiteStorage(Storage):
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self.db = Database(path)
+        self.users = SQLiteUserStore(self.db)
+        self.moods = SQLiteMoodStore(self.db)
+        self.journals = SQLiteJournalStore(self.db)
+        self.chats = SQLiteChatStore(self.db)
+        self.habits = SQLiteHabitStore(self.db)
+        self.suggestions = SQLiteSuggestionStore(self.db)
+        self.summaries = SQLiteSummaryStore(self.db)
@@ -0,0 +1,47 @@
+import os
+import sys
+import tempfile
+import uuid
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# config.storage builds its backend at import time; keep it off MongoDB
+os.environ.setdefault("STORAGE_BACKEND", "sqlite")
+os.environ.setdefault("SQLITE_PATH", os.path.join(tempfile.mkdtemp(), "test.db"))
+os.environ.setdefault("JWT_SECRET", "test-secret")
+
+
+@pytest.fixture
+def user():
+    """A fresh user in the shared test database."""
+    from config.storage import storage
+
+    now = datetime.now()
+    name = uuid.uuid4().hex[:12]
+    return storage.users.create({
+        "username": name, "email": f"{name}@example.com", "hashed_password": "x",
+        "created_at": now, "updated_at": now, "streak": 0, "badges": [], "settings": {}
+    })
+
+
+@pytest.fixture
+def user_id(user):
+    return str(user["_id"])
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    from main_test import app
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def auth_headers(user):
+    from utils.auth import create_access_token
+
+    return {"Authorization": f"Bearer {create_access_token({'sub': user['email']})}"}
@@ -0,0 +1,81 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from config.storage import storage
+from models.mood import MoodCreate, MoodBatchCreate
+from utils.batch import client_timestamp, compute_streak, update_streak_and_badges
+from api.routes.mood_router import create_mood_entry, create_mood_entries_batch
+
+
+def _mood(user_id, client_id, created_at, score=5):
+    return {
+        "user_id": user_id, "client_id": client_id, "mood_score": score, "energy_level": 5,
+        "focus_level": 5, "notes": None, "created_at": created_at
+    }
+
+
+def test_insert_batch_skips_synced_and_repeated_keys(user_id):
+    now = datetime.now()
+    inserted, duplicates = storage.moods.insert_batch(user_id, [
+        _mood(user_id, "a", now, score=3),
+        _mood(user_id, "b", now),
+        _mood(user_id, "a", now, score=9),
+    ])
+    assert [doc["client_id"] for doc in inserted] == ["a", "b"]
+    assert inserted[0]["mood_score"] == 3
+    assert duplicates == ["a"]
+
+    inserted, duplicates = storage.moods.insert_batch(user_id, [_mood(user_id, "b", now), _mood(user_id, "c", now)])
+    assert [doc["client_id"] for doc in inserted] == ["c"]
+    assert duplicates == ["b"]
+    assert storage.moods.count(user_id) == 3
+
+
+def test_client_timestamp_is_local_and_capped():
+    now = datetime(2024, 5, 1, 12, 0)
+    assert client_timestamp(None, now) == now
+    assert client_timestamp(now + timedelta(days=1), now) == now
+    aware = datetime(2024, 5, 1, 9, 0).astimezone()
+    assert client_timestamp(aware, now) == datetime(2024, 5, 1, 9, 0)
+
+
+def test_compute_streak_counts_distinct_consecutive_days(user_id):
+    now = datetime.now().replace(hour=12)
+    storage.moods.insert_batch(user_id, [
+        _mood(user_id, f"m{day}-{n}", now - timedelta(days=day))
+        for day in (0, 1, 2, 4) for n in range(2)
+    ])
+    assert compute_streak(user_id, now) == 3
+
+
+def test_compute_streak_stays_alive_from_yesterday(user_id):
+    now = datetime.now().replace(hour=12)
+    storage.moods.insert_batch(user_id, [_mood(user_id, f"m{day}", now - timedelta(days=day)) for day in (1, 2)])
+    assert compute_streak(user_id, now) == 2
+    assert compute_streak(user_id, now + timedelta(days=2)) == 0
+
+
+def test_update_streak_and_badges_awards_each_badge_once(user_id):
+    update_streak_and_badges(user_id, 8)
+    update_streak_and_badges(user_id, 31)
+    user = storage.users.get(user_id)
+    assert user["streak"] == 31
+    assert sorted(user["badges"]) == ["30-day-streak", "7-day-streak"]
+
+
+def test_single_and_batch_check_ins_agree_on_streak(user):
+    user_id = str(user["_id"])
+    yesterday = datetime.now() - timedelta(days=1)
+    result = asyncio.run(create_mood_entries_batch(
+        MoodBatchCreate(entries=[
+            {"client_id": "x1", "mood_score": 5, "energy_level": 5, "focus_level": 5, "created_at": yesterday},
+            {"client_id": "x2", "mood_score": 6, "energy_level": 5, "focus_level": 5},
+        ]),
+        current_user=user
+    ))
+    assert result.streak_days == 2
+
+    # More check-ins on a day already counted leave the streak alone
+    for _ in range(2):
+        asyncio.run(create_mood_entry(MoodCreate(mood_score=7, energy_level=5, focus_level=5), current_user=user))
+    assert storage.users.get(user_id)["streak"] == 2
@@ -0,0 +1,75 @@
+import zlib
+from datetime import datetime, timedelta
+
+import pytest
+
+from config.storage import storage
+from utils.chat_archive import compact_all, encode_block, decode_block
+
+
+def _seed(user_id, turns, start):
+    # Each turn's user message and reply share a timestamp, as _save_turn can write them
+    for i in range(turns):
+        at = start + timedelta(minutes=i)
+        storage.chats.append(user_id, [
+            {"role": "user", "content": f"q{i}", "timestamp": at},
+            {"role": "assistant", "content": f"a{i}", "timestamp": at},
+        ])
+
+
+def _all_pages(client, auth_headers, limit):
+    pages, cursor = [], None
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/chat/history", params=params, headers=auth_headers)
+        assert response.status_code == 200
+        pages.insert(0, [message["content"] for message in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return [content for page in pages for content in page]
+
+
+def test_default_view_fills_from_archive(client, auth_headers, user_id):
+    _seed(user_id, 300, datetime.now() - timedelta(days=60))
+    totals = compact_all(30, 200)
+    assert storage.chats.get_messages(user_id) == []
+    assert totals["read_ms_max"] > 0
+
+    response = client.get("/api/chat/history", headers=auth_headers)
+    contents = [message["content"] for message in response.json()]
+    assert len(contents) == 50
+    assert contents[-2:] == ["q299", "a299"]
+    assert response.headers["X-Next-Cursor"]
+
+
+def test_pages_cover_live_and_archive_without_gaps(client, auth_headers, user_id):
+    now = datetime.now()
+    _seed(user_id, 150, now - timedelta(days=60))
+    compact_all(30, 64)
+    _seed(user_id, 20, now - timedelta(hours=1))
+
+    expected = [f"{role}{i}" for i in range(150) for role in "qa"] + \
+        [f"{role}{i}" for i in range(20) for role in "qa"]
+    # An odd page size splits shared timestamps across page boundaries
+    assert _all_pages(client, auth_headers, 7) == expected
+
+
+def test_rejects_malformed_cursor(client, auth_headers):
+    response = client.get("/api/chat/history", params={"cursor": "yesterday"}, headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_blocks_round_trip_as_json():
+    at = datetime(2024, 5, 1, 12, 0, 0, 123456)
+    messages = [{"role": "user", "content": "hi", "timestamp": at, "emotion": "joy"}]
+    block = encode_block("u1", messages)
+    assert block["codec"].startswith("json+")
+    assert block["start"] == at
+    assert decode_block(block) == messages
+
+
+def test_legacy_bson_blocks_still_decode():
+    bson = pytest.importorskip("bson")
+    messages = [{"role": "user", "content": "hi", "timestamp": datetime(2024, 5, 1, 12, 0, 0, 123000)}]
+    block = {"codec": "gzip", "data": zlib.compress(bson.encode({"messages": messages}))}
+    assert decode_block(block) == messages
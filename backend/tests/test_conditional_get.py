@@ -0,0 +1,102 @@
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from config.storage import storage
+from api.routes import mood_router
+
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+def _http_date(value: datetime) -> str:
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _write(user_id, at, count=1):
+    storage.moods.insert_batch(user_id, [
+        {"user_id": user_id, "client_id": uuid.uuid4().hex, "mood_score": 5, "energy_level": 5, "focus_level": 5,
+         "notes": "a fairly ordinary day, nothing much to report", "created_at": at}
+        for _ in range(count)
+    ])
+    storage.users.bump_versions(user_id, ["mood"], at)
+
+
+def test_matching_etag_is_not_modified(client, auth_headers):
+    first = client.get("/api/mood/", headers=auth_headers)
+    etag = first.headers["ETag"]
+    assert first.status_code == 200 and etag.startswith('W/"')
+
+    for if_none_match in (etag, etag[2:], f'"other", {etag}', "*"):
+        response = client.get("/api/mood/", headers={**auth_headers, "If-None-Match": if_none_match})
+        assert response.status_code == 304, if_none_match
+        assert response.headers["ETag"] == etag
+
+    response = client.get("/api/mood/", headers={**auth_headers, "If-None-Match": '"other"'})
+    assert response.status_code == 200
+
+
+def test_write_in_the_same_second_is_served(client, auth_headers, user_id):
+    second = datetime.now().replace(microsecond=0) - timedelta(seconds=10)
+    _write(user_id, second)
+    first = client.get("/api/mood/", headers=auth_headers)
+    assert first.headers["Last-Modified"] == _http_date(second)
+
+    # A later write inside the second the client was told about
+    _write(user_id, second + timedelta(milliseconds=400))
+    response = client.get("/api/mood/", headers={**auth_headers, "If-None-Match": first.headers["ETag"]})
+    assert response.status_code == 200
+    response = client.get("/api/mood/", headers={**auth_headers, "If-Modified-Since": first.headers["Last-Modified"]})
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+
+    response = client.get("/api/mood/", headers={**auth_headers, "If-Modified-Since": response.headers["Last-Modified"]})
+    assert response.status_code == 304
+
+
+def test_current_second_is_not_advertised(client, auth_headers, user_id):
+    # A stamp whose second is not over yet could still be followed by a write in it
+    storage.users.bump_versions(user_id, ["mood"], datetime.now() + timedelta(seconds=5))
+    response = client.get("/api/mood/", headers=auth_headers)
+    assert response.status_code == 200
+    assert "Last-Modified" not in response.headers
+
+    later = _http_date(datetime.now() + timedelta(hours=1))
+    response = client.get("/api/mood/", headers={**auth_headers, "If-Modified-Since": later})
+    assert response.status_code == 200
+
+
+def test_stats_tag_changes_with_the_date(client, auth_headers, user_id, monkeypatch):
+    _write(user_id, datetime.now() - timedelta(days=1))
+    today = client.get("/api/mood/stats", headers=auth_headers)
+    assert client.get("/api/mood/stats", headers={**auth_headers, "If-None-Match": today.headers["ETag"]}).status_code == 304
+
+    # Dates are not covered by Last-Modified, so it never answers 304 here
+    response = client.get("/api/mood/stats", headers={**auth_headers, "If-Modified-Since": today.headers["Last-Modified"]})
+    assert response.status_code == 200
+
+    class Tomorrow(date):
+        @classmethod
+        def today(cls):
+            return date.today() + timedelta(days=1)
+
+    monkeypatch.setattr(mood_router, "date", Tomorrow)
+    response = client.get("/api/mood/stats", headers={**auth_headers, "If-None-Match": today.headers["ETag"]})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != today.headers["ETag"]
+
+
+def test_only_large_bodies_are_gzipped(client, auth_headers, user_id):
+    _write(user_id, datetime.now() - timedelta(minutes=1))
+    small = client.get("/api/mood/", headers={**auth_headers, **GZIP})
+    assert "Content-Encoding" not in small.headers
+    assert small.headers["Vary"] == "Accept-Encoding"
+
+    _write(user_id, datetime.now() - timedelta(minutes=1), count=50)
+    large = client.get("/api/mood/", headers={**auth_headers, **GZIP})
+    assert large.headers["Content-Encoding"] == "gzip"
+    assert int(large.headers["Content-Length"]) < len(large.content)
+    assert len(large.json()) == 51
+
+    plain = client.get("/api/mood/", headers={**auth_headers, "Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in plain.headers
+    assert plain.json() == large.json()
@@ -0,0 +1,60 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from config.storage import storage
+from utils.habits import count_between, current_streak, heatmap, is_done, longest_streak
+
+
+@pytest.fixture
+def habit(user_id):
+    now = datetime.now()
+    return storage.habits.create({
+        "user_id": user_id, "name": "Stretch", "description": None, "target_per_week": 5,
+        "days": {}, "created_at": now, "updated_at": now
+    })
+
+
+def _check(user_id, habit, days):
+    for day in days:
+        habit = storage.habits.set_day(user_id, str(habit["_id"]), day, True)
+    return habit
+
+
+def test_days_round_trip_including_sign_bits(user_id, habit):
+    # Day-of-year 64 is the top bit of the first word, stored as a negative int64
+    days = [date(2023, 1, 1), date(2023, 3, 5), date(2024, 12, 31)]
+    habit = _check(user_id, habit, days)
+    assert all(is_done(habit, day) for day in days)
+    assert not is_done(habit, date(2023, 3, 4))
+
+    habit = storage.habits.set_day(user_id, str(habit["_id"]), date(2023, 3, 5), False)
+    assert not is_done(habit, date(2023, 3, 5))
+    assert is_done(habit, date(2023, 1, 1))
+
+
+def test_streaks_cross_year_boundaries(user_id, habit):
+    run = [date(2023, 12, 29) + timedelta(days=i) for i in range(6)]  # Dec 29 .. Jan 3
+    habit = _check(user_id, habit, run + [date(2023, 12, 20), date(2023, 12, 21)])
+
+    assert current_streak(habit, date(2024, 1, 3)) == 6
+    # Today still open: the run up to yesterday counts
+    assert current_streak(habit, date(2024, 1, 4)) == 6
+    assert current_streak(habit, date(2024, 1, 5)) == 0
+    assert longest_streak(habit) == 6
+
+
+def test_count_between_and_heatmap(user_id, habit):
+    habit = _check(user_id, habit, [date(2024, 2, 28), date(2024, 2, 29), date(2024, 3, 1), date(2025, 1, 2)])
+    assert count_between(habit, date(2024, 2, 29), date(2025, 1, 2)) == 3
+    assert count_between(habit, date(2024, 3, 2), date(2024, 12, 31)) == 0
+
+    cells = heatmap(habit, 2024)
+    assert len(cells) == 366
+    assert [i for i, cell in enumerate(cells) if cell == "1"] == [58, 59, 60]
+
+
+def test_set_day_is_scoped_to_owner(user_id, habit):
+    assert storage.habits.set_day("someone-else", str(habit["_id"]), date(2024, 1, 1), True) is None
+    assert storage.habits.delete(user_id, str(habit["_id"]))
+    assert storage.habits.get(user_id, str(habit["_id"])) is None
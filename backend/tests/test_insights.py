@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+from config.storage import storage
+from utils.chat_archive import compact_all
+from api.routes import chat_router, journal_router
+
+
+def _insights(text):
+    emotion = "joy" if "good" in text else "sadness"
+    return {"sentiment": {"label": "POSITIVE"}, "emotion": {"emotion": emotion}}
+
+
+def _message(role, content, timestamp, emotion=None):
+    message = {"role": role, "content": content, "timestamp": timestamp}
+    if emotion:
+        message.update(sentiment="NEGATIVE", emotion=emotion)
+    return message
+
+
+def test_labels_are_stored_when_written(client, auth_headers, user_id, monkeypatch):
+    monkeypatch.setattr(journal_router, "get_text_insights", _insights)
+    monkeypatch.setattr(journal_router, "get_text_insights_batch", lambda texts: [_insights(t) for t in texts])
+    monkeypatch.setattr(journal_router, "get_llm", lambda: lambda prompt: "Keep going.")
+    monkeypatch.setattr(journal_router.journal_search, "index_entries", lambda user_id, entries: None)
+    monkeypatch.setattr(chat_router, "get_text_insights", _insights)
+    monkeypatch.setattr(chat_router, "_generate_reply", lambda user_id, message: "I hear you.")
+
+    response = client.post("/api/journal/", json={"content": "a good day", "tags": []}, headers=auth_headers)
+    assert response.json()["emotion"] == "joy"
+    client.post("/api/journal/batch", json={"entries": [{"content": "a long week", "client_id": "w"}]},
+                headers=auth_headers)
+    client.post("/api/chat/message", json={"message": "feeling low"}, headers=auth_headers)
+
+    stored = {entry["content"]: entry["emotion"] for entry in storage.journals.list(user_id)}
+    assert stored == {"a good day": "joy", "a long week": "sadness"}
+    user_message, reply = storage.chats.get_messages(user_id)
+    assert user_message["emotion"] == "sadness"
+    assert reply.get("emotion") is None
+
+    counts = client.get("/api/insights/emotions", headers=auth_headers).json()
+    assert counts["journal"] == {"joy": 1, "sadness": 1}
+    assert counts["chat"] == {"sadness": 1}
+    assert counts["total"] == {"joy": 1, "sadness": 2}
+
+
+def test_chat_emotions_survive_compaction(client, auth_headers, user_id):
+    old = datetime.now() - timedelta(days=60)
+    storage.chats.append(user_id, [
+        _message("user", "tired", old, "sadness"),
+        _message("assistant", "rest up", old),
+        _message("user", "scared", old + timedelta(minutes=1), "fear"),
+    ])
+    storage.chats.append(user_id, [_message("user", "still tired", datetime.now() - timedelta(hours=1), "sadness")])
+    compact_all(30, 64)
+    assert len(storage.chats.get_messages(user_id)) == 1
+
+    counts = client.get("/api/insights/emotions", headers=auth_headers).json()
+    assert counts["chat"] == {"sadness": 2, "fear": 1}
+
+    recent = storage.chats.emotion_counts(user_id, datetime.now() - timedelta(days=1), None)
+    assert recent == {"sadness": 1}
+
+    entries = client.get("/api/insights/emotions/sadness", headers=auth_headers).json()
+    assert [message["content"] for message in entries["chat"]] == ["still tired", "tired"]
+    assert entries["chat"][0]["role"] == "user"
+
+
+def test_backfilled_labels_are_queryable(user_id):
+    timestamp = datetime.now() - timedelta(minutes=5)
+    storage.chats.append(user_id, [_message("user", "meh", timestamp)])
+    assert storage.chats.emotion_counts(user_id, None, None) == {}
+
+    assert storage.chats.set_message_insights(user_id, [(timestamp, "NEGATIVE", "sadness")]) == 1
+    assert storage.chats.emotion_counts(user_id, None, None) == {"sadness": 1}
+
+    storage.chats.delete(user_id)
+    assert storage.chats.emotion_counts(user_id, None, None) == {}
@@ -0,0 +1,81 @@
+import re
+from datetime import datetime, timedelta
+
+import pytest
+
+from config.storage import storage
+from utils import journal_search
+
+# Words the fake embedder treats as synonyms of each dimension
+TOPICS = [("calm", "relaxed", "peaceful"), ("work", "busy")]
+
+
+class FakeEmbeddings:
+    def embed_query(self, text):
+        words = re.findall(r"\w+", text.lower())
+        return [sum(words.count(word) for word in topic) for topic in TOPICS] + [0.1]
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+
+@pytest.fixture
+def entries(user_id, monkeypatch):
+    monkeypatch.setattr(journal_search, "get_embeddings", lambda: FakeEmbeddings())
+    now = datetime.now()
+    docs = [
+        storage.journals.insert({
+            "user_id": user_id, "content": content, "mood": None, "tags": tags,
+            "created_at": now - timedelta(hours=i), "updated_at": now
+        })
+        for i, (content, tags) in enumerate([
+            ("calm morning walk", []),
+            ("relaxed evening", []),
+            ("busy work day", ["work"]),
+            ("calm at work", ["work"]),
+        ])
+    ]
+    journal_search.index_entries(user_id, docs)
+    return {doc["content"]: str(doc["_id"]) for doc in docs}
+
+
+def test_scores_merge_keyword_and_semantic_matches(user_id, entries):
+    results, truncated = journal_search.search(user_id, "calm")
+    by_content = {entry["content"]: (score, keyword, semantic) for entry, score, keyword, semantic in results}
+
+    assert set(by_content) == {"calm morning walk", "relaxed evening", "calm at work"}
+    assert not truncated
+    # Found by meaning alone
+    assert by_content["relaxed evening"][1] == 0 and by_content["relaxed evening"][2] > 0.9
+    assert max(keyword for _, keyword, _ in by_content.values()) == 1.0
+    for score, keyword, semantic in by_content.values():
+        assert score == pytest.approx(journal_search.KEYWORD_WEIGHT * keyword + journal_search.SEMANTIC_WEIGHT * semantic)
+    scores = [score for _, score, _, _ in results]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_tags_restrict_both_sides(user_id, entries):
+    results, _ = journal_search.search(user_id, "calm", ["work"])
+    assert [entry["content"] for entry, _, _, _ in results] == ["calm at work"]
+
+
+def test_pages_split_the_ranked_candidates(client, auth_headers, entries):
+    full = client.get("/api/journal/search", params={"q": "calm"}, headers=auth_headers).json()
+    assert full["candidates"] == 3
+    assert full["truncated"] is False
+
+    pages = [
+        client.get("/api/journal/search", params={"q": "calm", "page": page, "page_size": 2},
+                   headers=auth_headers).json()
+        for page in (1, 2, 3)
+    ]
+    assert [len(page["results"]) for page in pages] == [2, 1, 0]
+    assert [result["entry"]["id"] for page in pages for result in page["results"]] == \
+        [result["entry"]["id"] for result in full["results"]]
+
+
+def test_full_candidate_pool_is_reported(client, auth_headers, entries, monkeypatch):
+    monkeypatch.setattr(journal_search, "CANDIDATE_POOL", 1)
+    body = client.get("/api/journal/search", params={"q": "calm"}, headers=auth_headers).json()
+    assert body["truncated"] is True
+    assert body["candidates"] == len(body["results"]) <= 2
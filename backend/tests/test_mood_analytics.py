@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from config.storage import storage
+from utils import mood_analytics
+from utils.versions import bump
+
+
+def _check_in(user_id):
+    storage.moods.insert({
+        "user_id": user_id, "mood_score": 6, "energy_level": 5, "focus_level": 4,
+        "notes": None, "created_at": datetime.now()
+    })
+    bump(user_id, "mood")
+
+
+def test_series_cache_follows_the_mood_stamp(user_id):
+    _check_in(user_id)
+    user = storage.users.get(user_id)
+    assert len(mood_analytics.get_series(user)) == 1
+
+    # Another worker's write: this process was never told, only the stamp moved
+    _check_in(user_id)
+    assert len(mood_analytics.get_series(user)) == 1
+    assert len(mood_analytics.get_series(storage.users.get(user_id))) == 2
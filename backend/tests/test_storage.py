@@ -0,0 +1,111 @@
+import importlib
+import inspect
+import os
+import subprocess
+import sys
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from storage.base import Storage
+from utils.habits import is_done
+
+
+def _concrete_stores(module):
+    return [
+        cls for _, cls in inspect.getmembers(module, inspect.isclass)
+        if cls.__module__ == module.__name__ and inspect.getmro(cls)[1] is not object
+    ]
+
+
+@pytest.mark.parametrize("module_name", ["storage.sqlite", "storage.mongo"])
+def test_backend_implements_every_store_method(module_name):
+    if module_name == "storage.mongo":
+        pytest.importorskip("pymongo")
+    module = importlib.import_module(module_name)
+    stores = _concrete_stores(module)
+    assert any(issubclass(cls, Storage) for cls in stores)
+    for cls in stores:
+        assert not inspect.isabstract(cls), f"{cls.__name__} misses {sorted(cls.__abstractmethods__)}"
+
+
+def test_sqlite_backend_runs_without_pymongo(tmp_path):
+    # Blocking bson makes any import of it on the SQLite path fail loudly
+    code = (
+        "import sys; sys.modules['bson'] = None; sys.modules['pymongo'] = None\n"
+        "from config.storage import storage\n"
+        "from utils import habits, chat_archive\n"
+        "import main_test\n"
+        "assert storage.name == 'sqlite'\n"
+    )
+    env = {**os.environ, "STORAGE_BACKEND": "sqlite", "SQLITE_PATH": str(tmp_path / "plain.db")}
+    backend = os.path.join(os.path.dirname(__file__), "..")
+    result = subprocess.run([sys.executable, "-c", code], cwd=backend, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_create_storage_selects_backend(monkeypatch, tmp_path):
+    from config import storage as config_storage
+
+    monkeypatch.setattr(config_storage, "STORAGE_BACKEND", "sqlite")
+    monkeypatch.setattr(config_storage, "SQLITE_PATH", str(tmp_path / "selected.db"))
+    assert config_storage.create_storage().name == "sqlite"
+
+    monkeypatch.setattr(config_storage, "STORAGE_BACKEND", "postgres")
+    with pytest.raises(ValueError):
+        config_storage.create_storage()
+
+
+@pytest.fixture
+def sqlite_storage(tmp_path):
+    from storage.sqlite import SQLiteStorage
+    return SQLiteStorage(str(tmp_path / "smoke.db"))
+
+
+def test_sqlite_uses_wal(sqlite_storage):
+    assert sqlite_storage.db.one("PRAGMA journal_mode")[0] == "wal"
+
+
+def test_sqlite_smoke(sqlite_storage):
+    now = datetime.now()
+    user = sqlite_storage.users.create({
+        "username": "smoke", "email": "smoke@example.com", "hashed_password": "x",
+        "created_at": now, "updated_at": now, "streak": 0, "badges": [], "settings": {}
+    })
+    user_id = str(user["_id"])
+    assert sqlite_storage.users.get_by_email("smoke@example.com")["_id"] == user["_id"]
+
+    moods = [
+        {"user_id": user_id, "client_id": f"m{i}", "mood_score": 5 + i, "energy_level": 5,
+         "focus_level": 5, "notes": None, "created_at": now - timedelta(days=i)}
+        for i in range(3)
+    ]
+    inserted, duplicates = sqlite_storage.moods.insert_batch(user_id, moods)
+    assert len(inserted) == 3 and not duplicates
+    inserted, duplicates = sqlite_storage.moods.insert_batch(user_id, moods[:1])
+    assert not inserted and duplicates == ["m0"]
+    summary = sqlite_storage.moods.summary(user_id, now - timedelta(days=7), recent=2)
+    assert summary["count"] == 3 and summary["mood"] == 6 and len(summary["recent"]) == 2
+
+    journal = sqlite_storage.journals.insert({
+        "user_id": user_id, "content": "A long walk by the river", "mood": None, "tags": ["outdoors"],
+        "sentiment": None, "emotion": None, "created_at": now, "updated_at": now
+    })
+    assert list(sqlite_storage.journals.keyword_search(user_id, "river", 10)) == [journal["_id"]]
+    assert sqlite_storage.journals.keyword_search(user_id, "river", 10, ["indoors"]) == {}
+
+    sqlite_storage.chats.append(user_id, [
+        {"role": "user", "content": "hi", "timestamp": now},
+        {"role": "assistant", "content": "hello", "timestamp": now + timedelta(seconds=1)}
+    ])
+    assert [m["role"] for m in sqlite_storage.chats.get_messages(user_id)] == ["user", "assistant"]
+
+    habit = sqlite_storage.habits.create({
+        "user_id": user_id, "name": "Meditate", "description": None, "target_per_week": 5,
+        "days": {}, "created_at": now, "updated_at": now
+    })
+    day = date(2024, 12, 31)
+    habit = sqlite_storage.habits.set_day(user_id, str(habit["_id"]), day, True)
+    assert is_done(habit, day)
+    habit = sqlite_storage.habits.set_day(user_id, str(habit["_id"]), day, False)
+    assert not is_done(habit, day)
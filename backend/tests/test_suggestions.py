@@ -0,0 +1,60 @@
+import json
+import threading
+from datetime import datetime, timedelta
+
+from config.storage import storage
+from utils.suggestions import SUGGESTION_CATALOG, get_suggestions, record_exposure, record_mood_checkins
+
+
+def _stats(user_id, emotion):
+    row = storage.db.one("SELECT stats FROM suggestion_rankings WHERE user_id = ?", (user_id,))
+    return json.loads(row["stats"]).get(emotion, {}) if row else {}
+
+
+def test_new_user_gets_catalog_order(user_id):
+    ranked = get_suggestions(user_id, "sadness")
+    assert [sid for sid, _ in ranked] == list(SUGGESTION_CATALOG["sadness"])[:3]
+    assert get_suggestions(user_id, "neutral") == []
+
+
+def test_improvement_promotes_a_suggestion(user_id):
+    record_mood_checkins(user_id, [(datetime.now(), 3)])
+    record_exposure(user_id, "sadness", ["pleasant-activity"])
+    record_mood_checkins(user_id, [(datetime.now(), 8)])
+
+    assert get_suggestions(user_id, "sadness", limit=1)[0][0] == "pleasant-activity"
+    assert _stats(user_id, "sadness")["pleasant-activity"] == {"shown": 1, "improved": 1}
+
+
+def test_first_check_in_only_sets_baseline(user_id):
+    record_exposure(user_id, "anger", ["deep-breathing"])
+    record_mood_checkins(user_id, [(datetime.now(), 9)])
+    assert _stats(user_id, "anger") == {}
+
+
+def test_backdated_check_ins_leave_later_exposures_pending(user_id):
+    now = datetime.now()
+    record_mood_checkins(user_id, [(now - timedelta(days=3), 4)])
+    record_exposure(user_id, "fear", ["box-breathing"])
+    record_mood_checkins(user_id, [(now - timedelta(days=2), 9), (now - timedelta(days=1), 9)])
+    assert _stats(user_id, "fear") == {}
+
+    record_mood_checkins(user_id, [(datetime.now(), 2)])
+    assert _stats(user_id, "fear")["box-breathing"] == {"shown": 1, "improved": 0}
+
+
+def test_concurrent_check_ins_credit_each_exposure_once(user_id):
+    record_mood_checkins(user_id, [(datetime.now(), 1)])
+    for _ in range(10):
+        record_exposure(user_id, "sadness", ["walk-outside"])
+
+    threads = [
+        threading.Thread(target=record_mood_checkins, args=(user_id, [(datetime.now(), 5)]))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert _stats(user_id, "sadness")["walk-outside"]["shown"] == 10
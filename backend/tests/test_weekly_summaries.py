@@ -0,0 +1,90 @@
+from datetime import datetime
+
+import pytest
+
+from config.ai_config import FALLBACK_RESPONSE
+from config.storage import storage
+from jobs import weekly_summaries
+from utils.weekly_summary import week_bounds
+
+
+class FakeLLM:
+    """Summarizes every prompt except those naming a failing journal entry."""
+
+    def __init__(self, failures):
+        self.failures = failures  # content -> failures left; -1 fails forever
+        self.prompts = []
+
+    def __call__(self, prompt):
+        self.prompts.append(prompt)
+        for content, left in self.failures.items():
+            if content in prompt and left:
+                self.failures[content] = left - 1
+                return FALLBACK_RESPONSE
+        return "A steady week."
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    fake = FakeLLM({})
+    monkeypatch.setattr(weekly_summaries, "get_llm", lambda: fake)
+    return fake
+
+
+def _journal(user_id, week, content):
+    monday, _ = week_bounds(week)
+    at = datetime(monday.year, monday.month, monday.day, 9)
+    storage.journals.insert({
+        "user_id": user_id, "content": content, "mood": None, "tags": [], "created_at": at, "updated_at": at
+    })
+
+
+def _users(count):
+    now = datetime.now()
+    users = []
+    for i in range(count):
+        name = f"summary{i}-{now.timestamp()}"
+        users.append(str(storage.users.create({
+            "username": name, "email": f"{name}@example.com", "hashed_password": "x",
+            "created_at": now, "updated_at": now, "streak": 0, "badges": [], "settings": {}
+        })["_id"]))
+    return users
+
+
+def test_rerun_resumes_after_failures(llm):
+    week = "2001-W10"
+    steady, flaky = _users(2)
+    _journal(steady, week, "steady entry")
+    _journal(flaky, week, "flaky entry")
+    llm.failures["flaky entry"] = 1
+
+    stats = weekly_summaries.run(week, concurrency=2, max_attempts=3)
+    assert (stats["active_users"], stats["skipped"], stats["succeeded"], stats["failed"]) == (2, 0, 1, 1)
+    assert storage.summaries.get(steady, week)["summary"] == "A steady week."
+    assert storage.summaries.get(flaky, week) is None
+
+    llm.prompts.clear()
+    stats = weekly_summaries.run(week, concurrency=2, max_attempts=3)
+    assert (stats["skipped"], stats["succeeded"], stats["failed"]) == (1, 1, 0)
+    # Only the failed user was sent to the LLM again
+    assert len(llm.prompts) == 1 and "flaky entry" in llm.prompts[0]
+    assert storage.summaries.get(flaky, week)["journal_entries"] == 1
+
+
+def test_users_stop_being_retried_at_max_attempts(llm):
+    week = "2001-W11"
+    (broken,) = _users(1)
+    _journal(broken, week, "broken entry")
+    llm.failures["broken entry"] = -1
+
+    for _ in range(2):
+        assert weekly_summaries.run(week, concurrency=1, max_attempts=2)["failed"] == 1
+    assert storage.summaries.settled_users(week, 2) == {broken}
+
+    llm.prompts.clear()
+    stats = weekly_summaries.run(week, concurrency=1, max_attempts=2)
+    assert (stats["skipped"], stats["failed"]) == (1, 0)
+    assert llm.prompts == []
+
+    # Raising the limit lets the user be tried again
+    assert weekly_summaries.run(week, concurrency=1, max_attempts=3)["failed"] == 1
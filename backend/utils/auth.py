@@ -7,7 +7,7 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from dotenv import load_dotenv
 from models.user import TokenData
-from config.database import users_collection
+from config.storage import storage
 
 # Load environment variables
 load_dotenv()
@@ -52,7 +52,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     except JWTError:
         raise credentials_exception
     
-    user = users_collection.find_one({"email": token_data.email})
+    user = storage.users.get_by_email(token_data.email)
     if user is None:
         raise credentials_exception
     
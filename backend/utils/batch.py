@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta
+
+from config.storage import storage
+
+STREAK_BADGES = {7: "7-day-streak", 30: "30-day-streak"}
+
+
+def client_timestamp(value: datetime, now: datetime) -> datetime:
+    """Normalize a device-supplied timestamp to naive local time, capped at now."""
+    if value is None:
+        return now
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return min(value, now)
+
+
+def compute_streak(user_id: str, now: datetime = None) -> int:
+    """Count consecutive check-in days ending today (or yesterday)."""
+    now = now or datetime.now()
+    streak = 0
+    expected = now.date()
+    for day in storage.moods.checkin_days(user_id, now):
+        day_date = datetime.strptime(day, "%Y-%m-%d").date()
+        if streak == 0 and day_date == expected - timedelta(days=1):
+            # No check-in yet today, but the streak is still alive from yesterday
+            expected = day_date
+        if day_date != expected:
+            break
+        streak += 1
+        expected = day_date - timedelta(days=1)
+    return streak
+
+
+def update_streak_and_badges(user_id: str, streak: int):
+    """Store a recomputed streak and award any badges it unlocks in one write."""
+    earned = [badge for days, badge in STREAK_BADGES.items() if streak >= days]
+    storage.users.set_streak(user_id, streak, earned)
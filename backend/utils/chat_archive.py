@@ -0,0 +1,181 @@
+# Cold storage for old chat messages. Messages older than the hot window are
+# moved out of the live session document into compressed blocks of JSON, one
+# archive document per block, and read back only when a client scrolls past
+# the live history. Blocks written before the JSON format hold BSON and are
+# still readable when pymongo is installed.
+import json
+import os
+import time
+import zlib
+from datetime import datetime, timedelta
+
+from dotenv import load_dotenv
+
+from config.storage import storage
+from utils.versions import bump as bump_version
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except Exception:
+    zstandard = None  # type: ignore
+    HAS_ZSTD = False
+
+load_dotenv()
+
+CHAT_HOT_DAYS = int(os.getenv("CHAT_HOT_DAYS", "30"))
+ARCHIVE_BLOCK_SIZE = int(os.getenv("CHAT_ARCHIVE_BLOCK_SIZE", "200"))
+
+# Messages read back from each compacted user's archive to measure read latency
+READ_SAMPLE = 50
+
+
+def compress(data: bytes):
+    if HAS_ZSTD:
+        return "zstd", zstandard.ZstdCompressor(level=10).compress(data)
+    return "gzip", zlib.compress(data, 9)
+
+
+def decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+def _json_hook(value):
+    if len(value) == 1 and "$date" in value:
+        return datetime.fromisoformat(value["$date"])
+    return value
+
+
+def encode_block(user_id: str, messages: list) -> dict:
+    raw = json.dumps({"messages": messages}, default=_json_default, separators=(",", ":")).encode("utf-8")
+    codec, data = compress(raw)
+    return {
+        "user_id": user_id,
+        "start": messages[0]["timestamp"],
+        "end": messages[-1]["timestamp"],
+        "count": len(messages),
+        # "json+zstd"; a bare compressor name marks a legacy BSON block
+        "codec": f"json+{codec}",
+        "data": data,
+        "raw_bytes": len(raw),
+        "stored_bytes": len(data),
+        "created_at": datetime.now()
+    }
+
+
+def decode_block(block: dict) -> list:
+    payload, _, codec = block["codec"].rpartition("+")
+    raw = decompress(codec, bytes(block["data"]))
+    if payload == "json":
+        return json.loads(raw, object_hook=_json_hook)["messages"]
+    # Only Mongo deployments have legacy blocks, and they already need pymongo
+    import bson
+    return bson.decode(raw)["messages"]
+
+
+def compact_user(user_id: str, cutoff: datetime, block_size: int = ARCHIVE_BLOCK_SIZE) -> dict:
+    """Archive one user's messages older than cutoff and drop them from the live session."""
+    metrics = {"messages": 0, "blocks": 0, "raw_bytes": 0, "stored_bytes": 0}
+    cold = [m for m in storage.chats.get_messages(user_id) if m["timestamp"] < cutoff]
+    if not cold:
+        return metrics
+
+    blocks = [encode_block(user_id, cold[i:i + block_size]) for i in range(0, len(cold), block_size)]
+    storage.chats.archive(user_id, blocks, cutoff)
+    bump_version(user_id, "chat")
+
+    metrics["messages"] = len(cold)
+    metrics["blocks"] = len(blocks)
+    metrics["raw_bytes"] = sum(b["raw_bytes"] for b in blocks)
+    metrics["stored_bytes"] = sum(b["stored_bytes"] for b in blocks)
+    return metrics
+
+
+def compact_all(hot_days: int = CHAT_HOT_DAYS, block_size: int = ARCHIVE_BLOCK_SIZE) -> dict:
+    """Compact every session that still holds messages older than the hot window."""
+    cutoff = datetime.now() - timedelta(days=hot_days)
+    totals = {"users": 0, "messages": 0, "blocks": 0, "raw_bytes": 0, "stored_bytes": 0}
+    read_ms = []
+
+    for user_id in storage.chats.users_with_messages_before(cutoff):
+        metrics = compact_user(user_id, cutoff, block_size)
+        if metrics["messages"]:
+            totals["users"] += 1
+            for key, value in metrics.items():
+                totals[key] += value
+            # Read back the newest archived page, as a history request would
+            started = time.perf_counter()
+            read_before(user_id, None, READ_SAMPLE)
+            read_ms.append((time.perf_counter() - started) * 1000)
+
+    # Archived bytes no longer held in live documents, less what the blocks take
+    totals["bytes_reclaimed"] = totals["raw_bytes"] - totals["stored_bytes"]
+    totals["read_ms_avg"] = sum(read_ms) / len(read_ms) if read_ms else 0.0
+    totals["read_ms_max"] = max(read_ms, default=0.0)
+    return totals
+
+
+def make_cursor(position) -> str:
+    """Encode a (timestamp, skip) history position as an opaque cursor."""
+    timestamp, skip = position
+    return f"{timestamp.isoformat()}~{skip}"
+
+
+def parse_cursor(cursor: str):
+    """Decode a cursor from make_cursor; raises ValueError when malformed."""
+    timestamp, _, skip = cursor.rpartition("~")
+    position = (datetime.fromisoformat(timestamp), int(skip))
+    if position[0].tzinfo is not None or position[1] < 0:
+        raise ValueError(cursor)
+    return position
+
+
+def take_before(messages: list, position, limit: int) -> list:
+    """Return the last limit messages ordered before position, oldest first.
+
+    A position is (timestamp, skip): messages older than timestamp, plus
+    those at exactly timestamp except the newest skip of them. Messages that
+    share a timestamp (a user turn and its reply) keep their stored order, so
+    pages never drop or repeat them. A position of None means the end.
+    """
+    if position is not None:
+        timestamp, skip = position
+        same = [m for m in messages if m["timestamp"] == timestamp]
+        messages = [m for m in messages if m["timestamp"] < timestamp] + same[:max(len(same) - skip, 0)]
+    return messages[-limit:]
+
+
+def position_before(page: list, position):
+    """The position just before the oldest message of page."""
+    if not page:
+        return position
+    oldest = page[0]["timestamp"]
+    skip = sum(1 for m in page if m["timestamp"] == oldest)
+    if position is not None and position[0] == oldest:
+        skip += position[1]
+    return oldest, skip
+
+
+def read_before(user_id: str, position, limit: int) -> list:
+    """Return up to limit archived messages before position, oldest first."""
+    messages = []
+    until = position[0] if position else None
+    for block in storage.chats.archive_blocks(user_id, until, newest_first=True):
+        messages = decode_block(block) + messages
+        if len(take_before(messages, position, limit)) >= limit:
+            break
+    return take_before(messages, position, limit)
+
+
+def iter_archived(user_id: str):
+    """Yield every archived message for a user, oldest first, one block at a time."""
+    for block in storage.chats.archive_blocks(user_id):
+        yield from decode_block(block)
@@ -0,0 +1,114 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+
+from config.storage import storage
+from utils.chat_archive import iter_archived
+
+# Flush encoded output once this many bytes are buffered
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+EXPORT_FIELDS = {
+    "mood": ["mood_score", "energy_level", "focus_level", "notes"],
+    "journal": ["content", "mood", "tags"],
+    "chat": ["role", "content"],
+}
+
+CSV_COLUMNS = ["type", "id", "created_at"] + list(dict.fromkeys(
+    field for fields in EXPORT_FIELDS.values() for field in fields
+))
+
+
+def _records(resource: str, docs):
+    # The stores fetch in batches, so only one batch is held here at a time
+    for doc in docs:
+        record = {"id": str(doc["_id"])}
+        record.update((field, doc.get(field)) for field in EXPORT_FIELDS[resource])
+        record["created_at"] = doc["created_at"]
+        yield record
+
+
+def _mood_records(user_id: str):
+    return _records("mood", storage.moods.iter_all(user_id))
+
+
+def _journal_records(user_id: str):
+    return _records("journal", storage.journals.iter_all(user_id))
+
+
+def _chat_records(user_id: str):
+    # Archived messages are older than anything still in the live session
+    for message in iter_archived(user_id):
+        yield {"role": message["role"], "content": message["content"], "created_at": message["timestamp"]}
+
+    # The live window is bounded by compaction
+    for message in storage.chats.get_messages(user_id):
+        yield {"role": message["role"], "content": message["content"], "created_at": message["timestamp"]}
+
+
+EXPORT_SOURCES = {
+    "mood": _mood_records,
+    "journal": _journal_records,
+    "chat": _chat_records,
+}
+
+
+def iter_records(user_id: str, resources):
+    """Yield (resource, record) pairs for each requested resource in turn."""
+    for resource in resources:
+        for record in EXPORT_SOURCES[resource](user_id):
+            yield resource, record
+
+
+def _plain(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def encode_ndjson(records):
+    for resource, record in records:
+        line = {"type": resource}
+        line.update((key, _plain(value)) for key, value in record.items())
+        yield json.dumps(line, ensure_ascii=False) + "\n"
+
+
+def encode_csv(records):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    for resource, record in records:
+        row = {"type": resource}
+        for key, value in record.items():
+            if isinstance(value, list):
+                value = ";".join(str(item) for item in value)
+            row[key] = _plain(value)
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+
+
+def chunked(lines, compress: bool = False):
+    """Group encoded lines into bytes chunks, optionally gzip-compressing them."""
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if compress else None
+    pending = []
+    size = 0
+    for line in lines:
+        data = line.encode("utf-8")
+        pending.append(data)
+        size += len(data)
+        if size >= EXPORT_CHUNK_SIZE:
+            chunk = b"".join(pending)
+            pending, size = [], 0
+            if compressor:
+                chunk = compressor.compress(chunk)
+            if chunk:
+                yield chunk
+    chunk = b"".join(pending)
+    if compressor:
+        chunk = compressor.compress(chunk) + compressor.flush()
+    if chunk:
+        yield chunk
@@ -0,0 +1,100 @@
+# Habit history is stored as one bitset per calendar year: bit N of a year is
+# set when the habit was done on day-of-year N + 1. Each year is kept as six
+# signed 64-bit words so Mongo can flip single days atomically with $bit.
+# Words are plain ints here; the Mongo store wraps them as Int64.
+import calendar
+from datetime import date, timedelta
+
+WORD_BITS = 64
+WORDS_PER_YEAR = 6  # 384 bits covers leap years
+WORD_MASK = (1 << WORD_BITS) - 1
+
+
+def days_in_year(year: int) -> int:
+    return 366 if calendar.isleap(year) else 365
+
+
+def empty_year():
+    return [0] * WORDS_PER_YEAR
+
+
+def day_update(day: date):
+    """Return the (field path, mask) pair that addresses one day's bit."""
+    index = day.timetuple().tm_yday - 1
+    word, bit = divmod(index, WORD_BITS)
+    mask = 1 << bit
+    if mask >= 1 << (WORD_BITS - 1):
+        # Store as two's complement so it fits a signed int64
+        mask -= 1 << WORD_BITS
+    return f"days.{day.year}.{word}", mask
+
+
+def year_bits(habit: dict, year: int) -> int:
+    words = habit.get("days", {}).get(str(year)) or []
+    return sum((int(w) & WORD_MASK) << (WORD_BITS * i) for i, w in enumerate(words))
+
+
+def _range_mask(start: int, end: int) -> int:
+    # Bits start..end inclusive
+    return ((1 << (end - start + 1)) - 1) << start
+
+
+def is_done(habit: dict, day: date) -> bool:
+    return bool(year_bits(habit, day.year) >> (day.timetuple().tm_yday - 1) & 1)
+
+
+def count_between(habit: dict, start: date, end: date) -> int:
+    """Number of completed days in [start, end]."""
+    total = 0
+    for year in range(start.year, end.year + 1):
+        first = start.timetuple().tm_yday - 1 if year == start.year else 0
+        last = end.timetuple().tm_yday - 1 if year == end.year else days_in_year(year) - 1
+        total += (year_bits(habit, year) & _range_mask(first, last)).bit_count()
+    return total
+
+
+def current_streak(habit: dict, today: date) -> int:
+    """Consecutive completed days ending today, or yesterday if today is still open."""
+    if not is_done(habit, today):
+        today -= timedelta(days=1)
+    first_year = min((int(y) for y in habit.get("days", {})), default=today.year)
+
+    streak = 0
+    year, pos = today.year, today.timetuple().tm_yday - 1
+    while year >= first_year:
+        window = _range_mask(0, pos)
+        missing = ~year_bits(habit, year) & window
+        if missing:
+            # Highest unset bit at or below pos ends the run
+            return streak + pos - (missing.bit_length() - 1)
+        streak += pos + 1
+        year -= 1
+        pos = days_in_year(year) - 1
+    return streak
+
+
+def longest_streak(habit: dict) -> int:
+    years = sorted(int(y) for y in habit.get("days", {}))
+    if not years:
+        return 0
+    # Concatenate all years into one bitset, earliest day in the lowest bit
+    bits, offset = 0, 0
+    for year in range(years[0], years[-1] + 1):
+        bits |= year_bits(habit, year) << offset
+        offset += days_in_year(year)
+    # Each AND with a shifted copy shortens every run of ones by one
+    longest = 0
+    while bits:
+        bits &= bits >> 1
+        longest += 1
+    return longest
+
+
+def week_start(today: date) -> date:
+    return today - timedelta(days=today.weekday())
+
+
+def heatmap(habit: dict, year: int) -> str:
+    size = days_in_year(year)
+    bits = year_bits(habit, year) & _range_mask(0, size - 1)
+    return format(bits, f"0{size}b")[::-1]
@@ -0,0 +1,97 @@
+# Client for the shared model server (inference_server.py). Workers talk to it
+# over a Unix domain socket so the models are loaded once per host instead of
+# once per uvicorn worker. Callers fall back to in-process models when the
+# server is not configured or not reachable.
+import json
+import os
+import socket
+import struct
+import threading
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+INFERENCE_SOCKET = os.getenv("INFERENCE_SOCKET")
+INFERENCE_TIMEOUT = float(os.getenv("INFERENCE_TIMEOUT", "30"))
+
+# After a failed connection, skip the server for this long before retrying
+RETRY_AFTER = 5.0
+
+HEADER = struct.Struct("!I")
+
+
+class InferenceUnavailable(Exception):
+    pass
+
+
+def send_frame(sock, payload: dict):
+    data = json.dumps(payload).encode("utf-8")
+    sock.sendall(HEADER.pack(len(data)) + data)
+
+
+def recv_frame(sock) -> dict:
+    (length,) = HEADER.unpack(_recv_exactly(sock, HEADER.size))
+    return json.loads(_recv_exactly(sock, length))
+
+
+def _recv_exactly(sock, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            raise ConnectionError("inference server closed the connection")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+class InferenceClient:
+    """Blocking client keeping one connection per calling thread."""
+
+    def __init__(self, path: str, timeout: float = INFERENCE_TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._down_until = 0.0
+
+    def _connection(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.path)
+            self._local.sock = sock
+        return sock
+
+    def _reset(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+        self._local.sock = None
+
+    def request(self, op: str, texts: list):
+        if time.monotonic() < self._down_until:
+            raise InferenceUnavailable("inference server marked down")
+        try:
+            sock = self._connection()
+            send_frame(sock, {"op": op, "texts": texts})
+            response = recv_frame(sock)
+        except (OSError, ConnectionError, ValueError) as exc:
+            self._reset()
+            self._down_until = time.monotonic() + RETRY_AFTER
+            raise InferenceUnavailable(str(exc)) from exc
+        if "error" in response:
+            raise InferenceUnavailable(response["error"])
+        return response["results"]
+
+
+_client = InferenceClient(INFERENCE_SOCKET) if INFERENCE_SOCKET else None
+
+
+def get_client():
+    """Return the shared client, or None when no model server is configured."""
+    return _client
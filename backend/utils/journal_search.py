@@ -0,0 +1,150 @@
+# Hybrid journal search: the storage backend's full-text index for keywords
+# plus cosine similarity over per-entry MiniLM embeddings. Embeddings are kept
+# apart from the entries and each user's vectors are cached in-process as one
+# normalized matrix.
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from config.ai_config import get_embeddings
+from config.storage import storage
+
+KEYWORD_WEIGHT = 0.5
+SEMANTIC_WEIGHT = 0.5
+
+# Candidates taken from each side before merging; bounds work per query
+CANDIDATE_POOL = 200
+
+# Cosine similarity below this does not count as a semantic match
+MIN_SIMILARITY = 0.2
+
+CACHE_MAX_USERS = 128
+CACHE_TTL = 300
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def index_entries(user_id: str, entries: list):
+    """Embed journal entries and store their vectors; entries need _id and content."""
+    embeddings = get_embeddings()
+    if embeddings is None or not entries:
+        return
+    vectors = _normalize(embeddings.embed_documents([entry["content"] for entry in entries]))
+    storage.journals.save_embeddings(user_id, [
+        (str(entry["_id"]), vector.tobytes())
+        for entry, vector in zip(entries, vectors)
+    ])
+    invalidate(user_id)
+
+
+def invalidate(user_id: str):
+    with _cache_lock:
+        _cache.pop(user_id, None)
+
+
+def _user_matrix(user_id: str):
+    now = time.monotonic()
+    with _cache_lock:
+        cached = _cache.get(user_id)
+        if cached and now - cached[0] < CACHE_TTL:
+            _cache.move_to_end(user_id)
+            return cached[1], cached[2]
+
+    ids, vectors = [], []
+    for journal_id, vector in storage.journals.load_embeddings(user_id):
+        ids.append(journal_id)
+        vectors.append(np.frombuffer(vector, dtype=np.float32))
+    matrix = np.vstack(vectors) if vectors else np.zeros((0, 0), dtype=np.float32)
+
+    with _cache_lock:
+        _cache[user_id] = (now, ids, matrix)
+        _cache.move_to_end(user_id)
+        while len(_cache) > CACHE_MAX_USERS:
+            _cache.popitem(last=False)
+    return ids, matrix
+
+
+def _keyword_scores(user_id: str, query: str, tags: list = None) -> dict:
+    scores = storage.journals.keyword_search(user_id, query, CANDIDATE_POOL, tags)
+    if not scores:
+        return {}
+    # Text scores are unbounded; scale into [0, 1] against the best match
+    best = max(scores.values())
+    return {journal_id: score / best for journal_id, score in scores.items()}
+
+
+def _semantic_scores(user_id: str, query: str, tags: list = None) -> dict:
+    embeddings = get_embeddings()
+    if embeddings is None:
+        return {}
+    ids, matrix = _user_matrix(user_id)
+    if not ids:
+        return {}
+    # Restrict candidates to tagged entries before taking the top of the pool
+    rows = np.arange(len(ids))
+    if tags:
+        tagged = storage.journals.tagged_ids(user_id, tags)
+        rows = np.flatnonzero([journal_id in tagged for journal_id in ids])
+        if not len(rows):
+            return {}
+        matrix = matrix[rows]
+    similarities = matrix @ _normalize(embeddings.embed_query(query))
+    top = np.argsort(-similarities)[:CANDIDATE_POOL]
+    return {
+        ids[rows[i]]: float(similarities[i])
+        for i in top
+        if similarities[i] >= MIN_SIMILARITY
+    }
+
+
+def search(user_id: str, query: str, tags: list = None):
+    """Return ([(entry, score, keyword_score, semantic_score)] sorted by merged
+    score, whether either side hit CANDIDATE_POOL and may have more matches)."""
+    keyword = _keyword_scores(user_id, query, tags)
+    semantic = _semantic_scores(user_id, query, tags)
+    truncated = len(keyword) >= CANDIDATE_POOL or len(semantic) >= CANDIDATE_POOL
+
+    merged = {
+        journal_id: KEYWORD_WEIGHT * keyword.get(journal_id, 0.0)
+        + SEMANTIC_WEIGHT * semantic.get(journal_id, 0.0)
+        for journal_id in set(keyword) | set(semantic)
+    }
+    if not merged:
+        return [], False
+
+    # Fetch only the candidates; the tag filter drops entries retagged meanwhile
+    entries = storage.journals.get_many(user_id, list(merged), tags)
+
+    results = []
+    for entry in entries:
+        journal_id = str(entry["_id"])
+        results.append((entry, merged[journal_id], keyword.get(journal_id, 0.0), semantic.get(journal_id, 0.0)))
+    results.sort(key=lambda result: (-result[1], -result[0]["created_at"].timestamp()))
+    return results, truncated
+
+
+def backfill_embeddings(batch_size: int = 256) -> int:
+    """Embed journal entries that have no stored vector yet."""
+    pending = {}
+    count = 0
+    for entry in storage.journals.missing_embeddings(batch_size):
+        batch = pending.setdefault(entry["user_id"], [])
+        batch.append(entry)
+        if len(batch) == batch_size:
+            index_entries(entry["user_id"], batch)
+            count += len(batch)
+            pending[entry["user_id"]] = []
+    for user_id, batch in pending.items():
+        if batch:
+            index_entries(user_id, batch)
+            count += len(batch)
+    return count
@@ -0,0 +1,164 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime, date, timedelta
+
+import numpy as np
+
+from config.storage import storage
+
+METRICS = ("mood", "energy", "focus")
+
+# Per-process cache of users' series, keyed on the user's mood version stamp;
+# every write bumps the stamp on the user document, so each worker sees new
+# check-ins on its next request without any cross-worker invalidation
+CACHE_MAX_USERS = 256
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+DAY = np.timedelta64(1, "D")
+
+
+class MoodSeries:
+    """A user's check-ins as columnar arrays sorted by time."""
+
+    def __init__(self, timestamps, mood, energy, focus):
+        self.timestamps = timestamps  # datetime64[s]
+        self.values = {"mood": mood, "energy": energy, "focus": focus}
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    @classmethod
+    def load(cls, user_id: str) -> "MoodSeries":
+        timestamps, mood, energy, focus = [], [], [], []
+        for doc in storage.moods.iter_all(user_id):
+            timestamps.append(doc["created_at"])
+            mood.append(doc["mood_score"])
+            energy.append(doc["energy_level"])
+            focus.append(doc["focus_level"])
+
+        return cls(
+            np.array(timestamps, dtype="datetime64[s]"),
+            np.array(mood, dtype=np.float64),
+            np.array(energy, dtype=np.float64),
+            np.array(focus, dtype=np.float64),
+        )
+
+    def window(self, start: datetime, end: datetime) -> "MoodSeries":
+        bounds = np.array([start, end], dtype="datetime64[s]")
+        lo, hi = np.searchsorted(self.timestamps, bounds, side="left")
+        return MoodSeries(
+            self.timestamps[lo:hi],
+            *(self.values[metric][lo:hi] for metric in METRICS)
+        )
+
+
+def get_series(user: dict) -> MoodSeries:
+    """Return the user's series, reloading it when their mood stamp has moved."""
+    user_id = str(user["_id"])
+    version = user.get("versions", {}).get("mood", {}).get("v", 0)
+    with _cache_lock:
+        cached = _cache.get(user_id)
+        if cached and cached[0] == version:
+            _cache.move_to_end(user_id)
+            return cached[1]
+
+    series = MoodSeries.load(user_id)
+    with _cache_lock:
+        _cache[user_id] = (version, series)
+        _cache.move_to_end(user_id)
+        while len(_cache) > CACHE_MAX_USERS:
+            _cache.popitem(last=False)
+    return series
+
+
+def _to_list(values):
+    # NaN marks buckets without check-ins
+    return [None if np.isnan(v) else round(float(v), 2) for v in values]
+
+
+def _bucket_means(series: MoodSeries, index, size: int):
+    counts = np.bincount(index, minlength=size)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = {
+            metric: np.bincount(index, weights=series.values[metric], minlength=size) / counts
+            for metric in METRICS
+        }
+    return counts, means
+
+
+def _rolling(values, window: int):
+    # Mean of the non-empty days in each trailing window
+    present = ~np.isnan(values)
+    filled = np.where(present, values, 0.0)
+    kernel = np.ones(window)
+    sums = np.convolve(filled, kernel)[:len(values)]
+    counts = np.convolve(present.astype(np.float64), kernel)[:len(values)]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return sums / counts
+
+
+def analyze(series: MoodSeries, start: date, end: date, window: int) -> dict:
+    """Rollups, rolling averages, time-of-week/day profiles and correlations."""
+    start_day = np.datetime64(start, "D")
+    days = int((np.datetime64(end, "D") - start_day) / DAY) + 1
+    data = series.window(
+        datetime(start.year, start.month, start.day),
+        datetime(end.year, end.month, end.day) + timedelta(days=1)
+    )
+
+    day_index = ((data.timestamps.astype("datetime64[D]") - start_day) / DAY).astype(np.int64)
+    day_counts, daily = _bucket_means(data, day_index, days)
+
+    # 1970-01-01 was a Thursday; shift so Monday is 0
+    weekday_index = (data.timestamps.astype("datetime64[D]").astype(np.int64) + 3) % 7
+    weekday_counts, weekday = _bucket_means(data, weekday_index, 7)
+
+    hour_index = (data.timestamps.astype("datetime64[h]").astype(np.int64)) % 24
+    hour_counts, hourly = _bucket_means(data, hour_index, 24)
+
+    summary = {}
+    for metric in METRICS:
+        values = data.values[metric]
+        summary[metric] = {
+            "mean": round(float(values.mean()), 2) if len(values) else None,
+            "min": float(values.min()) if len(values) else None,
+            "max": float(values.max()) if len(values) else None,
+            "std": round(float(values.std()), 2) if len(values) else None,
+        }
+
+    correlations = {}
+    if len(data) > 1:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            matrix = np.corrcoef(np.vstack([data.values[metric] for metric in METRICS]))
+        for i, a in enumerate(METRICS):
+            for j in range(i + 1, len(METRICS)):
+                value = matrix[i, j]
+                correlations[f"{a}_{METRICS[j]}"] = None if np.isnan(value) else round(float(value), 3)
+
+    dates = np.arange(start_day, start_day + days).astype(str).tolist()
+    return {
+        "start": start,
+        "end": end,
+        "count": len(data),
+        "summary": summary,
+        "daily": {
+            "dates": dates,
+            "counts": day_counts.tolist(),
+            **{metric: _to_list(daily[metric]) for metric in METRICS},
+        },
+        "rolling": {
+            "window": window,
+            **{metric: _to_list(_rolling(daily[metric], window)) for metric in METRICS},
+        },
+        "weekday_profile": {
+            "counts": weekday_counts.tolist(),
+            **{metric: _to_list(weekday[metric]) for metric in METRICS},
+        },
+        "hour_profile": {
+            "counts": hour_counts.tolist(),
+            **{metric: _to_list(hourly[metric]) for metric in METRICS},
+        },
+        "correlations": correlations,
+    }
@@ -0,0 +1,40 @@
+import gzip
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+# orjson serializes datetimes natively and is several times faster than json
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse
+    HAS_ORJSON = True
+except Exception:
+    ORJSONResponse = None  # type: ignore
+    HAS_ORJSON = False
+
+
+def fast_json_response(content, status_code: int = 200, headers: dict = None):
+    """Encode already-shaped rows without running them through response_model.
+
+    Callers are responsible for building rows that match the declared response
+    model; this skips per-row Pydantic validation on hot list endpoints.
+    """
+    if HAS_ORJSON:
+        return ORJSONResponse(content=content, status_code=status_code, headers=headers)
+    return JSONResponse(content=jsonable_encoder(content), status_code=status_code, headers=headers)
+
+
+# Bodies smaller than this are not worth the gzip overhead
+COMPRESS_MIN_SIZE = 1024
+
+
+def compress_response(request: Request, response: Response, minimum_size: int = COMPRESS_MIN_SIZE):
+    """Gzip a fully rendered response body when the client accepts it."""
+    response.headers["Vary"] = "Accept-Encoding"
+    if len(response.body) < minimum_size or "gzip" not in request.headers.get("accept-encoding", ""):
+        return response
+    response.body = gzip.compress(response.body, compresslevel=6)
+    response.headers["Content-Encoding"] = "gzip"
+    response.headers["Content-Length"] = str(len(response.body))
+    return response
@@ -1,4 +1,12 @@
-# Hybrid sentiment/emotion: uses transformers if available, otherwise a lightweight heuristic fallback
+# Hybrid sentiment/emotion: uses the shared model server when configured, then
+# in-process transformers if available, otherwise a lightweight heuristic fallback
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from utils.inference_client import get_client, InferenceUnavailable
+
 try:
     from transformers import pipeline
     import torch
@@ -8,19 +16,30 @@ except Exception:
     torch = None  # type: ignore
     HAS_TRANSFORMERS = False
 
-# Setup pipelines if available
-if HAS_TRANSFORMERS:
-    device = 0 if torch.cuda.is_available() else -1
-    sentiment_analyzer = pipeline(
-        "text-classification",
-        model="distilbert-base-uncased-finetuned-sst-2-english",
-        device=device,
-    )
-    emotion_detector = pipeline(
-        "text-classification",
-        model="bhadresh-savani/distilbert-base-uncased-emotion",
-        device=device,
-    )
+SENTIMENT_MODEL = "distilbert-base-uncased-finetuned-sst-2-english"
+EMOTION_MODEL = "bhadresh-savani/distilbert-base-uncased-emotion"
+
+# Pipelines are loaded on first in-process use so workers backed by the
+# model server never hold their own copies
+sentiment_analyzer = None
+emotion_detector = None
+_pipelines_lock = threading.Lock()
+
+
+def load_pipelines():
+    global sentiment_analyzer, emotion_detector
+    if not HAS_TRANSFORMERS or sentiment_analyzer is not None:
+        return
+    with _pipelines_lock:
+        if sentiment_analyzer is None:
+            device = 0 if torch.cuda.is_available() else -1
+            emotion_detector = pipeline("text-classification", model=EMOTION_MODEL, device=device)
+            sentiment_analyzer = pipeline("text-classification", model=SENTIMENT_MODEL, device=device)
+
+# Results keyed by a hash of the text, so repeated content is never re-scored
+INSIGHTS_CACHE_SIZE = int(os.getenv("INSIGHTS_CACHE_SIZE", "4096"))
+_insights_cache = OrderedDict()
+_cache_lock = threading.Lock()
 
 # Keyword sets for heuristic fallback
 POSITIVE_WORDS = {
@@ -40,6 +59,7 @@ EMOTION_KEYWORDS = {
 def analyze_sentiment(text: str):
     text = (text or "").strip()
     if HAS_TRANSFORMERS:
+        load_pipelines()
         result = sentiment_analyzer(text)[0]
         return {"label": result["label"], "score": float(result["score"]) }
     # Heuristic fallback
@@ -54,6 +74,7 @@ def analyze_sentiment(text: str):
 def detect_emotion(text: str):
     text = (text or "").strip()
     if HAS_TRANSFORMERS:
+        load_pipelines()
         result = emotion_detector(text)[0]
         return {"emotion": result["label"], "score": float(result["score"]) }
     # Heuristic fallback: choose the emotion with most keyword hits
@@ -69,6 +90,71 @@ def detect_emotion(text: str):
 
 
 def get_text_insights(text: str):
-    sentiment = analyze_sentiment(text)
-    emotion = detect_emotion(text)
-    return {"sentiment": sentiment, "emotion": emotion}
\ No newline at end of file
+    return get_text_insights_batch([text])[0]
+
+
+def local_text_insights_batch(texts):
+    # Run both pipelines once over the whole list instead of once per text
+    texts = [(text or "").strip() for text in texts]
+    if not texts:
+        return []
+    if HAS_TRANSFORMERS:
+        load_pipelines()
+        sentiments = sentiment_analyzer(texts, truncation=True)
+        emotions = emotion_detector(texts, truncation=True)
+        return [
+            {
+                "sentiment": {"label": s["label"], "score": float(s["score"])},
+                "emotion": {"emotion": e["label"], "score": float(e["score"])},
+            }
+            for s, e in zip(sentiments, emotions)
+        ]
+    return [
+        {"sentiment": analyze_sentiment(text), "emotion": detect_emotion(text)}
+        for text in texts
+    ]
+
+
+def _content_key(text: str) -> str:
+    return hashlib.sha256((text or "").strip().encode("utf-8")).hexdigest()
+
+
+def _compute_insights_batch(texts):
+    client = get_client()
+    if client is not None:
+        try:
+            return client.request("insights", texts)
+        except InferenceUnavailable:
+            pass
+    return local_text_insights_batch(texts)
+
+
+def get_text_insights_batch(texts):
+    texts = list(texts)
+    if not texts:
+        return []
+    keys = [_content_key(text) for text in texts]
+
+    results = {}
+    with _cache_lock:
+        for key in keys:
+            if key in _insights_cache:
+                _insights_cache.move_to_end(key)
+                results[key] = _insights_cache[key]
+
+    # Score each distinct uncached text once, in a single batch
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in results:
+            missing.setdefault(key, text)
+    if missing:
+        computed = _compute_insights_batch(list(missing.values()))
+        with _cache_lock:
+            for key, insights in zip(missing, computed):
+                results[key] = insights
+                _insights_cache[key] = insights
+                _insights_cache.move_to_end(key)
+            while len(_insights_cache) > INSIGHTS_CACHE_SIZE:
+                _insights_cache.popitem(last=False)
+
+    return [results[key] for key in keys]
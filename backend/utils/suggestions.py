@@ -0,0 +1,103 @@
+from datetime import datetime
+
+from config.storage import storage
+
+# CBT and mindfulness actions offered for each detected emotion
+SUGGESTION_CATALOG = {
+    "sadness": {
+        "meditation-5min": "Try a quick 5-minute meditation",
+        "gratitude-three": "Write down three things you're grateful for",
+        "walk-outside": "Take a short walk outside",
+        "reach-out": "Send a message to someone you trust",
+        "pleasant-activity": "Schedule one small activity you usually enjoy",
+    },
+    "anger": {
+        "deep-breathing": "Practice deep breathing for 2 minutes",
+        "muscle-relaxation": "Try progressive muscle relaxation",
+        "write-it-down": "Write down what's bothering you",
+        "pause-and-name": "Pause and name the feeling before responding",
+        "physical-release": "Do a few minutes of brisk movement",
+    },
+    "fear": {
+        "grounding-54321": "Try the 5-4-3-2-1 grounding technique",
+        "box-breathing": "Practice box breathing",
+        "challenge-thoughts": "Challenge negative thoughts",
+        "worry-time": "Set aside 10 minutes of worry time later today",
+        "body-scan": "Try a short body scan meditation",
+    },
+}
+
+DEFAULT_LIMIT = 3
+
+# Keep only the most recent unresolved exposures per user
+MAX_PENDING = 20
+
+
+def _score(stats: dict) -> float:
+    # Laplace-smoothed share of exposures followed by a better mood check-in
+    return (stats.get("improved", 0) + 1) / (stats.get("shown", 0) + 2)
+
+
+def _rank(emotion: str, emotion_stats: dict) -> list:
+    catalog_order = list(SUGGESTION_CATALOG[emotion])
+    return sorted(
+        catalog_order,
+        key=lambda sid: (-_score(emotion_stats.get(sid, {})), catalog_order.index(sid))
+    )
+
+
+def get_suggestions(user_id: str, emotion: str, limit: int = DEFAULT_LIMIT) -> list:
+    """Return (suggestion_id, text) pairs from the user's precomputed ranking."""
+    catalog = SUGGESTION_CATALOG.get(emotion)
+    if not catalog:
+        return []
+
+    # Single keyed lookup; rankings are maintained on each mood check-in
+    ranking = storage.suggestions.get_ranking(user_id, emotion) or list(catalog)
+    return [(sid, catalog[sid]) for sid in ranking[:limit] if sid in catalog]
+
+
+def record_exposure(user_id: str, emotion: str, suggestion_ids: list):
+    """Remember which suggestions were shown until the next mood check-in."""
+    if not suggestion_ids:
+        return
+    storage.suggestions.push_exposure(
+        user_id,
+        {"emotion": emotion, "suggestion_ids": suggestion_ids, "at": datetime.now()},
+        MAX_PENDING
+    )
+
+
+def record_mood_checkins(user_id: str, checkins: list):
+    """Credit pending suggestions with the outcome of new mood check-ins.
+
+    checkins are the new (created_at, mood_score) pairs in chronological
+    order. Each exposure is resolved by the first check-in made after it was
+    shown, so backdated offline check-ins never count towards suggestions
+    shown later. Exposures are claimed and counters incremented atomically, so
+    concurrent check-ins never credit the same exposure twice or lose counts.
+    """
+    if not checkins:
+        return
+    previous, claimed = storage.suggestions.claim_pending(user_id, checkins[-1][0], checkins[-1][1])
+    claimed.sort(key=lambda exposure: exposure["at"])
+
+    outcomes = {}
+    position = 0
+    for created_at, mood_score in checkins:
+        while position < len(claimed) and claimed[position]["at"] < created_at:
+            exposure = claimed[position]
+            position += 1
+            emotion = exposure["emotion"]
+            if previous is None or emotion not in SUGGESTION_CATALOG:
+                continue
+            improved = int(mood_score > previous)
+            for sid in exposure["suggestion_ids"]:
+                counts = outcomes.setdefault(emotion, {}).setdefault(sid, [0, 0])
+                counts[0] += 1
+                counts[1] += improved
+        previous = mood_score
+
+    if outcomes:
+        # Rankings for the affected emotions are recomputed from the updated counters
+        storage.suggestions.add_outcomes(user_id, outcomes, _rank)
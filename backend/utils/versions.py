@@ -0,0 +1,78 @@
+# Per-user, per-resource version stamps kept on the user document. Every write
+# to a resource bumps its stamp; list endpoints derive ETag/Last-Modified from
+# it and can answer 304 Not Modified from the already-loaded user alone.
+import hashlib
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response, status
+
+from config.storage import storage
+
+RESOURCES = ("chat", "journal", "mood")
+
+# Clients must revalidate, but may reuse their copy when we answer 304
+CACHE_CONTROL = "private, no-cache"
+
+
+def bump(user_id: str, *resources: str):
+    """Record a write; call after the write so caches never pair old data with a new tag."""
+    storage.users.bump_versions(user_id, resources, datetime.now())
+
+
+def _etag(user: dict, resource: str, version: int, extra: tuple) -> str:
+    key = ":".join([str(user["_id"]), resource, str(version), *map(str, extra)])
+    return f'W/"{hashlib.sha1(key.encode("utf-8")).hexdigest()[:20]}"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    # Weak comparison: W/"x" and "x" match each other
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or (candidate[2:] if candidate.startswith("W/") else candidate) == opaque:
+            return True
+    return False
+
+
+def conditional_get(request: Request, user: dict, resource: str, *extra):
+    """Return (not_modified_response, headers) for a read of resource.
+
+    extra distinguishes representations of the same version, such as query
+    parameters or the current date for date-relative views.
+    """
+    stamp = user.get("versions", {}).get(resource, {})
+    etag = _etag(user, resource, stamp.get("v", 0), extra)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+    # HTTP dates have whole-second resolution: round the stamp up, and only
+    # advertise it once that second is over so any later write in the same
+    # second can never be answered 304 against it
+    modified_at = stamp.get("at") or user.get("created_at")
+    if modified_at:
+        modified_at = modified_at.astimezone(timezone.utc)
+        if modified_at.microsecond:
+            modified_at = modified_at.replace(microsecond=0) + timedelta(seconds=1)
+        if modified_at <= datetime.now(timezone.utc):
+            headers["Last-Modified"] = format_datetime(modified_at, usegmt=True)
+        else:
+            modified_at = None
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if _matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers), headers
+        return None, headers
+
+    # Only consulted when there is no If-None-Match, per RFC 9110; the date-relative
+    # extras are not covered by a timestamp, so skip it when they are present
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and modified_at and not extra:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            since = None
+        if since is not None and since.tzinfo is not None and modified_at <= since:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers), headers
+
+    return None, headers
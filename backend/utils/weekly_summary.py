@@ -0,0 +1,89 @@
+from datetime import datetime, date, timedelta
+
+from config.storage import storage
+
+# Keep prompts small: a handful of excerpts is enough for a reflection
+MAX_JOURNAL_EXCERPTS = 6
+EXCERPT_CHARS = 400
+
+SUMMARY_PROMPT = """
+Write a short weekly reflection (4-6 sentences) for the person whose week is summarized below.
+Notice patterns in their mood, energy and focus, acknowledge what went well, and offer one
+gentle, practical suggestion for the coming week. Speak directly to them.
+
+{context}
+"""
+
+
+def week_key(day: date) -> str:
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def week_bounds(key: str):
+    """Return (monday, sunday) for an ISO week key like 2026-W41."""
+    monday = datetime.strptime(f"{key}-1", "%G-W%V-%u").date()
+    return monday, monday + timedelta(days=6)
+
+
+def previous_week(today: date = None) -> str:
+    today = today or date.today()
+    return week_key(today - timedelta(days=7))
+
+
+def _range(monday: date, sunday: date):
+    return (
+        datetime(monday.year, monday.month, monday.day),
+        datetime(sunday.year, sunday.month, sunday.day) + timedelta(days=1)
+    )
+
+
+def active_users(monday: date, sunday: date) -> list:
+    """Users with at least one check-in or journal entry in the week."""
+    start, end = _range(monday, sunday)
+    users = storage.moods.active_users(start, end)
+    users.update(storage.journals.active_users(start, end))
+    return sorted(users)
+
+
+def build_context(user_id: str, monday: date, sunday: date) -> dict:
+    """Compact per-user context: daily mood rollups plus a few journal excerpts."""
+    start, end = _range(monday, sunday)
+    days = storage.moods.daily_averages(user_id, start, end)
+    journals = storage.journals.in_range(user_id, start, end)
+
+    lines = [f"Week: {monday:%A %b %d} to {sunday:%A %b %d}"]
+    if days:
+        lines.append("Daily averages (1-10 scale):")
+        for day in days:
+            weekday = datetime.strptime(day["_id"], "%Y-%m-%d").strftime("%A")
+            lines.append(
+                f"- {weekday}: mood {day['mood']:.1f}, energy {day['energy']:.1f}, "
+                f"focus {day['focus']:.1f} ({day['count']} check-ins)"
+            )
+    else:
+        lines.append("No mood check-ins this week.")
+
+    emotions = {}
+    for entry in journals:
+        if entry.get("emotion"):
+            emotions[entry["emotion"]] = emotions.get(entry["emotion"], 0) + 1
+    if emotions:
+        lines.append("Emotions in journal entries: " + ", ".join(
+            f"{emotion} x{count}" for emotion, count in sorted(emotions.items(), key=lambda item: -item[1])
+        ))
+
+    # Spread excerpts across the week rather than taking only the latest
+    step = max(1, len(journals) // MAX_JOURNAL_EXCERPTS)
+    for entry in journals[::step][:MAX_JOURNAL_EXCERPTS]:
+        excerpt = " ".join(entry["content"].split())[:EXCERPT_CHARS]
+        lines.append(f"Journal ({entry['created_at']:%A}): {excerpt}")
+
+    checkins = sum(day["count"] for day in days)
+    average = sum(day["mood"] * day["count"] for day in days) / checkins if checkins else None
+    return {
+        "text": "\n".join(lines),
+        "mood_checkins": checkins,
+        "average_mood": round(average, 1) if average is not None else None,
+        "journal_entries": len(journals)
+    }
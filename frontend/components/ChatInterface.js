@@ -8,14 +8,18 @@ const ChatInterface = () => {
   const [loading, setLoading] = useState(false);
   const [suggestions, setSuggestions] = useState([]);
   const [isTyping, setIsTyping] = useState(false); // typing indicator
+  const [historyCursor, setHistoryCursor] = useState(null); // next older page
+  const [loadingOlder, setLoadingOlder] = useState(false);
   const messagesEndRef = useRef(null);
+  const keepScrollRef = useRef(false); // set while prepending older messages
 
   // Load chat history on component mount
   useEffect(() => {
     const loadChatHistory = async () => {
       try {
         const history = await getChatHistory();
-        setMessages(history);
+        setMessages(history.messages);
+        setHistoryCursor(history.cursor);
       } catch (error) {
         console.error('Failed to load chat history:', error);
       }
@@ -26,10 +30,29 @@ const ChatInterface = () => {
 
   // Scroll to bottom when messages change
   useEffect(() => {
-    // Always scroll to bottom when messages change or typing status updates
+    // Stay in place when older messages were added above
+    if (keepScrollRef.current) {
+      keepScrollRef.current = false;
+      return;
+    }
     messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
   }, [messages, isTyping]);
 
+  const handleLoadOlder = async () => {
+    if (!historyCursor || loadingOlder) return;
+    setLoadingOlder(true);
+    try {
+      const history = await getChatHistory({ cursor: historyCursor });
+      keepScrollRef.current = true;
+      setMessages((prev) => [...history.messages, ...prev]);
+      setHistoryCursor(history.cursor);
+    } catch (error) {
+      console.error('Failed to load older messages:', error);
+    } finally {
+      setLoadingOlder(false);
+    }
+  };
+
   const handleSendMessage = async (e) => {
     e.preventDefault();
     
@@ -85,6 +108,7 @@ const ChatInterface = () => {
     try {
       await clearChatHistory();
       setMessages([]);
+      setHistoryCursor(null);
       setSuggestions([]);
     } catch (error) {
       console.error('Error clearing chat:', error);
@@ -111,6 +135,17 @@ const ChatInterface = () => {
       
       {/* Messages container */}
       <div className="flex-1 p-4 overflow-y-auto">
+        {historyCursor && (
+          <div className="flex justify-center mb-4">
+            <button
+              onClick={handleLoadOlder}
+              className="text-sm text-primary-600 dark:text-primary-400 hover:underline disabled:opacity-50"
+              disabled={loadingOlder}
+            >
+              {loadingOlder ? 'Loading…' : 'Load earlier messages'}
+            </button>
+          </div>
+        )}
         {messages.length === 0 ? (
           <div className="flex flex-col items-center justify-center h-full text-gray-500 dark:text-gray-400">
             <p className="text-center mb-4">No messages yet. Start a conversation with your AI coach!</p>
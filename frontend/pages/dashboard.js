@@ -1,7 +1,7 @@
 import { useState, useEffect } from 'react';
 import Link from 'next/link';
 import { useAuth } from '../utils/auth';
-import { getUserStats, getMoodStats } from '../utils/api';
+import { getDashboard } from '../utils/api';
 import { FiMessageSquare, FiBook, FiBarChart2, FiAward, FiArrowRight } from 'react-icons/fi';
 import { Line } from 'react-chartjs-2';
 import {
@@ -36,13 +36,10 @@ export default function Dashboard() {
   useEffect(() => {
     async function fetchData() {
       try {
-        const [userStats, moodStatsData] = await Promise.all([
-          getUserStats(),
-          getMoodStats()
-        ]);
+        const dashboard = await getDashboard();
         
-        setStats(userStats);
-        setMoodStats(moodStatsData);
+        setStats(dashboard.stats);
+        setMoodStats(dashboard.mood_stats);
       } catch (error) {
         console.error('Error fetching dashboard data:', error);
       } finally {
@@ -34,10 +34,15 @@ export const sendChatMessage = async (message) => {
   }
 };
 
-export const getChatHistory = async () => {
+// Returns the newest page of messages, or the page before `cursor`, along with
+// the cursor for the next older page (null once the start is reached)
+export const getChatHistory = async ({ cursor, limit } = {}) => {
   try {
-    const response = await api.get('/api/chat/history');
-    return response.data;
+    const params = {};
+    if (cursor) params.cursor = cursor;
+    if (limit) params.limit = limit;
+    const response = await api.get('/api/chat/history', { params });
+    return { messages: response.data, cursor: response.headers['x-next-cursor'] || null };
   } catch (error) {
     console.error('Error getting chat history:', error);
     throw error;
@@ -126,6 +131,17 @@ export const getMoodStats = async () => {
   }
 };
 
+// API functions for dashboard
+export const getDashboard = async () => {
+  try {
+    const response = await api.get('/api/dashboard');
+    return response.data;
+  } catch (error) {
+    console.error('Error getting dashboard:', error);
+    throw error;
+  }
+};
+
 // API functions for user
 export const getUserStats = async () => {
   try {
@@ -135,4 +151,134 @@ export const getUserStats = async () => {
     console.error('Error getting user stats:', error);
     throw error;
   }
-};
\ No newline at end of file
+};
+// API functions for offline sync
+export const syncMoodEntries = async (entries) => {
+  try {
+    const response = await api.post('/api/mood/batch', { entries });
+    return response.data;
+  } catch (error) {
+    console.error('Error syncing mood entries:', error);
+    throw error;
+  }
+};
+
+export const syncJournalEntries = async (entries) => {
+  try {
+    const response = await api.post('/api/journal/batch', { entries });
+    return response.data;
+  } catch (error) {
+    console.error('Error syncing journal entries:', error);
+    throw error;
+  }
+};
+
+// API functions for data export
+export const exportUserData = async ({ format = 'ndjson', gzip = false } = {}) => {
+  try {
+    const response = await api.get('/api/export', {
+      params: { format, gzip },
+      responseType: 'blob',
+    });
+    return response.data;
+  } catch (error) {
+    console.error('Error exporting user data:', error);
+    throw error;
+  }
+};
+
+// API functions for habits
+export const getHabits = async () => {
+  try {
+    const response = await api.get('/api/habits');
+    return response.data;
+  } catch (error) {
+    console.error('Error getting habits:', error);
+    throw error;
+  }
+};
+
+export const createHabit = async (habitData) => {
+  try {
+    const response = await api.post('/api/habits', habitData);
+    return response.data;
+  } catch (error) {
+    console.error('Error creating habit:', error);
+    throw error;
+  }
+};
+
+export const checkHabit = async (id, day) => {
+  try {
+    const response = await api.post(`/api/habits/${id}/check`, day ? { day } : {});
+    return response.data;
+  } catch (error) {
+    console.error('Error checking habit:', error);
+    throw error;
+  }
+};
+
+export const uncheckHabit = async (id, day) => {
+  try {
+    const response = await api.delete(`/api/habits/${id}/check`, { params: day ? { day } : {} });
+    return response.data;
+  } catch (error) {
+    console.error('Error unchecking habit:', error);
+    throw error;
+  }
+};
+
+export const getHabitHeatmap = async (id, year) => {
+  try {
+    const response = await api.get(`/api/habits/${id}/heatmap`, { params: year ? { year } : {} });
+    return response.data;
+  } catch (error) {
+    console.error('Error getting habit heatmap:', error);
+    throw error;
+  }
+};
+
+// API functions for emotion insights
+export const getEmotionDistribution = async (params = {}) => {
+  try {
+    const response = await api.get('/api/insights/emotions', { params });
+    return response.data;
+  } catch (error) {
+    console.error('Error getting emotion distribution:', error);
+    throw error;
+  }
+};
+
+export const getEntriesByEmotion = async (emotion, params = {}) => {
+  try {
+    const response = await api.get(`/api/insights/emotions/${emotion}`, { params });
+    return response.data;
+  } catch (error) {
+    console.error('Error getting entries by emotion:', error);
+    throw error;
+  }
+};
+
+export const searchJournalEntries = async (q, { tags, page = 1, pageSize = 20 } = {}) => {
+  try {
+    const response = await api.get('/api/journal/search', {
+      params: { q, tags, page, page_size: pageSize },
+      paramsSerializer: { indexes: null },
+    });
+    return response.data;
+  } catch (error) {
+    console.error('Error searching journal entries:', error);
+    throw error;
+  }
+};
+
+// API functions for weekly summaries
+export const getWeeklySummary = async (week) => {
+  try {
+    const response = await api.get('/api/summaries/weekly', { params: week ? { week } : {} });
+    return response.data;
+  } catch (error) {
+    console.error('Error getting weekly summary:', error);
+    throw error;
+  }
+};